@@ -0,0 +1,72 @@
+import re
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.database import Base, engine
+# Registra todas las tablas en Base.metadata
+from app.models import (  # noqa: F401
+    user, business, role, inventory, sale, client, supplier, finance, waste, system_settings,
+)
+
+config = context.config
+
+# Desde la CLI se configura el logging del .ini; al migrar desde el arranque
+# de la app (utils.bootstrap) se respeta el logging de la app
+if config.config_file_name is not None and not config.attributes.get("connection"):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+_AUDIT_PARTITION = re.compile(r"^audit_logs_(\d{4}_\d{2}|default)$")
+
+
+def _include_name(name, type_, parent_names) -> bool:
+    # Índices de búsqueda propios de cada motor (utils.product_search) y
+    # particiones mensuales de audit_logs en Postgres (utils.audit_archive):
+    # no están en los modelos y autogenerate no debe proponer borrarlos
+    if type_ == "table":
+        return not (name.startswith("product_search_fts") or _AUDIT_PARTITION.match(name))
+    if type_ == "index":
+        return name != "ix_product_search_document_trgm"
+    return True
+
+
+def _configure(**kwargs) -> None:
+    context.configure(
+        target_metadata=target_metadata,
+        # SQLite no soporta ALTER de columnas: se recrea la tabla
+        render_as_batch=True,
+        compare_type=True,
+        include_name=_include_name,
+        **kwargs,
+    )
+
+
+def run_migrations_offline() -> None:
+    """Genera el SQL sin conectarse (`alembic upgrade head --sql`)."""
+    _configure(url=str(engine.url), literal_binds=True, dialect_opts={"paramstyle": "named"})
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        # Conexión prestada por el arranque de la app (ya tiene el lock)
+        _configure(connection=connection)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    with engine.connect() as connection:
+        _configure(connection=connection)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,87 @@
+"""tenant time indexes
+
+Índices compuestos (negocio o padre, fecha) y parciales (activos, lotes con
+saldo) de las consultas frecuentes, que verifica tests/test_query_plans.py.
+`ux_product_stock_presentation_warehouse` es único: antes de crearlo se
+funden las filas repetidas de stock de una misma presentación y bodega en la
+de menor id, sumando su cantidad.
+
+Revision ID: 0001c
+Revises: 0001b
+Create Date: 2026-10-17 06:10:48.117362
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0001c'
+down_revision: Union[str, None] = '0001b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_ACTIVE = dict(postgresql_where=sa.text('is_active'), sqlite_where=sa.text('is_active = 1'))
+_OPEN = dict(postgresql_where=sa.text('remaining > 0'), sqlite_where=sa.text('remaining > 0'))
+
+# (tabla, índice, columnas, opciones)
+_INDEXES = (
+    ('audit_logs', 'ix_audit_logs_business_created', ['business_id', 'created_at'], {}),
+    ('audit_logs', 'ix_audit_logs_user_created', ['user_id', 'created_at'], {}),
+    ('cash_movements', 'ix_cash_movements_business_created', ['business_id', 'created_at'], {}),
+    ('cash_movements', 'ix_cash_movements_session', ['session_id'], {}),
+    ('cash_sessions', 'ix_cash_sessions_register_status', ['register_id', 'status'], {}),
+    ('client_purchases', 'ix_client_purchases_client_created', ['client_id', 'created_at'], {}),
+    ('clients', 'ix_clients_business_active', ['business_id'], _ACTIVE),
+    ('credit_movements', 'ix_credit_movements_business_created', ['business_id', 'created_at'], {}),
+    ('credit_movements', 'ix_credit_movements_client_created', ['client_id', 'created_at'], {}),
+    ('inventory_movements', 'ix_inventory_movements_business_created', ['business_id', 'created_at'], {}),
+    ('inventory_movements', 'ix_inventory_movements_presentation_created', ['presentation_id', 'created_at'], {}),
+    ('product_lots', 'ix_product_lots_business_expiry_open', ['business_id', 'expiry_date'], _OPEN),
+    ('product_lots', 'ix_product_lots_fefo_open', ['presentation_id', 'warehouse_id', 'expiry_date'], _OPEN),
+    ('product_presentations', 'ix_product_presentations_business_barcode', ['business_id', 'barcode'], {}),
+    ('product_presentations', 'ix_product_presentations_product', ['product_id'], {}),
+    ('product_stock', 'ix_product_stock_warehouse', ['warehouse_id'], {}),
+    ('product_stock', 'ux_product_stock_presentation_warehouse', ['presentation_id', 'warehouse_id'], {'unique': True}),
+    ('products', 'ix_products_business_name_active', ['business_id', 'name'], _ACTIVE),
+    ('sale_items', 'ix_sale_items_presentation', ['presentation_id'], {}),
+    ('sale_items', 'ix_sale_items_sale', ['sale_id'], {}),
+    ('sale_payments', 'ix_sale_payments_sale', ['sale_id'], {}),
+    ('sales', 'ix_sales_business_created', ['business_id', 'created_at'], {}),
+    ('sales', 'ix_sales_client_created', ['client_id', 'created_at'], {}),
+    ('session_payment_breakdowns', 'ix_session_payment_breakdowns_session', ['session_id'], {}),
+    ('waste_records', 'ix_waste_records_business_created', ['business_id', 'created_at'], {}),
+)
+
+
+def _merge_duplicate_stock() -> None:
+    op.execute(
+        "UPDATE product_stock SET quantity = ("
+        " SELECT SUM(s.quantity) FROM product_stock s"
+        " WHERE s.presentation_id = product_stock.presentation_id"
+        " AND s.warehouse_id = product_stock.warehouse_id)"
+        " WHERE id IN (SELECT MIN(id) FROM product_stock"
+        " GROUP BY presentation_id, warehouse_id HAVING COUNT(*) > 1)"
+    )
+    op.execute(
+        "DELETE FROM product_stock WHERE id NOT IN ("
+        " SELECT MIN(id) FROM product_stock GROUP BY presentation_id, warehouse_id)"
+    )
+
+
+def upgrade() -> None:
+    insp = sa.inspect(op.get_bind())
+    existing = {}
+    for table, name, columns, options in _INDEXES:
+        if table not in existing:
+            existing[table] = {ix['name'] for ix in insp.get_indexes(table)}
+        if name in existing[table]:
+            continue
+        if name == 'ux_product_stock_presentation_warehouse':
+            _merge_duplicate_stock()
+        op.create_index(name, table, columns, **{'unique': False, **options})
+
+
+def downgrade() -> None:
+    for table, name, columns, options in reversed(_INDEXES):
+        op.drop_index(name, table_name=table, **{k: v for k, v in options.items() if k != 'unique'})
@@ -0,0 +1,126 @@
+"""sales daily rollup
+
+Resumen diario de ventas por día local, bodega, vendedor y método de pago
+(app.utils.sales_rollup). Se llena con las ventas existentes: el día local
+depende de BUSINESS_TIMEZONE (zoneinfo, no SQL), así que las ventas se
+agrupan en Python con una copia congelada del cálculo de `rebuild`.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 04:20:36.340680
+"""
+from datetime import timezone
+from decimal import Decimal
+from typing import Sequence, Union
+from zoneinfo import ZoneInfo
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import get_settings
+
+
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_KEY = ('business_id', 'day', 'warehouse_id', 'seller_id', 'payment_method_id')
+_MEASURES = ('sales_count', 'cancelled_count', 'total', 'amount_credit', 'amount')
+_BATCH = 2000
+
+_sales = sa.table('sales',
+    sa.column('id', sa.Integer), sa.column('business_id', sa.Integer),
+    sa.column('warehouse_id', sa.Integer), sa.column('created_by', sa.Integer),
+    sa.column('created_at', sa.DateTime), sa.column('status', sa.String),
+    sa.column('total', sa.Numeric), sa.column('amount_credit', sa.Numeric),
+)
+_sale_payments = sa.table('sale_payments',
+    sa.column('sale_id', sa.Integer), sa.column('payment_method_id', sa.Integer),
+    sa.column('amount', sa.Numeric),
+)
+
+
+def _backfill() -> None:
+    """Totales por día local, bodega, vendedor y método (0 = la venta)."""
+    bind = op.get_bind()
+    tz = ZoneInfo(get_settings().BUSINESS_TIMEZONE)
+    rows: dict[tuple, dict] = {}
+
+    def add(business, created_at, warehouse, seller, method, **measures):
+        day = created_at.replace(tzinfo=timezone.utc).astimezone(tz).date()
+        row = rows.setdefault((business, day, warehouse, seller, method), {})
+        for name, value in measures.items():
+            row[name] = row.get(name, 0) + value
+
+    sales = bind.execute(
+        sa.select(
+            _sales.c.business_id, _sales.c.created_at, _sales.c.warehouse_id, _sales.c.created_by,
+            _sales.c.status, _sales.c.total, _sales.c.amount_credit,
+        ).where(_sales.c.status.in_(['COMPLETED', 'CANCELLED']))
+        .execution_options(yield_per=_BATCH)
+    )
+    for business, created_at, warehouse, seller, status, total, credit in sales:
+        if status == 'CANCELLED':
+            add(business, created_at, warehouse, seller, 0, cancelled_count=1)
+        else:
+            add(business, created_at, warehouse, seller, 0,
+                sales_count=1, total=total, amount_credit=credit or Decimal('0'))
+
+    payments = bind.execute(
+        sa.select(
+            _sales.c.business_id, _sales.c.created_at, _sales.c.warehouse_id, _sales.c.created_by,
+            _sale_payments.c.payment_method_id, _sale_payments.c.amount,
+        ).join(_sale_payments, _sale_payments.c.sale_id == _sales.c.id)
+        .where(_sales.c.status == 'COMPLETED')
+        .execution_options(yield_per=_BATCH)
+    )
+    for business, created_at, warehouse, seller, method, amount in payments:
+        add(business, created_at, warehouse, seller, method, amount=amount)
+
+    if rows:
+        rollup = sa.table('sales_daily_rollup',
+            *(sa.column(c, sa.Date if c == 'day' else sa.Integer) for c in _KEY),
+            sa.column('sales_count', sa.Integer), sa.column('cancelled_count', sa.Integer),
+            *(sa.column(c, sa.Numeric(14, 2)) for c in ('total', 'amount_credit', 'amount')),
+        )
+        bind.execute(rollup.insert(), [
+            {**dict(zip(_KEY, key)), **{m: measures.get(m, 0) for m in _MEASURES}}
+            for key, measures in sorted(rows.items())
+        ])
+
+
+def upgrade() -> None:
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table('sales_daily_rollup',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('business_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('warehouse_id', sa.Integer(), nullable=False),
+    sa.Column('seller_id', sa.Integer(), nullable=False),
+    sa.Column('payment_method_id', sa.Integer(), nullable=False),
+    sa.Column('sales_count', sa.Integer(), nullable=False),
+    sa.Column('cancelled_count', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('amount_credit', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['business_id'], ['businesses.id'], ),
+    sa.ForeignKeyConstraint(['seller_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['warehouse_id'], ['warehouses.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('sales_daily_rollup', schema=None) as batch_op:
+        batch_op.create_index('ux_sales_daily_rollup_key', ['business_id', 'day', 'warehouse_id', 'seller_id', 'payment_method_id'], unique=True)
+
+    # ### end Alembic commands ###
+
+    _backfill()
+
+
+def downgrade() -> None:
+    # ### commands auto generated by Alembic - please adjust! ###
+    with op.batch_alter_table('sales_daily_rollup', schema=None) as batch_op:
+        batch_op.drop_index('ux_sales_daily_rollup_key')
+
+    op.drop_table('sales_daily_rollup')
+    # ### end Alembic commands ###
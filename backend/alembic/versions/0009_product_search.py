@@ -0,0 +1,144 @@
+"""product search
+
+Texto normalizado de búsqueda por producto (app.utils.product_search) y su
+índice según el motor: FTS5 en SQLite, trigramas (pg_trgm) en Postgres. Se
+llena con los productos existentes. El DDL del índice y el cálculo del
+documento son copias congeladas de las de esa versión del módulo.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 04:44:56.343236
+"""
+import unicodedata
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_BATCH = 1000
+
+_SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE product_search_fts USING fts5("
+    "name, document, content='product_search', content_rowid='product_id',"
+    " tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER product_search_ai AFTER INSERT ON product_search BEGIN"
+    " INSERT INTO product_search_fts(rowid, name, document) VALUES (new.product_id, new.name, new.document); END",
+    "CREATE TRIGGER product_search_ad AFTER DELETE ON product_search BEGIN"
+    " INSERT INTO product_search_fts(product_search_fts, rowid, name, document)"
+    " VALUES ('delete', old.product_id, old.name, old.document); END",
+    "CREATE TRIGGER product_search_au AFTER UPDATE ON product_search BEGIN"
+    " INSERT INTO product_search_fts(product_search_fts, rowid, name, document)"
+    " VALUES ('delete', old.product_id, old.name, old.document);"
+    " INSERT INTO product_search_fts(rowid, name, document) VALUES (new.product_id, new.name, new.document); END",
+    "INSERT INTO product_search_fts(product_search_fts) VALUES ('rebuild')",
+)
+_SQLITE_DROP = (
+    "DROP TRIGGER IF EXISTS product_search_ai",
+    "DROP TRIGGER IF EXISTS product_search_ad",
+    "DROP TRIGGER IF EXISTS product_search_au",
+    "DROP TABLE IF EXISTS product_search_fts",
+)
+_PG_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX ix_product_search_document_trgm ON product_search USING gin (document gin_trgm_ops)",
+)
+
+_products = sa.table('products',
+    sa.column('id', sa.Integer), sa.column('business_id', sa.Integer),
+    sa.column('name', sa.String), sa.column('is_active', sa.Boolean),
+)
+_presentations = sa.table('product_presentations',
+    sa.column('id', sa.Integer), sa.column('product_id', sa.Integer),
+    sa.column('name', sa.String), sa.column('barcode', sa.String), sa.column('is_active', sa.Boolean),
+)
+_product_search = sa.table('product_search',
+    sa.column('product_id', sa.Integer), sa.column('business_id', sa.Integer),
+    sa.column('name', sa.String), sa.column('document', sa.Text),
+)
+
+
+def _normalize(value: Optional[str]) -> str:
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", value)
+    plain = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(plain.lower().split())
+
+
+def _backfill() -> None:
+    """Una entrada por producto activo: nombre y nombre + presentaciones activas + códigos."""
+    bind = op.get_bind()
+    products = bind.execute(
+        sa.select(_products.c.id, _products.c.business_id, _products.c.name)
+        .where(_products.c.is_active == sa.true()).order_by(_products.c.id)
+    ).all()
+    for start in range(0, len(products), _BATCH):
+        batch = products[start:start + _BATCH]
+        extra: dict[int, list[str]] = {}
+        for product_id, name, barcode in bind.execute(
+            sa.select(_presentations.c.product_id, _presentations.c.name, _presentations.c.barcode)
+            .where(
+                _presentations.c.product_id.in_([p.id for p in batch]),
+                _presentations.c.is_active == sa.true(),
+            ).order_by(_presentations.c.id)
+        ):
+            extra.setdefault(product_id, []).extend(v for v in (name, barcode) if v)
+        bind.execute(_product_search.insert(), [
+            {
+                'product_id': product_id,
+                'business_id': business_id,
+                'name': _normalize(name),
+                'document': _normalize(" ".join([name, *extra.get(product_id, [])])),
+            }
+            for product_id, business_id, name in batch
+        ])
+
+
+def upgrade() -> None:
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table('product_search',
+    sa.Column('product_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('business_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('document', sa.Text(), nullable=False),
+    sa.ForeignKeyConstraint(['business_id'], ['businesses.id'], ),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('product_id')
+    )
+    with op.batch_alter_table('product_search', schema=None) as batch_op:
+        batch_op.create_index('ix_product_search_business', ['business_id'], unique=False)
+
+    # ### end Alembic commands ###
+
+    # Primero el contenido: la tabla FTS se arma de una vez con 'rebuild'.
+    # La tabla FTS5 / el índice de trigramas no están en los modelos
+    _backfill()
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        for statement in _PG_DDL:
+            op.execute(statement)
+    elif dialect == 'sqlite':
+        for statement in _SQLITE_DDL:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_product_search_document_trgm")
+    elif dialect == 'sqlite':
+        for statement in _SQLITE_DROP:
+            op.execute(statement)
+
+    # ### commands auto generated by Alembic - please adjust! ###
+    with op.batch_alter_table('product_search', schema=None) as batch_op:
+        batch_op.drop_index('ix_product_search_business')
+
+    op.drop_table('product_search')
+    # ### end Alembic commands ###
@@ -0,0 +1,115 @@
+"""audit log partitions
+
+`audit_logs.created_at` pasa a NOT NULL. En Postgres la tabla se convierte
+en particionada por RANGE (created_at), con PK (id, created_at), una
+partición por mes desde la fila más antigua hasta AUDIT_PARTITIONS_AHEAD
+meses adelante y una DEFAULT (utils.audit_archive). Las filas existentes se
+copian con un INSERT ... SELECT: en una tabla grande la migración tarda lo
+que tarde esa copia. Antes esta conversión la hacía el arranque de la app;
+una tabla que ya quedó particionada así se deja como está.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17 05:05:15.902111
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COLUMNS = "id, user_id, business_id, action, entity_type, entity_id, details, ip_address, created_at"
+_INDEXES = (
+    ('ix_audit_logs_id', ['id']),
+    ('ix_audit_logs_created_id', ['created_at', 'id']),
+    ('ix_audit_logs_business_created', ['business_id', 'created_at']),
+    ('ix_audit_logs_user_created', ['user_id', 'created_at']),
+)
+
+
+def _is_partitioned() -> bool:
+    return bool(op.get_bind().execute(sa.text(
+        "SELECT 1 FROM pg_partitioned_table pt "
+        "JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = 'audit_logs'"
+    )).first())
+
+
+def _recreate_audit_logs(partitioned: bool) -> None:
+    """Postgres: recrea audit_logs (particionada o no) con sus filas y la misma secuencia de ids."""
+    op.rename_table('audit_logs', 'audit_logs_old')
+    op.execute("ALTER TABLE audit_logs_old RENAME CONSTRAINT audit_logs_pkey TO audit_logs_old_pkey")
+    for name, _ in _INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY NONE")
+
+    if partitioned:
+        table_args = [sa.PrimaryKeyConstraint('id', 'created_at')]
+        table_kwargs = {'postgresql_partition_by': 'RANGE (created_at)'}
+    else:
+        table_args = [sa.PrimaryKeyConstraint('id')]
+        table_kwargs = {}
+    op.create_table('audit_logs',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('audit_logs_id_seq'::regclass)"), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('business_id', sa.Integer(), nullable=True),
+    sa.Column('action', sa.String(), nullable=False),
+    sa.Column('entity_type', sa.String(), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=True),
+    sa.Column('details', sa.Text(), nullable=True),
+    sa.Column('ip_address', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['business_id'], ['businesses.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    *table_args,
+    **table_kwargs
+    )
+    for name, columns in _INDEXES:
+        op.create_index(name, 'audit_logs', columns, unique=False)
+
+    if partitioned:
+        # Particiones para todos los meses con filas; los anteriores a
+        # AUDIT_HOT_MONTHS los archiva el siguiente archive_audit_logs
+        from app.utils.audit_archive import ensure_audit_partitions
+        bind = op.get_bind()
+        oldest = bind.execute(sa.text("SELECT min(created_at) FROM audit_logs_old")).scalar()
+        ensure_audit_partitions(Session(bind=bind), since=oldest)
+
+    op.execute(f"INSERT INTO audit_logs ({_COLUMNS}) SELECT {_COLUMNS} FROM audit_logs_old")
+    op.drop_table('audit_logs_old')
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+
+
+def upgrade() -> None:
+    op.execute("UPDATE audit_logs SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL")
+
+    if op.get_bind().dialect.name == 'postgresql':
+        if not _is_partitioned():
+            _recreate_audit_logs(partitioned=True)
+        return
+
+    # ### commands auto generated by Alembic - please adjust! ###
+    with op.batch_alter_table('audit_logs', schema=None) as batch_op:
+        batch_op.alter_column('created_at',
+               existing_type=sa.DateTime(),
+               nullable=False)
+
+    # ### end Alembic commands ###
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql' and _is_partitioned():
+        _recreate_audit_logs(partitioned=False)
+
+    # ### commands auto generated by Alembic - please adjust! ###
+    with op.batch_alter_table('audit_logs', schema=None) as batch_op:
+        batch_op.alter_column('created_at',
+               existing_type=sa.DateTime(),
+               nullable=True)
+
+    # ### end Alembic commands ###
@@ -0,0 +1,66 @@
+"""product search fts business
+
+Solo SQLite: la tabla FTS5 `product_search_fts` se recrea con
+`business_id UNINDEXED` (app.utils.product_search) para que la búsqueda
+filtre el negocio dentro del MATCH en vez de recorrer los productos de
+todos los negocios. Se rearma desde `product_search` con 'rebuild'. En
+Postgres no cambia nada: el filtro ya va sobre `product_search`.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-17 07:02:41.518204
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '0011'
+down_revision: Union[str, None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_DROP = (
+    "DROP TRIGGER IF EXISTS product_search_ai",
+    "DROP TRIGGER IF EXISTS product_search_ad",
+    "DROP TRIGGER IF EXISTS product_search_au",
+    "DROP TABLE IF EXISTS product_search_fts",
+)
+
+
+def _create(columns: Sequence[str]) -> tuple[str, ...]:
+    """DDL de la tabla FTS5 y sus triggers con estas columnas."""
+    names = ", ".join(columns)
+    new = ", ".join(f"new.{c}" for c in columns)
+    old = ", ".join(f"old.{c}" for c in columns)
+    indexed = ", ".join(f"{c} UNINDEXED" if c == 'business_id' else c for c in columns)
+    return (
+        f"CREATE VIRTUAL TABLE product_search_fts USING fts5("
+        f"{indexed}, content='product_search', content_rowid='product_id',"
+        f" tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        f"CREATE TRIGGER product_search_ai AFTER INSERT ON product_search BEGIN"
+        f" INSERT INTO product_search_fts(rowid, {names}) VALUES (new.product_id, {new}); END",
+        f"CREATE TRIGGER product_search_ad AFTER DELETE ON product_search BEGIN"
+        f" INSERT INTO product_search_fts(product_search_fts, rowid, {names})"
+        f" VALUES ('delete', old.product_id, {old}); END",
+        f"CREATE TRIGGER product_search_au AFTER UPDATE ON product_search BEGIN"
+        f" INSERT INTO product_search_fts(product_search_fts, rowid, {names})"
+        f" VALUES ('delete', old.product_id, {old});"
+        f" INSERT INTO product_search_fts(rowid, {names}) VALUES (new.product_id, {new}); END",
+        "INSERT INTO product_search_fts(product_search_fts) VALUES ('rebuild')",
+    )
+
+
+def _recreate(columns: Sequence[str]) -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for statement in _DROP + _create(columns):
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    _recreate(('name', 'document', 'business_id'))
+
+
+def downgrade() -> None:
+    _recreate(('name', 'document'))
@@ -1,14 +1,20 @@
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
-from typing import Optional
+from sqlalchemy import and_
+from typing import Optional, NamedTuple
+from dataclasses import dataclass, field
+from app.config import get_settings
 from app.database import get_db
+from app.core.cache import TTLCache
 from app.core.security import decode_access_token
 from app.models.user import User
 from app.models.enums import SystemRole
 from app.models.business import Business, BusinessUser
-from app.models.role import BusinessRole, Permission
+from app.models.role import BusinessRole
+from app.core.permissions import PERMISSION_BITS, permission_bit, decode_permission_mask
 
+settings = get_settings()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 # ─────────────────────────────────────────────
@@ -40,6 +46,201 @@ def require_system_admin(current_user: User = Depends(get_current_active_user))
         raise HTTPException(status_code=403, detail="Se requieren permisos de administrador")
     return current_user
 
+# ─────────────────────────────────────────────
+# Principal de negocio (una sola consulta por request)
+# ─────────────────────────────────────────────
+
+class BusinessAccess(NamedTuple):
+    """Decisión de acceso de un usuario sobre un negocio. Sin objetos ORM: es cacheable."""
+    business_id: int
+    owner_id: int
+    is_owner: bool
+    is_member: bool
+    role_id: Optional[int]
+    can_manage_users: bool
+    can_manage_roles: bool
+    permission_mask: int
+
+
+# (user_id, business_id) -> BusinessAccess
+_access_cache = TTLCache(
+    maxsize=settings.AUTHZ_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTHZ_CACHE_TTL_SECONDS,
+)
+
+
+def access_cache_stats() -> dict:
+    return _access_cache.stats()
+
+
+def invalidate_access_cache(
+    user_id: Optional[int] = None,
+    business_id: Optional[int] = None,
+    role_id: Optional[int] = None
+) -> None:
+    """
+    Invalida decisiones de acceso cacheadas. Llamar después del commit de
+    cualquier cambio en membresías, roles, permisos o estado de usuario/negocio.
+    Sin argumentos limpia toda la caché.
+    """
+    if user_id is not None and business_id is not None and role_id is None:
+        _access_cache.pop((user_id, business_id))
+        return
+    if user_id is None and business_id is None and role_id is None:
+        _access_cache.clear()
+        return
+    _access_cache.pop_where(lambda key, access: (
+        (user_id is None or key[0] == user_id)
+        and (business_id is None or key[1] == business_id)
+        and (role_id is None or access.role_id == role_id)
+    ))
+
+
+@dataclass
+class BusinessPrincipal:
+    """
+    Contexto de acceso del usuario autenticado sobre un negocio:
+    negocio, membresía, rol y códigos de permiso.
+    Se resuelve una sola vez por request y lo reutilizan todas las
+    dependencias verify_* (FastAPI cachea las dependencias por request).
+
+    El negocio se carga bajo demanda: con la decisión en caché, las rutas
+    que no usan `business` no tocan la base de datos.
+    Admite `business, is_owner = principal` por compatibilidad.
+    """
+    user: User
+    access: BusinessAccess
+    db: Session = field(repr=False)
+    _business: Optional[Business] = field(default=None, repr=False)
+
+    @property
+    def business(self) -> Business:
+        if self._business is None:
+            self._business = self.db.get(Business, self.access.business_id)
+        return self._business
+
+    @property
+    def business_id(self) -> int:
+        return self.access.business_id
+
+    @property
+    def is_owner(self) -> bool:
+        return self.access.is_owner
+
+    @property
+    def permission_codes(self) -> frozenset:
+        return frozenset(decode_permission_mask(self.access.permission_mask))
+
+    @property
+    def has_access(self) -> bool:
+        return self.access.is_owner or self.access.is_member
+
+    @property
+    def can_manage_users(self) -> bool:
+        return self.access.is_owner or self.access.can_manage_users
+
+    @property
+    def can_manage_roles(self) -> bool:
+        return self.access.is_owner or self.access.can_manage_roles
+
+    def has_permission(self, permission_code: str) -> bool:
+        """El dueño siempre tiene todos los permisos."""
+        bit = PERMISSION_BITS.get(permission_code, 0)
+        return self.access.is_owner or bool(self.access.permission_mask & bit)
+
+    def __iter__(self):
+        yield self.business
+        yield self.is_owner
+
+
+def load_business_principal(
+    business_id: int,
+    user: User,
+    db: Session
+) -> Optional[BusinessPrincipal]:
+    """
+    Carga negocio + membresía activa + rol (con su bitmask de permisos) en una
+    sola consulta. Retorna None si el negocio no existe o está inactivo.
+    La decisión se cachea por (user_id, business_id) durante AUTHZ_CACHE_TTL_SECONDS.
+    """
+    key = (user.id, business_id)
+    access = _access_cache.get(key)
+    if access is not None:
+        return BusinessPrincipal(user=user, access=access, db=db)
+
+    row = (
+        db.query(Business, BusinessUser, BusinessRole)
+        .outerjoin(BusinessUser, and_(
+            BusinessUser.business_id == Business.id,
+            BusinessUser.user_id == user.id,
+            BusinessUser.is_active == True
+        ))
+        .outerjoin(BusinessRole, BusinessRole.id == BusinessUser.business_role_id)
+        .filter(Business.id == business_id, Business.is_active == True)
+        .first()
+    )
+    if not row:
+        return None
+
+    business, member, role = row
+    # Sin bitmask compilado (rol previo a los bitmasks que la migración o el
+    # seeder aún no llenan) no se concede ningún permiso: esta lectura no
+    # carga la relación ni escribe en la sesión
+    permission_mask = (role.permission_mask or 0) if role else 0
+    access = BusinessAccess(
+        business_id=business.id,
+        owner_id=business.owner_id,
+        is_owner=business.owner_id == user.id,
+        is_member=member is not None,
+        role_id=role.id if role else None,
+        can_manage_users=bool(role and role.can_manage_users),
+        can_manage_roles=bool(role and role.can_manage_roles),
+        permission_mask=permission_mask,
+    )
+    _access_cache.set(key, access)
+    return BusinessPrincipal(user=user, access=access, db=db, _business=business)
+
+
+def resolve_business_principal(
+    business_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+) -> Optional[BusinessPrincipal]:
+    """Dependencia base: no lanza errores, cada verify_* decide el código HTTP."""
+    return load_business_principal(business_id, current_user, db)
+
+
+def get_business_principal(
+    principal: Optional[BusinessPrincipal] = Depends(resolve_business_principal)
+) -> BusinessPrincipal:
+    """Principal con acceso verificado (dueño o miembro activo)."""
+    if not principal:
+        raise HTTPException(status_code=404, detail="Negocio no encontrado")
+    if not principal.has_access:
+        raise HTTPException(status_code=403, detail="Sin acceso a este negocio")
+    return principal
+
+
+def require_permission(permission_code: str):
+    """
+    Guard de ruta por permiso granular: `Depends(require_permission("sales.create"))`.
+    El bit se resuelve al declarar la ruta (un código inexistente falla al arrancar)
+    y la verificación es un AND sobre el bitmask cacheado del rol.
+    """
+    bit = permission_bit(permission_code)
+
+    def dependency(
+        principal: BusinessPrincipal = Depends(get_business_principal)
+    ) -> BusinessPrincipal:
+        if not principal.is_owner and not principal.access.permission_mask & bit:
+            raise HTTPException(
+                status_code=403,
+                detail=f"Sin permiso para esta acción ({permission_code})"
+            )
+        return principal
+
+    return dependency
+
 # ─────────────────────────────────────────────
 # Dependencias de negocio
 # ─────────────────────────────────────────────
@@ -54,102 +255,41 @@ def get_business_or_404(business_id: int, db: Session = Depends(get_db)) -> Busi
     return business
 
 def verify_business_access(
-    business_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
-) -> tuple[Business, bool]:
+    principal: BusinessPrincipal = Depends(get_business_principal)
+) -> BusinessPrincipal:
     """
-    Retorna (business, is_owner).
+    Retorna el principal; se desempaqueta como (business, is_owner).
     Lanza 403 si el usuario no tiene ningún tipo de acceso.
     """
-    business = db.query(Business).filter(
-        Business.id == business_id,
-        Business.is_active == True
-    ).first()
-    if not business:
-        raise HTTPException(status_code=404, detail="Negocio no encontrado")
-
-    if business.owner_id == current_user.id:
-        return business, True
-
-    member = db.query(BusinessUser).filter(
-        BusinessUser.business_id == business_id,
-        BusinessUser.user_id == current_user.id,
-        BusinessUser.is_active == True
-    ).first()
-    if not member:
-        raise HTTPException(status_code=403, detail="Sin acceso a este negocio")
-
-    return business, False
+    return principal
 
 def verify_business_owner(
-    business_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    principal: Optional[BusinessPrincipal] = Depends(resolve_business_principal)
 ) -> Business:
-    business = db.query(Business).filter(
-        Business.id == business_id,
-        Business.owner_id == current_user.id,
-        Business.is_active == True
-    ).first()
-    if not business:
+    if not principal or not principal.is_owner:
         raise HTTPException(status_code=403, detail="No eres el dueño de este negocio")
-    return business
+    return principal.business
 
 def verify_can_manage_users(
-    business_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    principal: Optional[BusinessPrincipal] = Depends(resolve_business_principal)
 ) -> Business:
     """
     El dueño siempre puede. Un empleado puede si su rol tiene can_manage_users=True.
     """
-    business = db.query(Business).filter(
-        Business.id == business_id,
-        Business.is_active == True
-    ).first()
-    if not business:
+    if not principal:
         raise HTTPException(status_code=404, detail="Negocio no encontrado")
-
-    if business.owner_id == current_user.id:
-        return business
-
-    member = db.query(BusinessUser).filter(
-        BusinessUser.business_id == business_id,
-        BusinessUser.user_id == current_user.id,
-        BusinessUser.is_active == True
-    ).first()
-
-    if not member or not member.business_role or not member.business_role.can_manage_users:
+    if not principal.can_manage_users:
         raise HTTPException(status_code=403, detail="Sin permiso para gestionar usuarios")
-
-    return business
+    return principal.business
 
 def verify_can_manage_roles(
-    business_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    principal: Optional[BusinessPrincipal] = Depends(resolve_business_principal)
 ) -> Business:
-    business = db.query(Business).filter(
-        Business.id == business_id,
-        Business.is_active == True
-    ).first()
-    if not business:
+    if not principal:
         raise HTTPException(status_code=404, detail="Negocio no encontrado")
-
-    if business.owner_id == current_user.id:
-        return business
-
-    member = db.query(BusinessUser).filter(
-        BusinessUser.business_id == business_id,
-        BusinessUser.user_id == current_user.id,
-        BusinessUser.is_active == True
-    ).first()
-
-    if not member or not member.business_role or not member.business_role.can_manage_roles:
+    if not principal.can_manage_roles:
         raise HTTPException(status_code=403, detail="Sin permiso para gestionar roles")
-
-    return business
+    return principal.business
 
 # ─────────────────────────────────────────────
 # Helper: verificar permiso granular
@@ -165,19 +305,7 @@ def check_permission(
     Útil para usar dentro de endpoints de módulos futuros.
     El dueño siempre tiene todos los permisos.
     """
-    business = db.query(Business).filter(Business.id == business_id).first()
-    if not business:
-        return False
-    if business.owner_id == current_user.id:
-        return True
-
-    member = db.query(BusinessUser).filter(
-        BusinessUser.business_id == business_id,
-        BusinessUser.user_id == current_user.id,
-        BusinessUser.is_active == True
-    ).first()
-    if not member or not member.business_role:
+    principal = load_business_principal(business_id, current_user, db)
+    if not principal or not principal.has_access:
         return False
-
-    has_perm = any(p.code == permission_code for p in member.business_role.permissions)
-    return has_perm
\ No newline at end of file
+    return principal.has_permission(permission_code)
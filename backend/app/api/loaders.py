@@ -0,0 +1,135 @@
+"""
+Qué relaciones carga cada endpoint (opciones de `Query.options`).
+
+- Muchos-a-uno (`Sale.client`, `SaleItem.presentation`): `joinedload`, que
+  no multiplica filas.
+- Colecciones (`Sale.items`, `Product.presentations`): `selectinload`, un
+  `SELECT ... WHERE id IN (...)` por nivel. Dos colecciones con joinedload
+  en la misma consulta devuelven el producto cartesiano de ambas.
+
+Con ORM_RAISE_ON_LAZY_LOAD (perfil de pruebas) cualquier relación que un
+endpoint lea y no esté declarada aquí falla en vez de hacer un SELECT por
+fila.
+
+Son funciones y no constantes: construir una opción configura los mappers,
+y los modelos terminan de registrarse al importar los routers.
+"""
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.models.business import BusinessUser
+from app.models.finance import CashSession
+from app.models.inventory import Product, ProductLot, ProductPresentation, ProductStock
+from app.models.role import BusinessRole
+from app.models.sale import Sale, SaleItem, SalePayment
+from app.models.supplier import SupplierProduct, SupplierPurchase, SupplierPurchaseItem
+from app.models.waste import WasteRecord
+
+
+# ── Roles ─────────────────────────────────────────────────────────────────────
+
+def role() -> tuple:
+    return (selectinload(BusinessRole.permissions),)
+
+
+def business_member() -> tuple:
+    return (
+        joinedload(BusinessUser.user),
+        joinedload(BusinessUser.business_role).selectinload(BusinessRole.permissions),
+    )
+
+
+# ── Inventario ────────────────────────────────────────────────────────────────
+
+def presentation_stock() -> tuple:
+    """Existencias por bodega de una presentación (StockResponse)."""
+    return (selectinload(ProductPresentation.stock).joinedload(ProductStock.warehouse),)
+
+
+def product() -> tuple:
+    """ProductResponse: categoría, presentaciones y su stock por bodega."""
+    return (
+        joinedload(Product.category),
+        selectinload(Product.presentations)
+        .selectinload(ProductPresentation.stock)
+        .joinedload(ProductStock.warehouse),
+    )
+
+
+def expiring_lot() -> tuple:
+    return (joinedload(ProductLot.presentation).joinedload(ProductPresentation.product),)
+
+
+# ── Ventas ────────────────────────────────────────────────────────────────────
+
+def sale_detail() -> tuple:
+    """SaleResponse: líneas con producto, pagos con método, cliente y vendedor."""
+    return (
+        selectinload(Sale.items)
+        .joinedload(SaleItem.presentation)
+        .joinedload(ProductPresentation.product),
+        selectinload(Sale.payments).joinedload(SalePayment.payment_method),
+        joinedload(Sale.client),
+        joinedload(Sale.seller),
+    )
+
+
+def sale_summary() -> tuple:
+    """SaleSummary del listado: cliente, vendedor y métodos de pago."""
+    return (
+        joinedload(Sale.client),
+        joinedload(Sale.seller),
+        selectinload(Sale.payments).joinedload(SalePayment.payment_method),
+    )
+
+
+def sale_cancel() -> tuple:
+    """Lo que revierte una anulación: líneas con sus lotes, pagos y cliente."""
+    return (
+        selectinload(Sale.items).selectinload(SaleItem.lots),
+        selectinload(Sale.payments),
+        joinedload(Sale.client),
+    )
+
+
+# ── Finanzas ──────────────────────────────────────────────────────────────────
+
+def cash_session() -> tuple:
+    """CashSessionResponse: quién abrió/cerró, movimientos y desglose."""
+    return (
+        joinedload(CashSession.opener),
+        joinedload(CashSession.closer),
+        selectinload(CashSession.movements),
+        selectinload(CashSession.payment_breakdown),
+    )
+
+
+def session_sales() -> tuple:
+    """Ventas consolidadas al cerrar caja, con sus pagos y métodos."""
+    return (selectinload(Sale.payments).joinedload(SalePayment.payment_method),)
+
+
+# ── Proveedores ───────────────────────────────────────────────────────────────
+
+def supplier_product() -> tuple:
+    return (joinedload(SupplierProduct.presentation).joinedload(ProductPresentation.product),)
+
+
+def purchase() -> tuple:
+    """PurchaseResponse: líneas con el nombre de producto y presentación."""
+    return (
+        selectinload(SupplierPurchase.items)
+        .joinedload(SupplierPurchaseItem.presentation)
+        .joinedload(ProductPresentation.product),
+    )
+
+
+# ── Mermas ────────────────────────────────────────────────────────────────────
+
+def waste() -> tuple:
+    """WasteResponse: producto, bodega, lote y quién la registró."""
+    return (
+        joinedload(WasteRecord.presentation).joinedload(ProductPresentation.product),
+        joinedload(WasteRecord.warehouse),
+        joinedload(WasteRecord.lot),
+        joinedload(WasteRecord.creator),
+    )
@@ -0,0 +1,82 @@
+"""
+Paginación por cursor (keyset) para los listados de historial.
+
+Los endpoints aceptan `cursor` además de `skip`/`limit`. El cuerpo sigue
+siendo la lista de siempre; los enlaces a la página siguiente y anterior van
+en el header `Link` (rel="next" / rel="prev") y los cursores sueltos en
+`X-Next-Cursor` / `X-Prev-Cursor`. Con cursor cada página filtra
+`(created_at, id) < clave` sobre el índice, así que su costo no depende de
+la profundidad; `skip` se mantiene por compatibilidad.
+"""
+from typing import Callable, Optional
+
+from fastapi import HTTPException, Query, Request, Response
+from sqlalchemy import tuple_
+
+from app.utils.pagination import decode_page_cursor, encode_cursor
+
+
+class CursorPage:
+    """Dependencia de los listados: `page: CursorPage = Depends()`."""
+
+    def __init__(
+        self,
+        request: Request,
+        response: Response,
+        cursor: Optional[str] = Query(None, description="X-Next-Cursor / X-Prev-Cursor de otra página; reemplaza a skip"),
+    ):
+        try:
+            self.after = decode_page_cursor(cursor) if cursor else None
+        except ValueError:
+            raise HTTPException(400, "Cursor inválido")
+        self.request = request
+        self.response = response
+
+    def fetch(self, query, sort_col, id_col, skip: int, limit: int, row_key: Optional[Callable] = None) -> list:
+        """
+        Ejecuta `query` en orden (sort_col, id_col) descendente y retorna la
+        página pedida. `row_key(row)` da la clave (sort, id) de una fila; por
+        defecto, los atributos de ambas columnas.
+        """
+        backward = False
+        if self.after:
+            sort_value, id_, backward = self.after
+            key = tuple_(sort_col, id_col)
+            bound = tuple_(sort_value, id_)
+            query = query.filter(key > bound if backward else key < bound)
+
+        if backward:
+            query = query.order_by(sort_col.asc(), id_col.asc())
+        else:
+            query = query.order_by(sort_col.desc(), id_col.desc())
+        if skip and not self.after:
+            query = query.offset(skip)
+
+        # Una fila extra dice si hay más en esta dirección sin contar
+        rows = query.limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if backward:
+            rows.reverse()
+
+        if rows:
+            row_key = row_key or (lambda row: (getattr(row, sort_col.key), getattr(row, id_col.key)))
+            has_next = True if backward else has_more
+            has_prev = has_more if backward else bool(self.after or skip)
+            self._set_links(
+                row_key(rows[-1]) if has_next else None,
+                row_key(rows[0]) if has_prev else None,
+            )
+        return rows
+
+    def _set_links(self, next_key: Optional[tuple], prev_key: Optional[tuple]) -> None:
+        links = []
+        for rel, key, header in (("next", next_key, "X-Next-Cursor"), ("prev", prev_key, "X-Prev-Cursor")):
+            if not key or key[0] is None:
+                continue
+            cursor = encode_cursor(*key, backward=rel == "prev")
+            url = self.request.url.remove_query_params("skip").include_query_params(cursor=cursor)
+            links.append(f'<{url}>; rel="{rel}"')
+            self.response.headers[header] = cursor
+        if links:
+            self.response.headers["Link"] = ", ".join(links)
@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Literal, Optional
 from pydantic import BaseModel
 from datetime import datetime
 from app.database import get_db
 from app.models.user import User
-from app.models.role import AuditLog
-from .deps import require_admin_role
+from app.models.role import AuditVocabulary
+from app.utils.audit_archive import query_audit_logs, archive_audit_logs
+from app.utils.pagination import encode_cursor, decode_cursor
+from .deps import require_admin_role, require_super_admin
 
 router = APIRouter()
 
@@ -27,10 +29,12 @@ class AuditLogResponse(BaseModel):
 
 class AuditLogListResponse(BaseModel):
     items: List[AuditLogResponse]
-    total: int
+    total: Optional[int] = None
+    total_is_estimate: bool = False
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 @router.get("/audit-logs", response_model=AuditLogListResponse)
 def list_audit_logs(
@@ -45,61 +49,43 @@ def list_audit_logs(
     business_id: Optional[int] = Query(None),
     date_from: Optional[datetime] = Query(None),
     date_to: Optional[datetime] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor de la página anterior; reemplaza a page"),
+    count: Literal["exact", "estimated", "none"] = Query("estimated"),
 ):
-    query = (
-        db.query(AuditLog)
-        .join(User, AuditLog.user_id == User.id)
-    )
-
-    if search:
-        term = f"%{search.lower()}%"
-        query = query.filter(
-            User.email.ilike(term) |
-            AuditLog.action.ilike(term) |
-            AuditLog.entity_type.ilike(term)
-        )
-    if action:
-        query = query.filter(AuditLog.action == action)
-    if entity_type:
-        query = query.filter(AuditLog.entity_type == entity_type)
-    if user_id:
-        query = query.filter(AuditLog.user_id == user_id)
-    if business_id:
-        query = query.filter(AuditLog.business_id == business_id)
-    if date_from:
-        query = query.filter(AuditLog.created_at >= date_from)
-    if date_to:
-        query = query.filter(AuditLog.created_at <= date_to)
+    """
+    Con `cursor` la página se resuelve por índice (keyset) y su costo no
+    depende de la profundidad; `page` se mantiene por compatibilidad.
+    """
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(400, "Cursor inválido")
 
-    total = query.count()
-    items_raw = (
-        query
-        .order_by(AuditLog.created_at.desc())
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-        .all()
+    result = query_audit_logs(
+        db,
+        search=search,
+        action=action,
+        entity_type=entity_type,
+        user_id=user_id,
+        business_id=business_id,
+        date_from=date_from,
+        date_to=date_to,
+        cursor=after,
+        offset=(page - 1) * page_size,
+        limit=page_size,
+        count=count,
     )
-
-    # Enrich con user_email
-    user_ids = {log.user_id for log in items_raw}
-    users_map = {
-        u.id: u.email
-        for u in db.query(User).filter(User.id.in_(user_ids)).all()
-    }
-
-    items = []
-    for log in items_raw:
-        items.append(AuditLogResponse(
-            **{c.name: getattr(log, c.name) for c in log.__table__.columns},
-            user_email=users_map.get(log.user_id),
-        ))
+    items = [AuditLogResponse(**row) for row in result.items]
+    total = result.total
 
     return {
         "items": items,
         "total": total,
+        "total_is_estimate": result.total_is_estimate,
         "page": page,
         "page_size": page_size,
-        "total_pages": max(1, -(-total // page_size)),  # ceil division
+        "total_pages": max(1, -(-total // page_size)) if total is not None else None,  # ceil division
+        "next_cursor": encode_cursor(*result.next_cursor) if result.next_cursor else None,
     }
 
 @router.get("/audit-logs/actions", response_model=List[str])
@@ -108,13 +94,35 @@ def list_audit_actions(
     current_user: User = Depends(require_admin_role),
 ):
     """Devuelve la lista de acciones únicas para usar en filtros."""
-    rows = db.query(AuditLog.action).distinct().order_by(AuditLog.action).all()
-    return [r[0] for r in rows]
+    return _vocabulary(db, "action")
 
 @router.get("/audit-logs/entity-types", response_model=List[str])
 def list_entity_types(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin_role),
 ):
-    rows = db.query(AuditLog.entity_type).distinct().order_by(AuditLog.entity_type).all()
-    return [r[0] for r in rows]
\ No newline at end of file
+    return _vocabulary(db, "entity_type")
+
+def _vocabulary(db: Session, kind: str) -> List[str]:
+    # Tabla diccionario en vez de DISTINCT sobre todo el log
+    rows = db.query(AuditVocabulary.value).filter(
+        AuditVocabulary.kind == kind
+    ).order_by(AuditVocabulary.value).all()
+    return [r[0] for r in rows]
+
+class AuditArchiveResult(BaseModel):
+    rotated: int
+    archived: int
+    dropped_tables: List[str]
+    cutoff: datetime
+
+@router.post("/audit-logs/archive", response_model=AuditArchiveResult)
+def run_audit_archive(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_super_admin),
+):
+    """
+    Rota las particiones mensuales y mueve a disco (jsonl.gz) los meses
+    anteriores a AUDIT_HOT_MONTHS. Útil para correr diariamente.
+    """
+    return archive_audit_logs(db)
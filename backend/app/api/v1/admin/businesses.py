@@ -78,13 +78,12 @@ def update_business_modules(
             changes[field] = {"from": old_value, "to": value}
             setattr(business, field, value)
     
-    db.commit()
-    db.refresh(business)
-    
     if changes:
         log_action(
             db, current_user.id, "UPDATE_BUSINESS_MODULES", "Business", business.id,
             details={"business_name": business.name, "changes": changes}
         )
+    db.commit()
+    db.refresh(business)
     
     return business
\ No newline at end of file
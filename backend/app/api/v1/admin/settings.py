@@ -48,13 +48,12 @@ def update_setting(
     old_value = setting.value
     setting.value = data.value
     setting.updated_by = current_user.id
-    db.commit()
-    db.refresh(setting)
-
     log_action(
         db, current_user.id, "UPDATE_SETTING", "SystemSetting", setting.id,
         details={"key": key, "from": old_value, "to": data.value}
     )
+    db.commit()
+    db.refresh(setting)
     return setting
 
 @router.patch("/settings", response_model=List[SettingResponse])
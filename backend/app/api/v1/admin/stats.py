@@ -1,9 +1,12 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from pydantic import BaseModel
-from app.database import get_db
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from app.database import get_db, engine, async_engine, pool_metrics
 from app.models.user import User
 from app.models.business import Business
+from app.core.security import token_cache_stats
+from app.api.deps import access_cache_stats
 from .deps import require_admin_role
 
 router = APIRouter()
@@ -14,6 +17,40 @@ class AdminStats(BaseModel):
     total_businesses: int
     active_businesses: int
 
+class CacheStats(BaseModel):
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    hit_rate: float
+
+class CachesStats(BaseModel):
+    tokens: CacheStats
+    business_access: CacheStats
+
+class HistogramBucket(BaseModel):
+    le: str
+    count: int
+
+class PoolStats(BaseModel):
+    pool_class: str
+    size: Optional[int]
+    checked_out: Optional[int]
+    checked_in: Optional[int]
+    overflow: Optional[int]
+    waiting: int
+    max_waiting: int
+    checkouts: int
+    timeouts: int
+    errors: int
+    avg_checkout_ms: float
+    max_checkout_ms: float
+    checkout_histogram_ms: List[HistogramBucket]
+
+class DbPoolStats(BaseModel):
+    sync: PoolStats
+    async_: Optional[PoolStats] = Field(None, serialization_alias="async")
+
 @router.get("/stats", response_model=AdminStats)
 def get_admin_stats(
     db: Session = Depends(get_db),
@@ -25,4 +62,24 @@ def get_admin_stats(
         "active_users": db.query(User).filter(User.is_active == True).count(),
         "total_businesses": db.query(Business).count(),
         "active_businesses": db.query(Business).filter(Business.is_active == True).count(),
-    }
\ No newline at end of file
+    }
+
+@router.get("/stats/caches", response_model=CachesStats)
+def get_cache_stats(current_user: User = Depends(require_admin_role)):
+    """Tamaño y tasa de aciertos de los cachés en memoria de este proceso."""
+    return {
+        "tokens": token_cache_stats(),
+        "business_access": access_cache_stats(),
+    }
+
+@router.get("/stats/db-pool", response_model=DbPoolStats)
+def get_db_pool_stats(current_user: User = Depends(require_admin_role)):
+    """
+    Estado del pool de conexiones de este proceso y latencia de checkout.
+    Muchos `waiting`/`timeouts` o un histograma cargado a la derecha indican
+    pool agotado.
+    """
+    return {
+        "sync": pool_metrics["sync"].snapshot(engine.pool),
+        "async_": pool_metrics["async"].snapshot(async_engine.pool) if async_engine else None,
+    }
@@ -10,6 +10,7 @@ from app.models.business import Business, BusinessUser
 from app.schemas.user import UserResponse, UserWithBusinesses
 from app.schemas.business import BusinessResponse
 from app.utils.audit import log_action
+from app.api.deps import invalidate_access_cache
 from .deps import require_admin_role, require_super_admin
 
 router = APIRouter()
@@ -100,13 +101,12 @@ def update_user_admin(
         changes['new_plan'] = data.subscription_plan
         user.subscription_plan = data.subscription_plan
     
-    db.commit()
-    db.refresh(user)
-    
     log_action(
         db, current_user.id, "UPDATE_USER_ADMIN", "User", user.id,
         details={"user_email": user.email, "changes": changes}
     )
+    db.commit()
+    db.refresh(user)
     
     return user
 
@@ -137,14 +137,13 @@ def update_user_full(
             changes[field] = {"from": old_value, "to": value}
             setattr(user, field, value)
     
-    db.commit()
-    db.refresh(user)
-    
     if changes:
         log_action(
             db, current_user.id, "UPDATE_USER_FULL", "User", user.id,
             details={"user_email": user.email, "changes": changes}
         )
+    db.commit()
+    db.refresh(user)
     
     return user
 
@@ -163,14 +162,14 @@ def toggle_user_active(
         raise HTTPException(400, "No puedes desactivarte a ti mismo")
     
     user.is_active = not user.is_active
-    db.commit()
-    db.refresh(user)
-    
     log_action(
         db, current_user.id,
         "ACTIVATE_USER" if user.is_active else "DEACTIVATE_USER",
         "User", user.id,
         details={"user_email": user.email, "is_active": user.is_active}
     )
+    db.commit()
+    invalidate_access_cache(user_id=user.id)
+    db.refresh(user)
     
     return user
@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.user import User
 from app.schemas.auth import LoginRequest, Token, RegisterRequest
 from app.schemas.user import UserResponse, UserChangePassword
 from app.core.security import (
-    verify_password, get_password_hash,
+    verify_password_async, hash_password_async, PasswordHasherBusy,
     create_access_token, create_refresh_token, decode_refresh_token
 )
 from app.api.deps import get_current_active_user
@@ -19,35 +20,77 @@ class RefreshRequest(BaseModel):
     refresh_token: str
 
 
-@router.post("/register", response_model=UserResponse, status_code=201)
-def register(data: RegisterRequest, db: Session = Depends(get_db)):
+# Los endpoints que hashean contraseñas son async: bcrypt corre en el pool
+# dedicado de core.security y el acceso a BD (sync) va al threadpool, así un
+# pico de logins no ocupa los hilos que atienden ventas.
+
+def _hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Servidor ocupado, intenta de nuevo en unos segundos",
+        headers={"Retry-After": "1"},
+    )
+
+
+def _check_register_available(data: RegisterRequest, db: Session) -> None:
     if db.query(User).filter(User.email == data.email).first():
         raise HTTPException(400, "El email ya está registrado")
     if db.query(User).filter(User.username == data.username).first():
         raise HTTPException(400, "El username ya está en uso")
 
+
+def _create_user(data: RegisterRequest, hashed_password: str, db: Session) -> User:
     user = User(
         email=data.email,
         username=data.username,
         full_name=data.full_name,
         phone=data.phone,
-        hashed_password=get_password_hash(data.password),
+        hashed_password=hashed_password,
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
-
+    db.flush()
     log_action(db, user.id, "REGISTER", "User", user.id,
                details={"username": user.username})
+    db.commit()
+    db.refresh(user)
     return user
 
 
+def _get_user_by_email(email: str, db: Session) -> User | None:
+    return db.query(User).filter(User.email == email).first()
+
+
+def _record_login(user: User, new_hash: str | None, ip_address: str, db: Session) -> None:
+    if new_hash:
+        # Costo de bcrypt cambió desde que se guardó el hash
+        user.hashed_password = new_hash
+    log_action(db, user.id, "LOGIN", "User", user.id, ip_address=ip_address)
+    db.commit()
+
+
+@router.post("/register", response_model=UserResponse, status_code=201)
+async def register(data: RegisterRequest, db: Session = Depends(get_db)):
+    await run_in_threadpool(_check_register_available, data, db)
+    try:
+        hashed_password = await hash_password_async(data.password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
+    return await run_in_threadpool(_create_user, data, hashed_password, db)
+
+
 @router.post("/login", response_model=Token)
-def login(data: LoginRequest, request: Request, db: Session = Depends(get_db)):
+async def login(data: LoginRequest, request: Request, db: Session = Depends(get_db)):
     # Login por email
-    user = db.query(User).filter(User.email == data.email).first()
+    user = await run_in_threadpool(_get_user_by_email, data.email, db)
+
+    valid, new_hash = False, None
+    if user:
+        try:
+            valid, new_hash = await verify_password_async(data.password, user.hashed_password)
+        except PasswordHasherBusy:
+            raise _hasher_busy()
 
-    if not user or not verify_password(data.password, user.hashed_password):
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Credenciales incorrectas",
@@ -60,8 +103,7 @@ def login(data: LoginRequest, request: Request, db: Session = Depends(get_db)):
     access_token  = create_access_token(token_data)
     refresh_token = create_refresh_token(token_data)
 
-    log_action(db, user.id, "LOGIN", "User", user.id,
-               ip_address=request.client.host)
+    await run_in_threadpool(_record_login, user, new_hash, request.client.host, db)
 
     return {
         "access_token": access_token,
@@ -88,19 +130,27 @@ def refresh_token(data: RefreshRequest, db: Session = Depends(get_db)):
     }
 
 
+def _save_new_password(user: User, hashed_password: str, db: Session) -> None:
+    user.hashed_password = hashed_password
+    log_action(db, user.id, "CHANGE_PASSWORD", "User", user.id)
+    db.commit()
+
+
 @router.post("/change-password")
-def change_password(
+async def change_password(
     data: UserChangePassword,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    if not verify_password(data.current_password, current_user.hashed_password):
-        raise HTTPException(400, "Contraseña actual incorrecta")
-
-    current_user.hashed_password = get_password_hash(data.new_password)
-    db.commit()
-
-    log_action(db, current_user.id, "CHANGE_PASSWORD", "User", current_user.id)
+    try:
+        valid, _ = await verify_password_async(data.current_password, current_user.hashed_password)
+        if not valid:
+            raise HTTPException(400, "Contraseña actual incorrecta")
+        hashed_password = await hash_password_async(data.new_password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
+
+    await run_in_threadpool(_save_new_password, current_user, hashed_password, db)
     return {"message": "Contraseña actualizada correctamente"}
 
 
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from typing import List
 from app.database import get_db
+from app.api import loaders
 from app.models.user import User
 from app.models.business import Business, BusinessUser
 from app.models.role import BusinessRole, Permission
@@ -14,9 +15,11 @@ from app.api.deps import (
     get_current_active_user,
     verify_business_access,
     verify_business_owner,
-    verify_can_manage_users
+    verify_can_manage_users,
+    invalidate_access_cache
 )
 from app.utils.audit import log_action
+from app.utils.audit_archive import query_audit_logs
 from app.utils.plan_limits import get_modules_for_plan, get_max_businesses
 from app.core.permissions import get_default_employee_permissions
 
@@ -53,17 +56,19 @@ def create_business(
     db.add(business)
     db.flush()
 
-    # Rol por defecto "Empleado"
+    # Rol por defecto "Empleado", con los permisos básicos desde el INSERT
+    default_codes = get_default_employee_permissions()
+    perms = db.query(Permission).filter(Permission.code.in_(default_codes)).all()
     default_role = BusinessRole(
         business_id=business.id,
         name="Empleado",
         description="Rol básico para empleados",
         is_default=True,
         can_manage_users=False,
-        can_manage_roles=False
+        can_manage_roles=False,
+        permissions=perms,
     )
     db.add(default_role)
-    db.flush()
     
     default_methods = [
     PaymentMethod(business_id=business.id, name="Efectivo", is_default=True, is_credit=False),
@@ -72,16 +77,10 @@ def create_business(
     for m in default_methods:
         db.add(m)
 
-    # Asignar permisos básicos al rol empleado
-    default_codes = get_default_employee_permissions()
-    perms = db.query(Permission).filter(Permission.code.in_(default_codes)).all()
-    default_role.permissions = perms
-
-    db.commit()
-    db.refresh(business)
-
     log_action(db, current_user.id, "CREATE", "Business", business.id,
                business_id=business.id, details={"name": business.name})
+    db.commit()
+    db.refresh(business)
     return business
 
 
@@ -95,7 +94,7 @@ def list_my_businesses(
         Business.is_active == True
     ).all()
 
-    memberships = db.query(BusinessUser).filter(
+    memberships = db.query(BusinessUser).options(joinedload(BusinessUser.business)).filter(
         BusinessUser.user_id == current_user.id,
         BusinessUser.is_active == True
     ).all()
@@ -126,9 +125,10 @@ def delete_business(
     db: Session = Depends(get_db)
 ):
     business.is_active = False
-    db.commit()
     log_action(db, current_user.id, "DELETE", "Business", business.id,
                business_id=business.id)
+    db.commit()
+    invalidate_access_cache(business_id=business.id)
 
 
 # ── Gestión de usuarios del negocio ───────────────────────────────────────────
@@ -174,8 +174,8 @@ def invite_user(
         existing.business_role_id = data.business_role_id
         existing.invited_by = current_user.id
         db.commit()
-        db.refresh(existing)
-        return _build_user_response(existing, target_user)
+        invalidate_access_cache(user_id=target_user.id, business_id=business_id)
+        return _get_user_response(db, existing.id)
 
     # Verificar que el rol pertenece al negocio
     role = db.query(BusinessRole).filter(
@@ -192,13 +192,12 @@ def invite_user(
         invited_by=current_user.id
     )
     db.add(new_member)
-    db.commit()
-    db.refresh(new_member)
-
+    db.flush()
     log_action(db, current_user.id, "INVITE", "BusinessUser", new_member.id,
                business_id=business_id, details={"invited_user": target_user.email})
-
-    return _build_user_response(new_member, target_user)
+    db.commit()
+    invalidate_access_cache(user_id=target_user.id, business_id=business_id)
+    return _get_user_response(db, new_member.id)
 
 
 @router.get("/{business_id}/users", response_model=List[BusinessUserResponse])
@@ -208,7 +207,7 @@ def list_business_users(
     db: Session = Depends(get_db)
 ):
     business, _ = result
-    members = db.query(BusinessUser).filter(
+    members = db.query(BusinessUser).options(*loaders.business_member()).filter(
         BusinessUser.business_id == business_id,
         BusinessUser.is_active == True
     ).all()
@@ -240,14 +239,12 @@ def update_user_role(
         raise HTTPException(404, "Rol no encontrado")
 
     member.business_role_id = data.business_role_id
-    db.commit()
-    db.refresh(member)
-
     log_action(db, current_user.id, "UPDATE_ROLE", "BusinessUser", member.id,
                business_id=business_id,
                details={"user_id": user_id, "new_role": role.name})
-
-    return _build_user_response(member, member.user)
+    db.commit()
+    invalidate_access_cache(user_id=user_id, business_id=business_id)
+    return _get_user_response(db, member.id)
 
 
 @router.delete("/{business_id}/users/{user_id}", status_code=204)
@@ -269,10 +266,10 @@ def remove_user(
         raise HTTPException(400, "No puedes remover al dueño del negocio")
 
     member.is_active = False
-    db.commit()
-
     log_action(db, current_user.id, "REMOVE", "BusinessUser", member.id,
                business_id=business_id, details={"removed_user_id": user_id})
+    db.commit()
+    invalidate_access_cache(user_id=user_id, business_id=business_id)
 
 
 # ── Audit log del negocio ──────────────────────────────────────────────────────
@@ -283,15 +280,11 @@ def get_business_audit_logs(
     result = Depends(verify_business_access),
     db: Session = Depends(get_db)
 ):
-    from app.models.role import AuditLog
     business, is_owner = result
     if not is_owner:
         raise HTTPException(403, "Solo el dueño puede ver el audit log")
 
-    logs = db.query(AuditLog).filter(
-        AuditLog.business_id == business_id
-    ).order_by(AuditLog.created_at.desc()).limit(200).all()
-    return logs
+    return query_audit_logs(db, business_id=business_id, limit=200).items
 
 
 # ── Helper interno ─────────────────────────────────────────────────────────────
@@ -314,4 +307,12 @@ def _build_user_response(member: BusinessUser, user: User) -> dict:
         "can_manage_users": role.can_manage_users if role else False,
         "can_manage_roles": role.can_manage_roles if role else False,
         "permissions": [p.code for p in role.permissions] if role else [],
-    }
\ No newline at end of file
+    }
+
+
+def _get_user_response(db: Session, member_id: int) -> dict:
+    """Recarga el miembro con usuario, rol y permisos y arma el response."""
+    member = db.query(BusinessUser).options(*loaders.business_member()).filter(
+        BusinessUser.id == member_id
+    ).one()
+    return _build_user_response(member, member.user)
\ No newline at end of file
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func
 from typing import List, Optional
 from datetime import datetime, timedelta
 from decimal import Decimal
@@ -15,7 +15,9 @@ from app.schemas.client import (
     ClientPurchaseResponse, ClientStats, PortfolioSummary, PortfolioMovement,
 )
 from app.api.deps import get_current_active_user, verify_business_access
+from app.api.pagination import CursorPage
 from app.utils.audit import log_action
+from app.utils.idempotency import IdempotencyGuard, idempotency
 
 router = APIRouter(prefix="/businesses/{business_id}/clients", tags=["Clientes"])
 
@@ -65,9 +67,10 @@ def create_client(
 ):
     client = Client(business_id=business_id, **data.model_dump())
     db.add(client)
+    db.flush()
+    log_action(db, current_user.id, "CREATE", "Client", client.id, business_id=business_id)
     db.commit()
     db.refresh(client)
-    log_action(db, current_user.id, "CREATE", "Client", client.id, business_id=business_id)
     return client
 
 
@@ -79,9 +82,11 @@ def list_clients(
     search: Optional[str] = Query(None),
     status: Optional[ClientStatus] = Query(None),
     has_debt: Optional[bool] = Query(None),
+    page: CursorPage = Depends(),
     skip: int = 0,
     limit: int = 50,
 ):
+    """Más recientes primero: por última compra, o por alta si nunca compró."""
     query = db.query(Client).filter(
         Client.business_id == business_id,
         Client.is_active == True
@@ -100,7 +105,10 @@ def list_clients(
     if has_debt is False:
         query = query.filter(Client.current_balance <= 0)
 
-    return query.order_by(desc(Client.last_purchase_at)).offset(skip).limit(limit).all()
+    return page.fetch(
+        query, func.coalesce(Client.last_purchase_at, Client.created_at), Client.id, skip, limit,
+        row_key=lambda c: (c.last_purchase_at or c.created_at, c.id),
+    )
 
 
 @router.get("/{client_id}", response_model=ClientResponse)
@@ -125,9 +133,9 @@ def update_client(
     client = get_client_or_404(client_id, business_id, db)
     for field, value in data.model_dump(exclude_none=True).items():
         setattr(client, field, value)
+    log_action(db, current_user.id, "UPDATE", "Client", client.id, business_id=business_id)
     db.commit()
     db.refresh(client)
-    log_action(db, current_user.id, "UPDATE", "Client", client.id, business_id=business_id)
     return client
 
 
@@ -143,8 +151,8 @@ def delete_client(
     if client.current_balance > 0:
         raise HTTPException(400, f"El cliente tiene una deuda de ${client.current_balance}. Salda la deuda antes de eliminar.")
     client.is_active = False
-    db.commit()
     log_action(db, current_user.id, "DELETE", "Client", client.id, business_id=business_id)
+    db.commit()
 
 
 # ── Estadísticas ──────────────────────────────────────────────────────────────
@@ -205,13 +213,13 @@ def get_client_purchases(
     client_id: int,
     result=Depends(verify_business_access),
     db: Session = Depends(get_db),
+    page: CursorPage = Depends(),
     skip: int = 0,
     limit: int = 50,
 ):
     get_client_or_404(client_id, business_id, db)
-    return db.query(ClientPurchase).filter(
-        ClientPurchase.client_id == client_id
-    ).order_by(desc(ClientPurchase.created_at)).offset(skip).limit(limit).all()
+    query = db.query(ClientPurchase).filter(ClientPurchase.client_id == client_id)
+    return page.fetch(query, ClientPurchase.created_at, ClientPurchase.id, skip, limit)
 
 
 # ── Cartera / Crédito ─────────────────────────────────────────────────────────
@@ -223,8 +231,13 @@ def add_credit_movement(
     data: CreditMovementCreate,
     result=Depends(verify_business_access),
     current_user: User = Depends(get_current_active_user),
+    idem: IdempotencyGuard = Depends(idempotency),
     db: Session = Depends(get_db)
 ):
+    replay = idem.begin(db, data)
+    if replay:
+        return replay
+
     client = get_client_or_404(client_id, business_id, db)
 
     if data.movement_type == "charge":
@@ -255,13 +268,15 @@ def add_credit_movement(
     db.add(movement)
 
     update_client_status(client, db)
-    db.commit()
-    db.refresh(movement)
-
+    db.flush()
     log_action(db, current_user.id, data.movement_type.upper(), "CreditMovement",
                movement.id, business_id=business_id,
                details={"client_id": client_id, "amount": str(data.amount)})
-    return movement
+    db.refresh(movement)
+    response = CreditMovementResponse.model_validate(movement)
+    idem.save(db, response, 201)
+    db.commit()
+    return response
 
 
 @router.get("/{client_id}/credit", response_model=List[CreditMovementResponse])
@@ -270,13 +285,13 @@ def get_credit_movements(
     client_id: int,
     result=Depends(verify_business_access),
     db: Session = Depends(get_db),
+    page: CursorPage = Depends(),
     skip: int = 0,
     limit: int = 50,
 ):
     get_client_or_404(client_id, business_id, db)
-    return db.query(CreditMovement).filter(
-        CreditMovement.client_id == client_id
-    ).order_by(desc(CreditMovement.created_at)).offset(skip).limit(limit).all()
+    query = db.query(CreditMovement).filter(CreditMovement.client_id == client_id)
+    return page.fetch(query, CreditMovement.created_at, CreditMovement.id, skip, limit)
 
 
 # ── Utilidad: recalcular estados de todos los clientes del negocio ────────────
@@ -341,21 +356,22 @@ def get_portfolio_movements(
     result=Depends(verify_business_access),
     db: Session = Depends(get_db),
     movement_type: Optional[str] = Query(None),
+    page: CursorPage = Depends(),
     skip: int = 0,
     limit: int = 100,
 ):
     """Historial global de movimientos de cartera."""
-    query = db.query(CreditMovement).filter(
+    query = db.query(CreditMovement).options(joinedload(CreditMovement.client)).filter(
         CreditMovement.business_id == business_id,
     )
     if movement_type:
         query = query.filter(CreditMovement.movement_type == movement_type)
 
-    movements = query.order_by(desc(CreditMovement.created_at)).offset(skip).limit(limit).all()
+    movements = page.fetch(query, CreditMovement.created_at, CreditMovement.id, skip, limit)
 
     result_list = []
     for m in movements:
-        client = db.query(Client).filter(Client.id == m.client_id).first()
+        client = m.client
         result_list.append(PortfolioMovement(
             id=m.id,
             client_id=m.client_id,
@@ -1,16 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc, and_
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, func
 from typing import List, Optional
 from datetime import datetime, date, timedelta
 from decimal import Decimal
 
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.models.finance import (
     CashRegister, CashSession, CashMovement,
     SessionPaymentBreakdown,
 )
-from app.models.sale import Sale, SalePayment, PaymentMethod
+from app.models.sale import Sale, PaymentMethod, SalesDailyRollup
 from app.models.enums import SaleStatus, CashRegisterStatus, CashMovementType
 from app.models.user import User
 from app.schemas.finance import (
@@ -20,8 +20,11 @@ from app.schemas.finance import (
     CashSessionResponse, PaymentBreakdownResponse,
     FinanceSummary,
 )
+from app.api import loaders
 from app.api.deps import get_current_active_user, verify_business_access
+from app.api.pagination import CursorPage
 from app.utils.audit import log_action
+from app.utils.sales_rollup import day_bounds, local_today
 
 router = APIRouter(prefix="/businesses/{business_id}/finance", tags=["Finanzas"])
 
@@ -39,16 +42,23 @@ def get_register_or_404(register_id: int, business_id: int, db: Session) -> Cash
     return register
 
 
-def get_open_session(register_id: int, db: Session) -> Optional[CashSession]:
-    return db.query(CashSession).filter(
+def get_open_session(register_id: int, db: Session, options: tuple = ()) -> Optional[CashSession]:
+    return db.query(CashSession).options(*options).filter(
         CashSession.register_id == register_id,
         CashSession.status == CashRegisterStatus.OPEN,
     ).first()
 
 
+def get_session_response(session_id: int, db: Session) -> CashSessionResponse:
+    session = db.query(CashSession).options(*loaders.cash_session()).filter(
+        CashSession.id == session_id
+    ).one()
+    return build_session_response(session, db)
+
+
 def build_session_response(session: CashSession, db: Session) -> CashSessionResponse:
-    opener = db.query(User).filter(User.id == session.opened_by).first()
-    closer = db.query(User).filter(User.id == session.closed_by).first() if session.closed_by else None
+    opener = session.opener
+    closer = session.closer
 
     movements = [
         CashMovementResponse(
@@ -201,14 +211,13 @@ def open_session(
         status=CashRegisterStatus.OPEN,
     )
     db.add(session)
-    db.commit()
-    db.refresh(session)
-
+    db.flush()
     log_action(db, current_user.id, "OPEN", "CashSession", session.id,
                business_id=business_id,
                details={"opening_amount": str(data.opening_amount)})
+    db.commit()
 
-    return build_session_response(session, db)
+    return get_session_response(session.id, db)
 
 
 @router.post("/registers/{register_id}/close", response_model=CashSessionResponse)
@@ -221,14 +230,12 @@ def close_session(
     db: Session = Depends(get_db),
 ):
     register = get_register_or_404(register_id, business_id, db)
-    session = get_open_session(register_id, db)
+    session = get_open_session(register_id, db, (selectinload(CashSession.movements),))
     if not session:
         raise HTTPException(400, "Esta caja no tiene una sesión abierta")
 
     # 1. Consolidar ventas del período de la sesión desde sales
-    sales = db.query(Sale).options(
-        joinedload(Sale.payments).joinedload(SalePayment.payment_method)
-    ).filter(
+    sales = db.query(Sale).options(*loaders.session_sales()).filter(
         Sale.business_id == business_id,
         Sale.created_at >= session.opened_at,
         Sale.created_at <= datetime.utcnow(),
@@ -299,9 +306,6 @@ def close_session(
     session.total_expense = total_expense
     session.total_credit = total_credit
 
-    db.commit()
-    db.refresh(session)
-
     log_action(db, current_user.id, "CLOSE", "CashSession", session.id,
                business_id=business_id,
                details={
@@ -309,8 +313,9 @@ def close_session(
                    "expected_amount": str(expected_amount),
                    "difference": str(difference),
                })
+    db.commit()
 
-    return build_session_response(session, db)
+    return get_session_response(session.id, db)
 
 
 def _get_default_cash_method_id(business_id: int, db: Session) -> int:
@@ -331,15 +336,10 @@ def get_current_session(
     db: Session = Depends(get_db),
 ):
     get_register_or_404(register_id, business_id, db)
-    session = get_open_session(register_id, db)
+    session = get_open_session(register_id, db, loaders.cash_session())
     if not session:
         raise HTTPException(404, "No hay sesión abierta en esta caja")
 
-    session = db.query(CashSession).options(
-        joinedload(CashSession.movements),
-        joinedload(CashSession.payment_breakdown),
-    ).filter(CashSession.id == session.id).first()
-
     return build_session_response(session, db)
 
 
@@ -351,16 +351,15 @@ def list_sessions(
     register_id: int,
     result=Depends(verify_business_access),
     db: Session = Depends(get_db),
+    page: CursorPage = Depends(),
     skip: int = 0,
     limit: int = 30,
 ):
     get_register_or_404(register_id, business_id, db)
-    sessions = db.query(CashSession).options(
-        joinedload(CashSession.movements),
-        joinedload(CashSession.payment_breakdown),
-    ).filter(
+    query = db.query(CashSession).options(*loaders.cash_session()).filter(
         CashSession.register_id == register_id,
-    ).order_by(desc(CashSession.opened_at)).offset(skip).limit(limit).all()
+    )
+    sessions = page.fetch(query, CashSession.opened_at, CashSession.id, skip, limit)
 
     return [build_session_response(s, db) for s in sessions]
 
@@ -397,14 +396,9 @@ def add_movement(
 
 # ── Resumen general ───────────────────────────────────────────────────────────
 
-@router.get("/summary", response_model=FinanceSummary)
-def get_finance_summary(
-    business_id: int,
-    result=Depends(verify_business_access),
-    db: Session = Depends(get_db),
-):
-    today_start = datetime.combine(date.today(), datetime.min.time())
-    today_end = datetime.combine(date.today(), datetime.max.time())
+def _finance_summary(db: Session, business_id: int) -> FinanceSummary:
+    today = local_today()
+    today_start, today_end = day_bounds(today, today)
 
     # Sesiones abiertas
     open_sessions = db.query(CashSession).filter(
@@ -417,22 +411,20 @@ def get_finance_summary(
         CashRegister.is_active == True,
     ).count()
 
-    # Ventas de hoy
-    today_sales = db.query(Sale).filter(
-        Sale.business_id == business_id,
-        Sale.created_at >= today_start,
-        Sale.created_at <= today_end,
-        Sale.status == SaleStatus.COMPLETED,
-    ).all()
-
-    today_revenue = sum(s.total for s in today_sales) or Decimal("0")
-    today_credit = sum(s.amount_credit for s in today_sales) or Decimal("0")
+    # Ventas de hoy, desde el resumen diario
+    today_revenue, today_credit = db.query(
+        func.coalesce(func.sum(SalesDailyRollup.total), 0),
+        func.coalesce(func.sum(SalesDailyRollup.amount_credit), 0),
+    ).filter(
+        SalesDailyRollup.business_id == business_id,
+        SalesDailyRollup.day == today,
+    ).one()
 
     # Gastos manuales de hoy
     today_movements = db.query(CashMovement).filter(
         CashMovement.business_id == business_id,
         CashMovement.created_at >= today_start,
-        CashMovement.created_at <= today_end,
+        CashMovement.created_at < today_end,
         CashMovement.movement_type == CashMovementType.EXPENSE,
     ).all()
     today_expenses = sum(m.amount for m in today_movements) or Decimal("0")
@@ -445,4 +437,13 @@ def get_finance_summary(
         today_expenses=today_expenses,
         today_credit=today_credit,
         today_net=today_net,
-    )
\ No newline at end of file
+    )
+
+
+@router.get("/summary", response_model=FinanceSummary)
+async def get_finance_summary(
+    business_id: int,
+    result=Depends(verify_business_access),
+    db=Depends(get_async_db),
+):
+    return await db.run_sync(_finance_summary, business_id)
@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc
+from sqlalchemy import and_
+from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
 from datetime import datetime, timedelta
 from decimal import Decimal
 
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.models.inventory import (
     Product, ProductPresentation, ProductCategory,
     ProductStock, ProductLot, InventoryMovement,
@@ -21,26 +21,18 @@ from app.schemas.inventory import (
     EntryCreate, AdjustmentCreate, TransferCreate, MovementResponse,
     LowStockAlert, ExpiryAlert, LotResponse,
 )
+from app.api import loaders
 from app.api.deps import get_current_active_user, verify_business_access
+from app.api.pagination import CursorPage
 from app.utils.audit import log_action
+from app.utils.product_search import index_products, search_hits
+from app.utils.stock import change_stock, InsufficientStock, allocate_lots, refresh_low_stock
 
 router = APIRouter(prefix="/businesses/{business_id}/inventory", tags=["Inventario"])
 
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
-def get_or_create_stock(presentation_id: int, warehouse_id: int, db: Session) -> ProductStock:
-    stock = db.query(ProductStock).filter(
-        ProductStock.presentation_id == presentation_id,
-        ProductStock.warehouse_id == warehouse_id
-    ).first()
-    if not stock:
-        stock = ProductStock(presentation_id=presentation_id, warehouse_id=warehouse_id, quantity=0)
-        db.add(stock)
-        db.flush()
-    return stock
-
-
 def build_stock_response(presentation: ProductPresentation) -> list:
     return [
         {"warehouse_id": s.warehouse_id, "warehouse_name": s.warehouse.name, "quantity": s.quantity}
@@ -48,6 +40,23 @@ def build_stock_response(presentation: ProductPresentation) -> list:
     ]
 
 
+def get_product_or_404(db: Session, business_id: int, product_id: int) -> Product:
+    product = db.query(Product).options(*loaders.product()).filter(
+        Product.id == product_id,
+        Product.business_id == business_id,
+        Product.is_active == True
+    ).first()
+    if not product:
+        raise HTTPException(404, "Producto no encontrado")
+    return product
+
+
+def get_presentation(db: Session, presentation_id: int) -> ProductPresentation:
+    return db.query(ProductPresentation).options(*loaders.presentation_stock()).filter(
+        ProductPresentation.id == presentation_id
+    ).one()
+
+
 # ── Categorías ────────────────────────────────────────────────────────────────
 
 @router.post("/categories", response_model=CategoryResponse, status_code=201)
@@ -205,51 +214,63 @@ def create_product(
             **p.model_dump()
         )
         db.add(presentation)
+    index_products(db, [product.id])
 
-    db.commit()
-    db.refresh(product)
     log_action(db, current_user.id, "CREATE", "Product", product.id, business_id=business_id)
-    return product
+    db.commit()
+    return get_product_or_404(db, business_id, product.id)
 
-@router.get("/products", response_model=List[ProductResponse])
-def list_products(
+def _list_products(
+    db: Session,
     business_id: int,
-    result=Depends(verify_business_access),
-    db: Session = Depends(get_db),
-    search: Optional[str] = Query(None),
-    category_id: Optional[int] = Query(None),
-    is_perishable: Optional[bool] = Query(None),
-    low_stock: Optional[bool] = Query(None),
-    skip: int = 0,
-    limit: int = 50,
-):
-    query = db.query(Product).options(
-        joinedload(Product.category),
-        joinedload(Product.presentations).joinedload(ProductPresentation.stock).joinedload(ProductStock.warehouse)
-    ).filter(
+    search: Optional[str],
+    category_id: Optional[int],
+    is_perishable: Optional[bool],
+    low_stock: Optional[bool],
+    skip: int,
+    limit: int,
+) -> List[ProductResponse]:
+    query = db.query(Product).options(*loaders.product()).filter(
         Product.business_id == business_id,
         Product.is_active == True
     )
 
-    if search:
-        query = query.filter(Product.name.ilike(f"%{search}%"))
+    order = [Product.name]
+    hits = search_hits(db, business_id, search) if search else None
+    if hits is not None:
+        # Sin tildes, por prefijo y los más relevantes primero
+        query = query.join(hits, hits.c.product_id == Product.id)
+        order = [hits.c.rank, Product.name]
     if category_id:
         query = query.filter(Product.category_id == category_id)
     if is_perishable is not None:
         query = query.filter(Product.is_perishable == is_perishable)
+    if low_stock:
+        # Antes de paginar: con el filtro las páginas salen completas
+        query = query.filter(Product.presentations.any(and_(
+            ProductPresentation.is_active == True,
+            ProductPresentation.stock.any(ProductStock.is_low == True),
+        )))
 
-    products = query.order_by(Product.name).offset(skip).limit(limit).all()
+    products = query.order_by(*order).offset(skip).limit(limit).all()
 
-    if low_stock:
-        products = [
-            p for p in products
-            if any(
-                any(s.quantity <= pres.min_stock for s in pres.stock)
-                for pres in p.presentations if pres.is_active
-            )
-        ]
+    return [ProductResponse.model_validate(p) for p in products]
 
-    return products
+@router.get("/products", response_model=List[ProductResponse])
+async def list_products(
+    business_id: int,
+    result=Depends(verify_business_access),
+    db=Depends(get_async_db),
+    search: Optional[str] = Query(None),
+    category_id: Optional[int] = Query(None),
+    is_perishable: Optional[bool] = Query(None),
+    low_stock: Optional[bool] = Query(None),
+    skip: int = 0,
+    limit: int = 50,
+):
+    return await db.run_sync(
+        _list_products, business_id, search, category_id, is_perishable, low_stock, skip, limit
+    )
 
 @router.get("/products/{product_id}", response_model=ProductResponse)
 def get_product(
@@ -257,17 +278,7 @@ def get_product(
     result=Depends(verify_business_access),
     db: Session = Depends(get_db)
 ):
-    product = db.query(Product).options(
-        joinedload(Product.category),
-        joinedload(Product.presentations).joinedload(ProductPresentation.stock).joinedload(ProductStock.warehouse)
-    ).filter(
-        Product.id == product_id,
-        Product.business_id == business_id,
-        Product.is_active == True
-    ).first()
-    if not product:
-        raise HTTPException(404, "Producto no encontrado")
-    return product
+    return get_product_or_404(db, business_id, product_id)
 
 @router.patch("/products/{product_id}", response_model=ProductResponse)
 def update_product(
@@ -283,10 +294,10 @@ def update_product(
         raise HTTPException(404, "Producto no encontrado")
     for field, value in data.model_dump(exclude_none=True).items():
         setattr(product, field, value)
-    db.commit()
-    db.refresh(product)
+    index_products(db, [product.id])
     log_action(db, current_user.id, "UPDATE", "Product", product.id, business_id=business_id)
-    return product
+    db.commit()
+    return get_product_or_404(db, business_id, product.id)
 
 @router.delete("/products/{product_id}", status_code=204)
 def delete_product(
@@ -295,7 +306,9 @@ def delete_product(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    product = db.query(Product).filter(
+    product = db.query(Product).options(
+        selectinload(Product.presentations).selectinload(ProductPresentation.stock)
+    ).filter(
         Product.id == product_id, Product.business_id == business_id
     ).first()
     if not product:
@@ -307,8 +320,9 @@ def delete_product(
     if has_stock:
         raise HTTPException(400, "El producto tiene stock activo. Ajusta el inventario antes de eliminar.")
     product.is_active = False
-    db.commit()
+    index_products(db, [product.id])
     log_action(db, current_user.id, "DELETE", "Product", product.id, business_id=business_id)
+    db.commit()
 
 
 # ── Presentaciones ────────────────────────────────────────────────────────────
@@ -328,9 +342,9 @@ def add_presentation(
         product_id=product_id, business_id=business_id, **data.model_dump()
     )
     db.add(presentation)
+    index_products(db, [product_id])
     db.commit()
-    db.refresh(presentation)
-    return presentation
+    return get_presentation(db, presentation.id)
 
 @router.patch("/products/{product_id}/presentations/{presentation_id}", response_model=PresentationResponse)
 def update_presentation(
@@ -345,11 +359,15 @@ def update_presentation(
     ).first()
     if not pres:
         raise HTTPException(404, "Presentación no encontrada")
-    for field, value in data.model_dump(exclude_none=True).items():
+    changes = data.model_dump(exclude_none=True)
+    for field, value in changes.items():
         setattr(pres, field, value)
+    if "min_stock" in changes:
+        refresh_low_stock(db, pres.id, pres.min_stock)
+    if changes.keys() & {"name", "barcode", "is_active"}:
+        index_products(db, [product_id])
     db.commit()
-    db.refresh(pres)
-    return pres
+    return get_presentation(db, pres.id)
 
 
 # ── Movimientos de inventario ─────────────────────────────────────────────────
@@ -378,8 +396,7 @@ def register_entry(
     db.flush()
 
     # Actualizar stock
-    stock = get_or_create_stock(data.presentation_id, data.warehouse_id, db)
-    stock.quantity += data.quantity
+    change_stock(db, {(data.presentation_id, data.warehouse_id): data.quantity})
 
     # Movimiento
     movement = InventoryMovement(
@@ -394,10 +411,11 @@ def register_entry(
         created_by=current_user.id,
     )
     db.add(movement)
-    db.commit()
-    db.refresh(movement)
+    db.flush()
     log_action(db, current_user.id, "ENTRY", "Inventory", movement.id, business_id=business_id,
                details={"presentation_id": data.presentation_id, "quantity": str(data.quantity)})
+    db.commit()
+    db.refresh(movement)
     return movement
 
 
@@ -409,13 +427,10 @@ def register_adjustment(
     db: Session = Depends(get_db)
 ):
     """Ajuste manual — puede ser positivo o negativo."""
-    stock = get_or_create_stock(data.presentation_id, data.warehouse_id, db)
-
-    new_quantity = stock.quantity + data.quantity
-    if new_quantity < 0:
-        raise HTTPException(400, f"Stock insuficiente. Disponible: {stock.quantity}")
-
-    stock.quantity = new_quantity
+    try:
+        change_stock(db, {(data.presentation_id, data.warehouse_id): data.quantity})
+    except InsufficientStock as e:
+        raise HTTPException(400, f"Stock insuficiente. Disponible: {e.available}")
 
     movement = InventoryMovement(
         business_id=business_id,
@@ -427,10 +442,11 @@ def register_adjustment(
         created_by=current_user.id,
     )
     db.add(movement)
-    db.commit()
-    db.refresh(movement)
+    db.flush()
     log_action(db, current_user.id, "ADJUSTMENT", "Inventory", movement.id, business_id=business_id,
                details={"reason": data.reason, "quantity": str(data.quantity)})
+    db.commit()
+    db.refresh(movement)
     return movement
 
 
@@ -445,13 +461,28 @@ def register_transfer(
     if data.from_warehouse_id == data.to_warehouse_id:
         raise HTTPException(400, "Las bodegas de origen y destino deben ser diferentes")
 
-    stock_out = get_or_create_stock(data.presentation_id, data.from_warehouse_id, db)
-    if stock_out.quantity < data.quantity:
-        raise HTTPException(400, f"Stock insuficiente en bodega origen. Disponible: {stock_out.quantity}")
-
-    stock_out.quantity -= data.quantity
-    stock_in = get_or_create_stock(data.presentation_id, data.to_warehouse_id, db)
-    stock_in.quantity += data.quantity
+    try:
+        change_stock(db, {
+            (data.presentation_id, data.from_warehouse_id): -data.quantity,
+            (data.presentation_id, data.to_warehouse_id): data.quantity,
+        })
+    except InsufficientStock as e:
+        raise HTTPException(400, f"Stock insuficiente en bodega origen. Disponible: {e.available}")
+
+    # Los lotes viajan con su vencimiento y costo (FEFO en origen)
+    source = (data.presentation_id, data.from_warehouse_id)
+    for lot, quantity in allocate_lots(db, {source: data.quantity})[source]:
+        db.add(ProductLot(
+            presentation_id=data.presentation_id,
+            warehouse_id=data.to_warehouse_id,
+            business_id=business_id,
+            lot_number=lot.lot_number,
+            quantity=quantity,
+            remaining=quantity,
+            cost_per_unit=lot.cost_per_unit,
+            arrival_date=lot.arrival_date,
+            expiry_date=lot.expiry_date,
+        ))
 
     movement = InventoryMovement(
         business_id=business_id,
@@ -464,9 +495,10 @@ def register_transfer(
         created_by=current_user.id,
     )
     db.add(movement)
+    db.flush()
+    log_action(db, current_user.id, "TRANSFER", "Inventory", movement.id, business_id=business_id)
     db.commit()
     db.refresh(movement)
-    log_action(db, current_user.id, "TRANSFER", "Inventory", movement.id, business_id=business_id)
     return movement
 
 
@@ -478,6 +510,7 @@ def list_movements(
     presentation_id: Optional[int] = Query(None),
     warehouse_id: Optional[int] = Query(None),
     movement_type: Optional[MovementType] = Query(None),
+    page: CursorPage = Depends(),
     skip: int = 0,
     limit: int = 100,
 ):
@@ -490,7 +523,7 @@ def list_movements(
         query = query.filter(InventoryMovement.warehouse_id == warehouse_id)
     if movement_type:
         query = query.filter(InventoryMovement.movement_type == movement_type)
-    return query.order_by(desc(InventoryMovement.created_at)).offset(skip).limit(limit).all()
+    return page.fetch(query, InventoryMovement.created_at, InventoryMovement.id, skip, limit)
 
 
 # ── Lotes ─────────────────────────────────────────────────────────────────────
@@ -516,31 +549,39 @@ def get_low_stock_alerts(
     result=Depends(verify_business_access),
     db: Session = Depends(get_db)
 ):
-    alerts = []
-    presentations = db.query(ProductPresentation).join(Product).filter(
-        Product.business_id == business_id,
-        Product.is_active == True,
+    # Solo las filas marcadas al escribir (ProductStock.is_low, índice parcial)
+    rows = db.query(
+        Product.id, Product.name,
+        ProductPresentation.id, ProductPresentation.name, ProductPresentation.min_stock,
+        Warehouse.id, Warehouse.name,
+        ProductStock.quantity,
+    ).select_from(ProductStock).join(
+        ProductPresentation, ProductPresentation.id == ProductStock.presentation_id,
+    ).join(
+        Product, Product.id == ProductPresentation.product_id,
+    ).join(
+        Warehouse, Warehouse.id == ProductStock.warehouse_id,
+    ).filter(
+        ProductStock.is_low == True,
+        ProductPresentation.business_id == business_id,
         ProductPresentation.is_active == True,
-        ProductPresentation.min_stock > 0
-    ).options(
-        joinedload(ProductPresentation.product),
-        joinedload(ProductPresentation.stock).joinedload(ProductStock.warehouse)
-    ).all()
+        Product.is_active == True,
+    ).order_by(Product.name, ProductPresentation.id, Warehouse.id).all()
 
-    for pres in presentations:
-        for stock in pres.stock:
-            if stock.quantity <= pres.min_stock:
-                alerts.append(LowStockAlert(
-                    product_id=pres.product.id,
-                    product_name=pres.product.name,
-                    presentation_id=pres.id,
-                    presentation_name=pres.name,
-                    warehouse_id=stock.warehouse_id,
-                    warehouse_name=stock.warehouse.name,
-                    current_stock=stock.quantity,
-                    min_stock=pres.min_stock,
-                ))
-    return alerts
+    return [
+        LowStockAlert(
+            product_id=product_id,
+            product_name=product_name,
+            presentation_id=presentation_id,
+            presentation_name=presentation_name,
+            warehouse_id=warehouse_id,
+            warehouse_name=warehouse_name,
+            current_stock=quantity,
+            min_stock=min_stock,
+        )
+        for (product_id, product_name, presentation_id, presentation_name, min_stock,
+             warehouse_id, warehouse_name, quantity) in rows
+    ]
 
 
 @router.get("/alerts/expiring", response_model=List[ExpiryAlert])
@@ -556,9 +597,7 @@ def get_expiring_alerts(
         ProductLot.is_active == True,
         ProductLot.expiry_date <= threshold,
         ProductLot.remaining > 0
-    ).options(
-        joinedload(ProductLot.presentation).joinedload(ProductPresentation.product)
-    ).order_by(ProductLot.expiry_date.asc()).all()
+    ).options(*loaders.expiring_lot()).order_by(ProductLot.expiry_date.asc()).all()
 
     return [
         ExpiryAlert(
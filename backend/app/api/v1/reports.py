@@ -1,15 +1,17 @@
+import json
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc, func
-from typing import Optional, List
+from sqlalchemy import Numeric, and_, case, cast, desc, func
+from typing import Iterator, Optional, List
 from datetime import datetime, date, timedelta
 from decimal import Decimal
 from collections import defaultdict
 
-from app.database import get_db
-from app.models.sale import Sale, SaleItem, SalePayment
+from app.database import SessionLocal, get_async_db
+from app.models.sale import Sale, SaleItem, SalesDailyRollup
 from app.models.inventory import (
-    ProductPresentation, ProductStock, ProductLot, Product,
+    ProductPresentation, ProductStock, ProductLot, Product, ProductCategory,
 )
 from app.models.client import Client, ClientPurchase, CreditMovement
 from app.models.waste import WasteRecord, WasteCause
@@ -23,104 +25,120 @@ from app.schemas.reports import (
     ProfitabilityReport, ProfitabilityItem,
 )
 from app.api.deps import verify_business_access
+from app.utils.sales_rollup import day_bounds, local_today
 
 router = APIRouter(prefix="/businesses/{business_id}/reports", tags=["Reportes"])
 
+# Filas leídas por lote al armar el reporte de inventario
+_INVENTORY_BATCH = 500
+
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
-def date_range(date_from: Optional[date], date_to: Optional[date]):
-    d_from = datetime.combine(date_from or date.today().replace(day=1), datetime.min.time())
-    d_to = datetime.combine(date_to or date.today(), datetime.max.time())
-    return d_from, d_to
+def report_days(date_from: Optional[date], date_to: Optional[date]) -> tuple[date, date]:
+    """Días locales del reporte; por defecto, el mes en curso."""
+    today = local_today()
+    return date_from or today.replace(day=1), date_to or today
+
+
+# Etiqueta de período calculada en la BD. La semana es la de strftime %W
+# (empieza el lunes; los días antes del primer lunes del año son la W00),
+# así ambos motores devuelven las mismas etiquetas
+_PERIOD_FORMATS = {"day": "%Y-%m-%d", "week": "%Y-W%W", "month": "%Y-%m"}
+
+def period_label(db: Session, column, group_by: str):
+    if db.get_bind().dialect.name == "postgresql":
+        if group_by == "week":
+            week = func.floor((func.extract("doy", column) + 7 - func.extract("isodow", column)) / 7)
+            return func.concat(func.to_char(column, "YYYY"), "-W", func.to_char(week, "FM00"))
+        if group_by == "day":
+            return func.to_char(func.date_trunc("day", column), "YYYY-MM-DD")
+        return func.to_char(func.date_trunc("month", column), "YYYY-MM")
+    return func.strftime(_PERIOD_FORMATS[group_by], column)
 
 
 # ── Reporte de ventas ─────────────────────────────────────────────────────────
 
-@router.get("/sales", response_model=SalesReport)
-def sales_report(
+def _sales_report(
+    db: Session,
     business_id: int,
-    result=Depends(verify_business_access),
-    db: Session = Depends(get_db),
-    date_from: Optional[date] = Query(None),
-    date_to: Optional[date] = Query(None),
-    group_by: str = Query("day", pattern="^(day|week|month)$"),
-):
-    d_from, d_to = date_range(date_from, date_to)
+    date_from: Optional[date],
+    date_to: Optional[date],
+    group_by: str,
+) -> SalesReport:
+    first, last = report_days(date_from, date_to)
+    d_from, d_to = day_bounds(first, last)
+
+    # Totales por período, agregados en la BD sobre el resumen diario
+    period = period_label(db, SalesDailyRollup.day, group_by).label("period")
+    sales_count = func.sum(SalesDailyRollup.sales_count)
+    periods = db.query(
+        period,
+        sales_count,
+        func.sum(SalesDailyRollup.total),
+        func.sum(SalesDailyRollup.amount_credit),
+    ).filter(
+        SalesDailyRollup.business_id == business_id,
+        SalesDailyRollup.day >= first,
+        SalesDailyRollup.day <= last,
+    ).group_by(period).having(sales_count > 0).order_by(period).all()
 
-    sales = db.query(Sale).options(
-        joinedload(Sale.items).joinedload(SaleItem.presentation)
-            .joinedload(ProductPresentation.product),
-        joinedload(Sale.payments).joinedload(SalePayment.payment_method),
+    by_period = [
+        SalesByPeriod(
+            period=key,
+            total_sales=count,
+            total_revenue=total,
+            total_credit=credit,
+            total_cash=total - credit,
+        )
+        for key, count, total, credit in periods
+    ]
+    total_sales = sum(p.total_sales for p in by_period)
+    total_revenue = sum((p.total_revenue for p in by_period), Decimal("0"))
+    total_credit = sum((p.total_credit for p in by_period), Decimal("0"))
+    avg_ticket = total_revenue / total_sales if total_sales else Decimal("0")
+
+    # Top productos: agregados y ordenados en la BD, solo las 10 filas
+    revenue = func.sum(SaleItem.subtotal)
+    top = db.query(
+        SaleItem.presentation_id,
+        Product.name,
+        ProductPresentation.name,
+        func.sum(SaleItem.quantity),
+        revenue,
+        func.count(func.distinct(SaleItem.sale_id)),
+    ).join(
+        Sale, Sale.id == SaleItem.sale_id,
+    ).join(
+        ProductPresentation, ProductPresentation.id == SaleItem.presentation_id,
+    ).join(
+        Product, Product.id == ProductPresentation.product_id,
     ).filter(
         Sale.business_id == business_id,
         Sale.created_at >= d_from,
-        Sale.created_at <= d_to,
+        Sale.created_at < d_to,
         Sale.status == SaleStatus.COMPLETED,
-    ).all()
-
-    total_revenue = sum(s.total for s in sales) or Decimal("0")
-    total_credit = sum(s.amount_credit for s in sales) or Decimal("0")
-    avg_ticket = total_revenue / len(sales) if sales else Decimal("0")
-
-    # Agrupar por período
-    period_map: dict[str, dict] = defaultdict(lambda: {
-        "total_sales": 0, "total_revenue": Decimal("0"),
-        "total_credit": Decimal("0"), "total_cash": Decimal("0"),
-    })
+    ).group_by(
+        SaleItem.presentation_id, Product.name, ProductPresentation.name,
+    ).order_by(revenue.desc(), SaleItem.presentation_id).limit(10).all()
 
-    for s in sales:
-        if group_by == "day":
-            key = s.created_at.strftime("%Y-%m-%d")
-        elif group_by == "week":
-            key = s.created_at.strftime("%Y-W%W")
-        else:
-            key = s.created_at.strftime("%Y-%m")
-
-        period_map[key]["total_sales"] += 1
-        period_map[key]["total_revenue"] += s.total
-        period_map[key]["total_credit"] += s.amount_credit
-        period_map[key]["total_cash"] += s.total - s.amount_credit
-
-    by_period = [
-        SalesByPeriod(period=k, **v)
-        for k, v in sorted(period_map.items())
+    top_products = [
+        TopProduct(
+            presentation_id=pid,
+            product_name=product_name,
+            presentation_name=presentation_name,
+            units_sold=units,
+            total_revenue=total,
+            times_sold=times,
+        )
+        for pid, product_name, presentation_name, units, total, times in top
     ]
 
-    # Top productos
-    product_map: dict[int, dict] = defaultdict(lambda: {
-        "units_sold": Decimal("0"),
-        "total_revenue": Decimal("0"),
-        "times_sold": 0,
-        "product_name": "",
-        "presentation_name": "",
-    })
-
-    for s in sales:
-        for item in s.items:
-            pid = item.presentation_id
-            product_map[pid]["units_sold"] += item.quantity
-            product_map[pid]["total_revenue"] += item.subtotal
-            product_map[pid]["times_sold"] += 1
-            if item.presentation:
-                product_map[pid]["presentation_name"] = item.presentation.name
-                if item.presentation.product:
-                    product_map[pid]["product_name"] = item.presentation.product.name
-
-    top_products = sorted(
-        [
-            TopProduct(presentation_id=pid, **data)
-            for pid, data in product_map.items()
-        ],
-        key=lambda x: x.total_revenue,
-        reverse=True,
-    )[:10]
-
     return SalesReport(
-        date_from=date_from or date.today().replace(day=1),
-        date_to=date_to or date.today(),
+        date_from=first,
+        date_to=last,
         total_revenue=total_revenue,
-        total_sales=len(sales),
+        total_sales=total_sales,
         total_credit=total_credit,
         average_ticket=avg_ticket,
         by_period=by_period,
@@ -128,14 +146,24 @@ def sales_report(
     )
 
 
-# ── Reporte de clientes ───────────────────────────────────────────────────────
-
-@router.get("/clients", response_model=ClientsReport)
-def clients_report(
+@router.get("/sales", response_model=SalesReport)
+async def sales_report(
     business_id: int,
     result=Depends(verify_business_access),
-    db: Session = Depends(get_db),
+    db=Depends(get_async_db),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    group_by: str = Query("day", pattern="^(day|week|month)$"),
 ):
+    return await db.run_sync(_sales_report, business_id, date_from, date_to, group_by)
+
+
+# ── Reporte de clientes ───────────────────────────────────────────────────────
+
+def _clients_report(
+    db: Session,
+    business_id: int,
+) -> ClientsReport:
     clients = db.query(Client).filter(
         Client.business_id == business_id,
         Client.is_active == True,
@@ -180,90 +208,139 @@ def clients_report(
     )
 
 
-# ── Reporte de inventario ─────────────────────────────────────────────────────
-
-@router.get("/inventory", response_model=InventoryReport)
-def inventory_report(
+@router.get("/clients", response_model=ClientsReport)
+async def clients_report(
     business_id: int,
     result=Depends(verify_business_access),
-    db: Session = Depends(get_db),
+    db=Depends(get_async_db),
 ):
+    return await db.run_sync(_clients_report, business_id)
+
+
+# ── Reporte de inventario ─────────────────────────────────────────────────────
+
+def _inventory_rows(db: Session, business_id: int):
+    """
+    Una fila por presentación activa: stock total, mínimo, si está en stock
+    bajo y cuántos lotes con saldo vencen pronto o ya vencieron. Se lee por
+    lotes de _INVENTORY_BATCH filas.
+    """
     now = datetime.utcnow()
     soon = now + timedelta(days=7)
 
-    presentations = db.query(ProductPresentation).options(
-        joinedload(ProductPresentation.product).joinedload(Product.category),
-        joinedload(ProductPresentation.stock),
+    # Stock total por presentación y lotes con saldo por vencer / vencidos,
+    # agregados en la BD: una sola consulta para todo el catálogo
+    stock = db.query(
+        ProductStock.presentation_id,
+        func.sum(ProductStock.quantity).label("total"),
+    ).join(
+        ProductPresentation, ProductPresentation.id == ProductStock.presentation_id,
+    ).filter(
+        ProductPresentation.business_id == business_id,
+    ).group_by(ProductStock.presentation_id).subquery()
+
+    lots = db.query(
+        ProductLot.presentation_id,
+        func.sum(case(
+            (and_(ProductLot.expiry_date > now, ProductLot.expiry_date <= soon), 1), else_=0,
+        )).label("expiring"),
+        func.sum(case((ProductLot.expiry_date <= now, 1), else_=0)).label("expired"),
+    ).filter(
+        ProductLot.business_id == business_id,
+        ProductLot.remaining > 0,
+        ProductLot.is_active == True,
+    ).group_by(ProductLot.presentation_id).subquery()
+
+    total_stock = func.coalesce(stock.c.total, 0)
+    expiring = func.coalesce(lots.c.expiring, 0)
+    expired = func.coalesce(lots.c.expired, 0)
+    is_low = case(
+        (and_(ProductPresentation.min_stock > 0, total_stock <= ProductPresentation.min_stock), 1), else_=0,
+    )
+    return db.query(
+        ProductPresentation.id,
+        Product.name,
+        ProductPresentation.name,
+        ProductCategory.name,
+        total_stock,
+        ProductPresentation.min_stock,
+        is_low,
+        expiring,
+        expired,
+    ).join(
+        Product, Product.id == ProductPresentation.product_id,
+    ).outerjoin(
+        ProductCategory, ProductCategory.id == Product.category_id,
+    ).outerjoin(
+        stock, stock.c.presentation_id == ProductPresentation.id,
+    ).outerjoin(
+        lots, lots.c.presentation_id == ProductPresentation.id,
     ).filter(
+        Product.business_id == business_id,
+        Product.is_active == True,
         ProductPresentation.is_active == True,
-        ProductPresentation.product.has(
-            business_id=business_id,
-            is_active=True,
-        ),
-    ).all()
-
-    items = []
-    low_stock_count = 0
-    expiring_count = 0
-    expired_count = 0
-
-    for pres in presentations:
-        total_stock = sum(s.quantity for s in pres.stock) or Decimal("0")
-        is_low = pres.min_stock > 0 and total_stock <= pres.min_stock
-
-        lots = db.query(ProductLot).filter(
-            ProductLot.presentation_id == pres.id,
-            ProductLot.remaining > 0,
-            ProductLot.is_active == True,
-        ).all()
-
-        expiring = sum(
-            1 for lot in lots
-            if lot.expiry_date and now < lot.expiry_date <= soon
-        )
-        expired = sum(
-            1 for lot in lots
-            if lot.expiry_date and lot.expiry_date <= now
-        )
-
-        if is_low: low_stock_count += 1
-        if expiring: expiring_count += 1
-        if expired: expired_count += 1
-
-        items.append(InventoryStatusItem(
-            presentation_id=pres.id,
-            product_name=pres.product.name if pres.product else "—",
-            presentation_name=pres.name,
-            category_name=pres.product.category.name if pres.product and pres.product.category else None,
-            total_stock=total_stock,
-            min_stock=pres.min_stock,
-            is_low_stock=is_low,
-            expiring_soon=expiring,
-            expired_lots=expired,
-        ))
+    ).order_by(
+        is_low.desc(), expired.desc(), expiring.desc(), ProductPresentation.id,
+    ).execution_options(yield_per=_INVENTORY_BATCH)
+
+
+def _inventory_json(business_id: int) -> Iterator[str]:
+    """
+    El reporte serializado por partes a medida que llegan las filas, sin
+    armar la lista completa en memoria. Los contadores requieren recorrer
+    todo el catálogo, así que van al final del objeto JSON.
+    """
+    db = SessionLocal()
+    try:
+        counts = {"total_products": 0, "low_stock_count": 0, "expiring_count": 0, "expired_count": 0}
+        yield '{"items":['
+        separator, batch = "", []
+        for pid, product_name, pres_name, category_name, total, min_stock, low, soon_lots, old_lots in _inventory_rows(db, business_id):
+            counts["total_products"] += 1
+            if low: counts["low_stock_count"] += 1
+            if soon_lots: counts["expiring_count"] += 1
+            if old_lots: counts["expired_count"] += 1
+
+            batch.append(InventoryStatusItem(
+                presentation_id=pid,
+                product_name=product_name,
+                presentation_name=pres_name,
+                category_name=category_name,
+                total_stock=total or Decimal("0"),
+                min_stock=min_stock,
+                is_low_stock=bool(low),
+                expiring_soon=soon_lots,
+                expired_lots=old_lots,
+            ).model_dump_json())
+            if len(batch) == _INVENTORY_BATCH:
+                yield separator + ",".join(batch)
+                separator, batch = ",", []
+        if batch:
+            yield separator + ",".join(batch)
+        yield "]," + json.dumps(counts)[1:]
+    finally:
+        db.close()
 
-    items.sort(key=lambda x: (not x.is_low_stock, -x.expired_lots, -x.expiring_soon))
 
-    return InventoryReport(
-        total_products=len(items),
-        low_stock_count=low_stock_count,
-        expiring_count=expiring_count,
-        expired_count=expired_count,
-        items=items,
-    )
+@router.get("/inventory", response_model=InventoryReport)
+async def inventory_report(
+    business_id: int,
+    result=Depends(verify_business_access),
+):
+    # response_model solo documenta el esquema: el cuerpo lo arma _inventory_json
+    return StreamingResponse(_inventory_json(business_id), media_type="application/json")
 
 
 # ── Reporte de mermas ─────────────────────────────────────────────────────────
 
-@router.get("/waste", response_model=WasteReport)
-def waste_report(
+def _waste_report(
+    db: Session,
     business_id: int,
-    result=Depends(verify_business_access),
-    db: Session = Depends(get_db),
-    date_from: Optional[date] = Query(None),
-    date_to: Optional[date] = Query(None),
-):
-    d_from, d_to = date_range(date_from, date_to)
+    date_from: Optional[date],
+    date_to: Optional[date],
+) -> WasteReport:
+    first, last = report_days(date_from, date_to)
+    d_from, d_to = day_bounds(first, last)
 
     records = db.query(WasteRecord).options(
         joinedload(WasteRecord.presentation)
@@ -271,7 +348,7 @@ def waste_report(
     ).filter(
         WasteRecord.business_id == business_id,
         WasteRecord.created_at >= d_from,
-        WasteRecord.created_at <= d_to,
+        WasteRecord.created_at < d_to,
     ).all()
 
     total_cost = sum(r.total_cost for r in records if r.total_cost) or Decimal("0")
@@ -308,8 +385,8 @@ def waste_report(
     )[:10]
 
     return WasteReport(
-        date_from=date_from or date.today().replace(day=1),
-        date_to=date_to or date.today(),
+        date_from=first,
+        date_to=last,
         total_records=len(records),
         total_cost=total_cost,
         auto_count=sum(1 for r in records if r.is_auto),
@@ -319,14 +396,23 @@ def waste_report(
     )
 
 
-# ── Reporte de cartera ────────────────────────────────────────────────────────
-
-@router.get("/portfolio", response_model=PortfolioReport)
-def portfolio_report(
+@router.get("/waste", response_model=WasteReport)
+async def waste_report(
     business_id: int,
     result=Depends(verify_business_access),
-    db: Session = Depends(get_db),
+    db=Depends(get_async_db),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
 ):
+    return await db.run_sync(_waste_report, business_id, date_from, date_to)
+
+
+# ── Reporte de cartera ────────────────────────────────────────────────────────
+
+def _portfolio_report(
+    db: Session,
+    business_id: int,
+) -> PortfolioReport:
     now = datetime.utcnow()
     thirty_ago = now - timedelta(days=30)
 
@@ -370,80 +456,89 @@ def portfolio_report(
     )
 
 
-# ── Reporte de rentabilidad ───────────────────────────────────────────────────
-
-@router.get("/profitability", response_model=ProfitabilityReport)
-def profitability_report(
+@router.get("/portfolio", response_model=PortfolioReport)
+async def portfolio_report(
     business_id: int,
     result=Depends(verify_business_access),
-    db: Session = Depends(get_db),
-    date_from: Optional[date] = Query(None),
-    date_to: Optional[date] = Query(None),
+    db=Depends(get_async_db),
 ):
-    d_from, d_to = date_range(date_from, date_to)
+    return await db.run_sync(_portfolio_report, business_id)
 
-    sales = db.query(Sale).options(
-        joinedload(Sale.items).joinedload(SaleItem.presentation)
-            .joinedload(ProductPresentation.product),
-    ).filter(
-        Sale.business_id == business_id,
-        Sale.created_at >= d_from,
-        Sale.created_at <= d_to,
-        Sale.status == SaleStatus.COMPLETED,
-    ).all()
 
-    product_map: dict[int, dict] = defaultdict(lambda: {
-        "product_name": "", "presentation_name": "",
-        "units_sold": Decimal("0"), "revenue": Decimal("0"),
-        "sale_prices": [], "cost_prices": [],
-    })
+# ── Reporte de rentabilidad ───────────────────────────────────────────────────
 
-    for s in sales:
-        for item in s.items:
-            pid = item.presentation_id
-            product_map[pid]["units_sold"] += item.quantity
-            product_map[pid]["revenue"] += item.subtotal
-            product_map[pid]["sale_prices"].append(float(item.unit_price))
-            if item.presentation and item.presentation.product:
-                product_map[pid]["product_name"] = item.presentation.product.name
-                product_map[pid]["presentation_name"] = item.presentation.name
-
-    # Obtener costo promedio de lotes para cada presentación
-    for pid, data in product_map.items():
-        lots = db.query(ProductLot).filter(
-            ProductLot.presentation_id == pid,
-            ProductLot.cost_per_unit.isnot(None),
-        ).order_by(desc(ProductLot.arrival_date)).limit(5).all()
-        if lots:
-            avg_cost = sum(float(l.cost_per_unit) for l in lots) / len(lots)
-            data["cost_prices"] = [avg_cost]
+def _profitability_report(
+    db: Session,
+    business_id: int,
+    date_from: Optional[date],
+    date_to: Optional[date],
+) -> ProfitabilityReport:
+    """
+    Una sola agregación sobre sale_items: el costo viene de SaleItem.unit_cost,
+    capturado al vender, así que no se consultan lotes.
+    """
+    first, last = report_days(date_from, date_to)
+    d_from, d_to = day_bounds(first, last)
+
+    costed = SaleItem.unit_cost.isnot(None)
+    # SUM tipado con la escala exacta del resultado: SQLite suma en float y
+    # el costo (cantidad x costo unitario) tiene 3 + 4 decimales
+    rows = (
+        db.query(
+            SaleItem.presentation_id,
+            Product.name,
+            ProductPresentation.name,
+            cast(func.sum(SaleItem.quantity), Numeric(18, 3)),
+            cast(func.sum(SaleItem.subtotal), Numeric(18, 2)),
+            cast(func.sum(SaleItem.unit_price), Numeric(18, 2)),
+            func.count(SaleItem.id),
+            cast(func.sum(case((costed, SaleItem.quantity * SaleItem.unit_cost))), Numeric(24, 7)),
+            cast(func.sum(case((costed, SaleItem.quantity))), Numeric(18, 3)),
+        )
+        .join(Sale, Sale.id == SaleItem.sale_id)
+        .join(ProductPresentation, ProductPresentation.id == SaleItem.presentation_id)
+        .join(Product, Product.id == ProductPresentation.product_id)
+        .filter(
+            Sale.business_id == business_id,
+            Sale.created_at >= d_from,
+            Sale.created_at < d_to,
+            Sale.status == SaleStatus.COMPLETED,
+        )
+        .group_by(SaleItem.presentation_id, Product.name, ProductPresentation.name)
+        .all()
+    )
 
     items = []
     total_revenue = Decimal("0")
-    total_cost = Decimal("0")
-
-    for pid, data in product_map.items():
-        revenue = data["revenue"]
-        avg_sale = Decimal(str(
-            sum(data["sale_prices"]) / len(data["sale_prices"])
-        )) if data["sale_prices"] else None
-
-        avg_cost = Decimal(str(data["cost_prices"][0])) if data["cost_prices"] else None
-        estimated_cost = (avg_cost * data["units_sold"]) if avg_cost else None
-        gross_profit = (revenue - estimated_cost) if estimated_cost else None
-        margin = (gross_profit / revenue * 100) if gross_profit and revenue > 0 else None
+    total_cost = None
+
+    for pid, product_name, presentation_name, units_sold, revenue, price_sum, lines, cost_sum, costed_units in rows:
+        units_sold = Decimal(units_sold)
+        revenue = Decimal(revenue)
+        avg_sale = (Decimal(price_sum) / lines).quantize(Decimal("0.01"))
+
+        # Líneas sin costo (sin lotes con costo al vender) se valoran al
+        # costo promedio de las que sí lo tienen
+        avg_cost = (Decimal(cost_sum) / Decimal(costed_units)) if costed_units else None
+        # Costo 0 (p. ej. mercancía donada) es un costo conocido, no faltante
+        estimated_cost = (avg_cost * units_sold).quantize(Decimal("0.01")) if avg_cost is not None else None
+        gross_profit = (revenue - estimated_cost) if estimated_cost is not None else None
+        margin = (
+            (gross_profit / revenue * 100).quantize(Decimal("0.01"))
+            if gross_profit is not None and revenue > 0 else None
+        )
 
         total_revenue += revenue
-        if estimated_cost:
-            total_cost += estimated_cost
+        if estimated_cost is not None:
+            total_cost = (total_cost or Decimal("0")) + estimated_cost
 
         items.append(ProfitabilityItem(
             presentation_id=pid,
-            product_name=data["product_name"],
-            presentation_name=data["presentation_name"],
-            units_sold=data["units_sold"],
-            avg_sale_price=avg_sale or Decimal("0"),
-            avg_cost_price=avg_cost,
+            product_name=product_name,
+            presentation_name=presentation_name,
+            units_sold=units_sold,
+            avg_sale_price=avg_sale,
+            avg_cost_price=avg_cost.quantize(Decimal("0.0001")) if avg_cost is not None else None,
             revenue=revenue,
             estimated_cost=estimated_cost,
             gross_profit=gross_profit,
@@ -452,15 +547,29 @@ def profitability_report(
 
     items.sort(key=lambda x: x.revenue, reverse=True)
 
-    total_profit = total_revenue - total_cost if total_cost else None
-    overall_margin = (total_profit / total_revenue * 100) if total_profit and total_revenue > 0 else None
+    total_profit = total_revenue - total_cost if total_cost is not None else None
+    overall_margin = (
+        (total_profit / total_revenue * 100).quantize(Decimal("0.01"))
+        if total_profit is not None and total_revenue > 0 else None
+    )
 
     return ProfitabilityReport(
-        date_from=date_from or date.today().replace(day=1),
-        date_to=date_to or date.today(),
+        date_from=first,
+        date_to=last,
         total_revenue=total_revenue,
-        total_cost=total_cost or None,
+        total_cost=total_cost,
         total_profit=total_profit,
         overall_margin=overall_margin,
         items=items,
-    )
\ No newline at end of file
+    )
+
+
+@router.get("/profitability", response_model=ProfitabilityReport)
+async def profitability_report(
+    business_id: int,
+    result=Depends(verify_business_access),
+    db=Depends(get_async_db),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+):
+    return await db.run_sync(_profitability_report, business_id, date_from, date_to)
@@ -5,10 +5,12 @@ from app.database import get_db
 from app.models.role import BusinessRole, Permission
 from app.models.business import BusinessUser
 from app.schemas.role import RoleCreate, RoleUpdate, RoleResponse
+from app.api import loaders
 from app.api.deps import (
     get_current_active_user,
     verify_business_access,
-    verify_can_manage_roles
+    verify_can_manage_roles,
+    invalidate_access_cache
 )
 from app.utils.audit import log_action
 from app.models.user import User
@@ -16,6 +18,16 @@ from app.models.user import User
 router = APIRouter(prefix="/businesses/{business_id}/roles", tags=["Roles"])
 
 
+def get_role_or_404(role_id: int, business_id: int, db: Session) -> BusinessRole:
+    role = db.query(BusinessRole).options(*loaders.role()).filter(
+        BusinessRole.id == role_id,
+        BusinessRole.business_id == business_id
+    ).first()
+    if not role:
+        raise HTTPException(404, "Rol no encontrado")
+    return role
+
+
 @router.get("/permissions")
 def list_all_permissions(
     result = Depends(verify_business_access),
@@ -39,26 +51,23 @@ def create_role(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
+    perms = db.query(Permission).filter(Permission.code.in_(data.permission_codes)).all()
     role = BusinessRole(
         business_id=business_id,
         name=data.name,
         description=data.description,
         can_manage_users=data.can_manage_users,
         can_manage_roles=data.can_manage_roles,
-        is_default=False
+        is_default=False,
+        permissions=perms,
     )
     db.add(role)
     db.flush()
 
-    perms = db.query(Permission).filter(Permission.code.in_(data.permission_codes)).all()
-    role.permissions = perms
-
-    db.commit()
-    db.refresh(role)
-
     log_action(db, current_user.id, "CREATE", "BusinessRole", role.id,
                business_id=business_id, details={"role_name": role.name})
-    return role
+    db.commit()
+    return get_role_or_404(role.id, business_id, db)
 
 
 @router.get("", response_model=List[RoleResponse])
@@ -67,7 +76,9 @@ def list_roles(
     result = Depends(verify_business_access),
     db: Session = Depends(get_db)
 ):
-    return db.query(BusinessRole).filter(BusinessRole.business_id == business_id).all()
+    return db.query(BusinessRole).options(*loaders.role()).filter(
+        BusinessRole.business_id == business_id
+    ).all()
 
 
 @router.get("/{role_id}", response_model=RoleResponse)
@@ -77,13 +88,7 @@ def get_role(
     result = Depends(verify_business_access),
     db: Session = Depends(get_db)
 ):
-    role = db.query(BusinessRole).filter(
-        BusinessRole.id == role_id,
-        BusinessRole.business_id == business_id
-    ).first()
-    if not role:
-        raise HTTPException(404, "Rol no encontrado")
-    return role
+    return get_role_or_404(role_id, business_id, db)
 
 
 @router.patch("/{role_id}", response_model=RoleResponse)
@@ -95,12 +100,7 @@ def update_role(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    role = db.query(BusinessRole).filter(
-        BusinessRole.id == role_id,
-        BusinessRole.business_id == business_id
-    ).first()
-    if not role:
-        raise HTTPException(404, "Rol no encontrado")
+    role = get_role_or_404(role_id, business_id, db)
     if role.is_default:
         raise HTTPException(400, "El rol por defecto no puede modificarse")
 
@@ -116,12 +116,11 @@ def update_role(
         perms = db.query(Permission).filter(Permission.code.in_(data.permission_codes)).all()
         role.permissions = perms
 
-    db.commit()
-    db.refresh(role)
-
     log_action(db, current_user.id, "UPDATE", "BusinessRole", role.id,
                business_id=business_id, details={"role_name": role.name})
-    return role
+    db.commit()
+    invalidate_access_cache(business_id=business_id, role_id=role.id)
+    return get_role_or_404(role_id, business_id, db)
 
 
 @router.delete("/{role_id}", status_code=204)
@@ -132,12 +131,7 @@ def delete_role(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    role = db.query(BusinessRole).filter(
-        BusinessRole.id == role_id,
-        BusinessRole.business_id == business_id
-    ).first()
-    if not role:
-        raise HTTPException(404, "Rol no encontrado")
+    role = get_role_or_404(role_id, business_id, db)
     if role.is_default:
         raise HTTPException(400, "No se puede eliminar el rol por defecto")
 
@@ -153,7 +147,7 @@ def delete_role(
         )
 
     db.delete(role)
-    db.commit()
-
     log_action(db, current_user.id, "DELETE", "BusinessRole", role_id,
-               business_id=business_id)
\ No newline at end of file
+               business_id=business_id)
+    db.commit()
+    invalidate_access_cache(business_id=business_id, role_id=role_id)
\ No newline at end of file
@@ -1,23 +1,39 @@
+import logging
+
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc
+from sqlalchemy import func, insert
+from sqlalchemy.exc import DBAPIError, IntegrityError
 from typing import List, Optional
 from datetime import datetime, date
 from decimal import Decimal
 
-from app.database import get_db
-from app.models.sale import Sale, SaleItem, SalePayment, PaymentMethod
+from app.config import get_settings
+from app.database import get_db, get_async_db
+from app.models.sale import Sale, SaleItem, SaleItemLot, SalePayment, PaymentMethod, SalesDailyRollup
 from app.models.enums import SaleStatus
-from app.models.inventory import ProductPresentation, ProductStock, InventoryMovement, MovementType
+from app.models.inventory import ProductPresentation, InventoryMovement, MovementType
 from app.models.client import Client, ClientPurchase, CreditMovement, ClientStatus
 from app.models.user import User
 from app.schemas.sale import (
     SaleCreate, SaleResponse, SaleSummary, SaleCancelRequest,
     SaleItemResponse, SalePaymentResponse, DailySummary, DailySummaryByMethod,
     PaymentMethodCreate, PaymentMethodUpdate, PaymentMethodResponse,
+    SaleSyncRequest, SaleSyncResponse, SaleSyncResult,
 )
-from app.api.deps import get_current_active_user, verify_business_access
+from app.api import loaders
+from app.api.deps import get_current_active_user, verify_business_access, require_permission
+from app.api.pagination import CursorPage
 from app.utils.audit import log_action
+from app.utils.idempotency import IdempotencyGuard, idempotency
+from app.utils.sales_rollup import SALE_ROW, local_today, record_cancellation, record_sale
+from app.utils.stock import (
+    change_stock, InsufficientStock, allocate_lots, return_to_lots, split_allocations,
+    average_lot_costs, line_unit_cost,
+)
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/businesses/{business_id}", tags=["Ventas"])
 
@@ -104,18 +120,6 @@ def delete_payment_method(
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
-def get_or_create_stock(presentation_id: int, warehouse_id: int, db: Session) -> ProductStock:
-    stock = db.query(ProductStock).filter(
-        ProductStock.presentation_id == presentation_id,
-        ProductStock.warehouse_id == warehouse_id,
-    ).first()
-    if not stock:
-        stock = ProductStock(presentation_id=presentation_id, warehouse_id=warehouse_id, quantity=0)
-        db.add(stock)
-        db.flush()
-    return stock
-
-
 def build_sale_response(sale: Sale) -> SaleResponse:
     items = [
         SaleItemResponse(
@@ -184,61 +188,84 @@ def update_client_status(client: Client):
 
 
 def _load_sale_full(sale_id: int, db: Session) -> Sale:
-    return db.query(Sale).options(
-        joinedload(Sale.items)
-            .joinedload(SaleItem.presentation)
-            .joinedload(ProductPresentation.product),
-        joinedload(Sale.payments).joinedload(SalePayment.payment_method),
-        joinedload(Sale.client),
-        joinedload(Sale.seller),
-    ).filter(Sale.id == sale_id).first()
+    return db.query(Sale).options(*loaders.sale_detail()).filter(Sale.id == sale_id).first()
 
 
 # ── Crear venta ───────────────────────────────────────────────────────────────
+# La carga de catálogos (presentaciones, métodos de pago, clientes) está
+# separada del registro de la venta para que la sincronización por lotes
+# cargue una sola vez para todo el lote.
+
+def _load_presentations(db: Session, business_id: int, ids) -> dict[int, ProductPresentation]:
+    return {
+        pres.id: pres
+        for pres in db.query(ProductPresentation).options(
+            joinedload(ProductPresentation.product)
+        ).filter(
+            ProductPresentation.id.in_(ids),
+            ProductPresentation.business_id == business_id,
+            ProductPresentation.is_active == True,
+        )
+    }
 
-@router.post("/sales", response_model=SaleResponse, status_code=201)
-def create_sale(
+
+def _load_payment_methods(db: Session, business_id: int, ids) -> dict[int, PaymentMethod]:
+    return {
+        method.id: method
+        for method in db.query(PaymentMethod).filter(
+            PaymentMethod.id.in_(ids),
+            PaymentMethod.business_id == business_id,
+            PaymentMethod.is_active == True,
+        )
+    }
+
+
+def _load_clients(db: Session, business_id: int, ids) -> dict[int, Client]:
+    ids = {i for i in ids if i}
+    if not ids:
+        return {}
+    return {
+        client.id: client
+        for client in db.query(Client).filter(
+            Client.id.in_(ids),
+            Client.business_id == business_id,
+            Client.is_active == True,
+        )
+    }
+
+
+def _register_sale(
+    db: Session,
     business_id: int,
     data: SaleCreate,
-    result=Depends(verify_business_access),
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
-):
-    # 1. Validar items y stock
+    seller: User,
+    presentations: dict[int, ProductPresentation],
+    payment_methods: dict[int, PaymentMethod],
+    clients: dict[int, Client],
+    client_ref: Optional[str] = None,
+    sold_at: Optional[datetime] = None,
+) -> Sale:
+    """
+    Valida y registra la venta (stock, movimientos, cliente, auditoría) sin
+    hacer commit. Los errores de validación salen como HTTPException antes
+    de escribir; si falta stock, el descuento se revierte completo, así que
+    una venta rechazada no deja nada en la transacción.
+    """
+    # 1. Validar items — una misma presentación puede venir en varias líneas
     if not data.items:
         raise HTTPException(400, "La venta debe tener al menos un producto")
 
-    presentations: dict[int, tuple[ProductPresentation, ProductStock]] = {}
+    requested: dict[int, Decimal] = {}
     for item in data.items:
-        pres = db.query(ProductPresentation).options(
-            joinedload(ProductPresentation.product)
-        ).filter(
-            ProductPresentation.id == item.presentation_id,
-            ProductPresentation.is_active == True,
-        ).first()
-        if not pres:
+        requested[item.presentation_id] = requested.get(item.presentation_id, Decimal("0")) + item.quantity
+    for item in data.items:
+        if item.presentation_id not in presentations:
             raise HTTPException(404, f"Presentación {item.presentation_id} no encontrada")
 
-        stock = get_or_create_stock(item.presentation_id, data.warehouse_id, db)
-        if stock.quantity < item.quantity:
-            raise HTTPException(
-                400,
-                f"Stock insuficiente para '{pres.product.name} - {pres.name}'. "
-                f"Disponible: {stock.quantity}, solicitado: {item.quantity}",
-            )
-        presentations[item.presentation_id] = (pres, stock)
-
-    # 2. Validar y cargar métodos de pago
-    payment_methods: dict[int, PaymentMethod] = {}
+    # 2. Validar métodos de pago
     for p in data.payments:
-        method = db.query(PaymentMethod).filter(
-            PaymentMethod.id == p.payment_method_id,
-            PaymentMethod.business_id == business_id,
-            PaymentMethod.is_active == True,
-        ).first()
-        if not method:
+        if p.payment_method_id not in payment_methods:
             raise HTTPException(404, f"Método de pago {p.payment_method_id} no encontrado")
-        payment_methods[p.payment_method_id] = method
 
     # 3. Calcular totales
     subtotal = sum((i.quantity * i.unit_price) - i.discount for i in data.items)
@@ -267,11 +294,7 @@ def create_sale(
     # 4. Validar cliente — OPCIONAL, solo obligatorio si hay pago a crédito
     client = None
     if data.client_id:
-        client = db.query(Client).filter(
-            Client.id == data.client_id,
-            Client.business_id == business_id,
-            Client.is_active == True,
-        ).first()
+        client = clients.get(data.client_id)
         if not client:
             raise HTTPException(404, "Cliente no encontrado")
         if client.status == ClientStatus.BLOCKED:
@@ -293,12 +316,48 @@ def create_sale(
                     f"Disponible: ${client.credit_limit - client.current_balance}",
                 )
 
-    # 5. Crear venta
+    # 5. Descuento atómico por presentación: falla (sin dejar cambios) si
+    # otra venta se llevó las unidades
+    try:
+        change_stock(db, {
+            (presentation_id, data.warehouse_id): -quantity
+            for presentation_id, quantity in requested.items()
+        })
+    except InsufficientStock as e:
+        pres = presentations[e.presentation_id]
+        raise HTTPException(
+            400,
+            f"Stock insuficiente para '{pres.product.name} - {pres.name}'. "
+            f"Disponible: {e.available}, solicitado: {e.requested}",
+        )
+    # Lotes FEFO por presentación, repartidos luego entre sus líneas
+    allocated = allocate_lots(db, {
+        (presentation_id, data.warehouse_id): quantity
+        for presentation_id, quantity in requested.items()
+    })
+    item_lots: list[list] = [[] for _ in data.items]
+    for (presentation_id, _), allocations in allocated.items():
+        lines = [n for n, item in enumerate(data.items) if item.presentation_id == presentation_id]
+        shares = split_allocations(allocations, [data.items[n].quantity for n in lines])
+        for n, lots in zip(lines, shares):
+            item_lots[n] = lots
+
+    # Costo de lo vendido: lo que no salió de un lote con costo se valora al
+    # promedio de lotes de la presentación (una consulta, solo si hace falta)
+    uncosted = {
+        item.presentation_id for n, item in enumerate(data.items)
+        if sum((q for lot, q in item_lots[n] if lot.cost_per_unit is not None), Decimal("0")) < item.quantity
+    }
+    fallback_costs = average_lot_costs(db, uncosted)
+
+    # 6. Crear venta. Pagos e items van en el mismo flush: el ORM agrupa los
+    # INSERT por tabla. La respuesta se arma con estos mismos objetos, sin
+    # recargar la venta.
     sale = Sale(
         business_id=business_id,
         client_id=data.client_id,   # puede ser None (venta sin cliente)
         warehouse_id=data.warehouse_id,
-        created_by=current_user.id,
+        created_by=seller.id,
         subtotal=subtotal,
         discount=data.discount,
         total=total,
@@ -306,35 +365,44 @@ def create_sale(
         amount_credit=amount_credit,
         status=SaleStatus.COMPLETED,
         notes=data.notes,
+        client_ref=client_ref,
+        created_at=sold_at or datetime.utcnow(),
+        client=client,
+        seller=seller,
     )
-    db.add(sale)
-    db.flush()
-
-    # 6. Registrar pagos individuales
-    for p in data.payments:
-        method = payment_methods[p.payment_method_id]
-        db.add(SalePayment(
-            sale_id=sale.id,
+    sale.payments = [
+        SalePayment(
             payment_method_id=p.payment_method_id,
+            payment_method=payment_methods[p.payment_method_id],
             amount=p.amount,
-            is_credit=method.is_credit,
-        ))
-
-    # 7. Items + stock + movimientos de inventario
-    for item in data.items:
-        pres, stock = presentations[item.presentation_id]
-        item_subtotal = (item.quantity * item.unit_price) - item.discount
-
-        db.add(SaleItem(
-            sale_id=sale.id,
+            is_credit=payment_methods[p.payment_method_id].is_credit,
+        )
+        for p in data.payments
+    ]
+    sale.items = [
+        SaleItem(
             presentation_id=item.presentation_id,
+            presentation=presentations[item.presentation_id],
             quantity=item.quantity,
             unit_price=item.unit_price,
             discount=item.discount,
-            subtotal=item_subtotal,
-        ))
-        stock.quantity -= item.quantity
-        db.add(InventoryMovement(
+            subtotal=(item.quantity * item.unit_price) - item.discount,
+            unit_cost=line_unit_cost(
+                item.quantity, item_lots[n], fallback_costs.get(item.presentation_id),
+            ),
+            lots=[
+                SaleItemLot(lot_id=lot.id, lot=lot, quantity=quantity, cost_per_unit=lot.cost_per_unit)
+                for lot, quantity in item_lots[n]
+            ],
+        )
+        for n, item in enumerate(data.items)
+    ]
+    db.add(sale)
+    db.flush()
+
+    # 7. Movimientos de inventario: no necesitan ids de vuelta, executemany
+    db.execute(insert(InventoryMovement), [
+        dict(
             business_id=business_id,
             presentation_id=item.presentation_id,
             warehouse_id=data.warehouse_id,
@@ -342,8 +410,11 @@ def create_sale(
             quantity=-item.quantity,
             reference_id=sale.id,
             reference_type="sale",
-            created_by=current_user.id,
-        ))
+            created_by=seller.id,
+            created_at=sale.created_at,
+        )
+        for item in data.items
+    ])
 
     # 8. Actualizar cliente (solo si hay uno asociado)
     if client:
@@ -370,14 +441,16 @@ def create_sale(
                 amount=amount_credit,
                 movement_type="charge",
                 description=f"Venta #{sale.id}",
-                created_by=current_user.id,
+                created_by=seller.id,
             ))
 
         update_client_status(client)
 
-    db.commit()
+    # 9. Resumen diario (misma transacción)
+    record_sale(db, sale)
+
     log_action(
-        db, current_user.id, "CREATE", "Sale", sale.id,
+        db, seller.id, "CREATE", "Sale", sale.id,
         business_id=business_id,
         details={
             "total": str(total),
@@ -385,31 +458,151 @@ def create_sale(
                 {"method_id": p.payment_method_id, "amount": str(p.amount)}
                 for p in data.payments
             ],
+            **({"client_ref": client_ref} if client_ref else {}),
         },
     )
+    return sale
 
-    return build_sale_response(_load_sale_full(sale.id, db))
 
+@router.post("/sales", response_model=SaleResponse, status_code=201)
+def create_sale(
+    business_id: int,
+    data: SaleCreate,
+    result=Depends(require_permission("sales.create")),
+    current_user: User = Depends(get_current_active_user),
+    idem: IdempotencyGuard = Depends(idempotency),
+    db: Session = Depends(get_db),
+):
+    replay = idem.begin(db, data)
+    if replay:
+        return replay
+
+    sale = _register_sale(
+        db, business_id, data, current_user,
+        presentations=_load_presentations(db, business_id, {i.presentation_id for i in data.items}),
+        payment_methods=_load_payment_methods(db, business_id, {p.payment_method_id for p in data.payments}),
+        clients=_load_clients(db, business_id, {data.client_id}),
+    )
+    db.flush()
+    response = build_sale_response(sale)
+    idem.save(db, response, 201)
+    db.commit()
 
-# ── Listar ventas ─────────────────────────────────────────────────────────────
+    return response
 
-@router.get("/sales", response_model=List[SaleSummary])
-def list_sales(
+
+# ── Sincronización de ventas offline ──────────────────────────────────────────
+
+@router.post("/sales/sync", response_model=SaleSyncResponse)
+def sync_offline_sales(
     business_id: int,
-    result=Depends(verify_business_access),
+    data: SaleSyncRequest,
+    result=Depends(require_permission("sales.create")),
+    current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
-    date_from: Optional[date] = Query(None),
-    date_to: Optional[date] = Query(None),
-    client_id: Optional[int] = Query(None),
-    status: Optional[SaleStatus] = Query(None),
-    skip: int = 0,
-    limit: int = 50,
 ):
-    query = db.query(Sale).options(
-        joinedload(Sale.client),
-        joinedload(Sale.seller),
-        joinedload(Sale.payments).joinedload(SalePayment.payment_method),
-    ).filter(Sale.business_id == business_id)
+    """
+    Recibe las ventas que un terminal encoló sin conexión. Cada venta trae
+    un `client_ref` generado por el terminal: reenviar el mismo lote (p. ej.
+    tras un timeout) no duplica ventas, las ya registradas vuelven como
+    "duplicate". Cada venta se confirma en su propia transacción, como en
+    POST /sales: los locks (stock, lotes, cliente, resumen diario) se toman
+    en el mismo orden que allí y una venta rechazada no afecta a las demás.
+    Las que fallan por la BD (bloqueo, conflicto) vuelven con `retryable`.
+    """
+    if len(data.sales) > settings.SALES_SYNC_MAX_BATCH:
+        raise HTTPException(
+            400, f"Máximo {settings.SALES_SYNC_MAX_BATCH} ventas por sincronización"
+        )
+
+    # Catálogos una sola vez para todo el lote
+    presentations = _load_presentations(
+        db, business_id, {i.presentation_id for s in data.sales for i in s.items}
+    )
+    payment_methods = _load_payment_methods(
+        db, business_id, {p.payment_method_id for s in data.sales for p in s.payments}
+    )
+    clients = _load_clients(db, business_id, {s.client_id for s in data.sales})
+    existing = dict(db.query(Sale.client_ref, Sale.id).filter(
+        Sale.business_id == business_id,
+        Sale.client_ref.in_({s.client_ref for s in data.sales}),
+    ).all())
+
+    # Cada venta hace commit: sin expirar los objetos en cada uno, los
+    # catálogos del lote no se recargan venta a venta. El cliente sí se
+    # relee antes de cada venta (saldo y estado pueden haber cambiado); un
+    # rollback expira todo igual y los catálogos se recargan solos.
+    results: list[SaleSyncResult] = []
+    expire_on_commit, db.expire_on_commit = db.expire_on_commit, False
+    try:
+        for offline in data.sales:
+            if offline.client_ref in existing:
+                results.append(SaleSyncResult(
+                    client_ref=offline.client_ref, status="duplicate",
+                    sale_id=existing[offline.client_ref],
+                ))
+                continue
+            try:
+                if offline.client_id in clients:
+                    db.refresh(clients[offline.client_id])
+                sale = _register_sale(
+                    db, business_id, offline, current_user,
+                    presentations, payment_methods, clients,
+                    client_ref=offline.client_ref, sold_at=offline.sold_at,
+                )
+                db.commit()
+            except HTTPException as e:
+                db.rollback()
+                results.append(SaleSyncResult(
+                    client_ref=offline.client_ref, status="error", error=e.detail,
+                ))
+                continue
+            except IntegrityError:
+                # Otro envío del mismo terminal registró esta venta en paralelo:
+                # al reintentar la recibe como "duplicate"
+                db.rollback()
+                results.append(SaleSyncResult(
+                    client_ref=offline.client_ref, status="error", retryable=True,
+                    error="Conflicto al sincronizar, reintente",
+                ))
+                continue
+            except DBAPIError as e:
+                # Deadlock, timeout de lock o conexión caída: la venta no quedó
+                # registrada y las siguientes siguen su curso
+                db.rollback()
+                logger.warning("Venta offline %s no sincronizada: %s", offline.client_ref, e.orig)
+                results.append(SaleSyncResult(
+                    client_ref=offline.client_ref, status="error", retryable=True,
+                    error="Error de base de datos al sincronizar, reintente",
+                ))
+                continue
+            existing[offline.client_ref] = sale.id
+            results.append(SaleSyncResult(
+                client_ref=offline.client_ref, status="created", sale_id=sale.id,
+            ))
+    finally:
+        db.expire_on_commit = expire_on_commit
+
+    counts = {status: 0 for status in ("created", "duplicate", "error")}
+    for r in results:
+        counts[r.status] += 1
+    return SaleSyncResponse(**counts, results=results)
+
+
+# ── Listar ventas ─────────────────────────────────────────────────────────────
+
+def _list_sales(
+    db: Session,
+    business_id: int,
+    date_from: Optional[date],
+    date_to: Optional[date],
+    client_id: Optional[int],
+    status: Optional[SaleStatus],
+    page: CursorPage,
+    skip: int,
+    limit: int,
+) -> List[SaleSummary]:
+    query = db.query(Sale).options(*loaders.sale_summary()).filter(Sale.business_id == business_id)
 
     if date_from:
         query = query.filter(Sale.created_at >= datetime.combine(date_from, datetime.min.time()))
@@ -420,7 +613,7 @@ def list_sales(
     if status:
         query = query.filter(Sale.status == status)
 
-    sales = query.order_by(desc(Sale.created_at)).offset(skip).limit(limit).all()
+    sales = page.fetch(query, Sale.created_at, Sale.id, skip, limit)
 
     return [
         SaleSummary(
@@ -440,13 +633,31 @@ def list_sales(
     ]
 
 
+@router.get("/sales", response_model=List[SaleSummary])
+async def list_sales(
+    business_id: int,
+    result=Depends(require_permission("sales.view")),
+    db=Depends(get_async_db),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    client_id: Optional[int] = Query(None),
+    status: Optional[SaleStatus] = Query(None),
+    page: CursorPage = Depends(),
+    skip: int = 0,
+    limit: int = 50,
+):
+    return await db.run_sync(
+        _list_sales, business_id, date_from, date_to, client_id, status, page, skip, limit
+    )
+
+
 # ── Detalle venta ─────────────────────────────────────────────────────────────
 
 @router.get("/sales/{sale_id}", response_model=SaleResponse)
 def get_sale(
     business_id: int,
     sale_id: int,
-    result=Depends(verify_business_access),
+    result=Depends(require_permission("sales.view")),
     db: Session = Depends(get_db),
 ):
     sale = _load_sale_full(sale_id, db)
@@ -462,15 +673,11 @@ def cancel_sale(
     business_id: int,
     sale_id: int,
     data: SaleCancelRequest,
-    result=Depends(verify_business_access),
+    result=Depends(require_permission("sales.cancel")),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
-    sale = db.query(Sale).options(
-        joinedload(Sale.items),
-        joinedload(Sale.client),
-        joinedload(Sale.payments),
-    ).filter(Sale.id == sale_id, Sale.business_id == business_id).first()
+    sale = db.query(Sale).options(*loaders.sale_cancel()).filter(Sale.id == sale_id, Sale.business_id == business_id).first()
 
     if not sale:
         raise HTTPException(404, "Venta no encontrada")
@@ -478,9 +685,13 @@ def cancel_sale(
         raise HTTPException(400, "La venta ya está cancelada")
 
     # Revertir stock
+    returned: dict[tuple[int, int], Decimal] = {}
+    for item in sale.items:
+        key = (item.presentation_id, sale.warehouse_id)
+        returned[key] = returned.get(key, Decimal("0")) + item.quantity
+    change_stock(db, returned)
+    return_to_lots(db, [(a.lot_id, a.quantity) for item in sale.items for a in item.lots])
     for item in sale.items:
-        stock = get_or_create_stock(item.presentation_id, sale.warehouse_id, db)
-        stock.quantity += item.quantity
         db.add(InventoryMovement(
             business_id=business_id,
             presentation_id=item.presentation_id,
@@ -508,14 +719,15 @@ def cancel_sale(
         ))
         update_client_status(sale.client)
 
+    record_cancellation(db, sale)
     sale.status = SaleStatus.CANCELLED
     sale.cancelled_at = datetime.utcnow()
     sale.cancelled_by = current_user.id
     sale.cancel_reason = data.reason
 
-    db.commit()
     log_action(db, current_user.id, "CANCEL", "Sale", sale.id,
                business_id=business_id, details={"reason": data.reason})
+    db.commit()
 
     return build_sale_response(_load_sale_full(sale_id, db))
 
@@ -525,54 +737,48 @@ def cancel_sale(
 @router.get("/sales/summary/daily", response_model=DailySummary)
 def get_daily_summary(
     business_id: int,
-    result=Depends(verify_business_access),
+    result=Depends(require_permission("sales.view")),
     db: Session = Depends(get_db),
     target_date: Optional[date] = Query(None),
 ):
-    d = target_date or date.today()
-    start = datetime.combine(d, datetime.min.time())
-    end = datetime.combine(d, datetime.max.time())
-
-    sales = db.query(Sale).options(
-        joinedload(Sale.payments).joinedload(SalePayment.payment_method),
+    """Lee el resumen diario (sales_daily_rollup): unas filas por día, no las ventas."""
+    d = target_date or local_today()
+    in_day = (SalesDailyRollup.business_id == business_id, SalesDailyRollup.day == d)
+
+    total_sales, total_revenue, total_credit, cancelled_count = db.query(
+        func.coalesce(func.sum(SalesDailyRollup.sales_count), 0),
+        func.coalesce(func.sum(SalesDailyRollup.total), 0),
+        func.coalesce(func.sum(SalesDailyRollup.amount_credit), 0),
+        func.coalesce(func.sum(SalesDailyRollup.cancelled_count), 0),
+    ).filter(*in_day).one()
+
+    by_method = db.query(
+        SalesDailyRollup.payment_method_id,
+        PaymentMethod.name,
+        PaymentMethod.is_credit,
+        func.sum(SalesDailyRollup.amount),
+    ).outerjoin(
+        PaymentMethod, PaymentMethod.id == SalesDailyRollup.payment_method_id,
     ).filter(
-        Sale.business_id == business_id,
-        Sale.created_at >= start,
-        Sale.created_at <= end,
-        Sale.status == SaleStatus.COMPLETED,
-    ).all()
-
-    cancelled_count = db.query(Sale).filter(
-        Sale.business_id == business_id,
-        Sale.created_at >= start,
-        Sale.created_at <= end,
-        Sale.status == SaleStatus.CANCELLED,
-    ).count()
-
-    total_revenue = sum(s.total for s in sales) or Decimal("0")
-    total_credit = sum(s.amount_credit for s in sales) or Decimal("0")
-
-    # Acumular en dict mutable, construir objetos Pydantic al final
-    # (los BaseModel de Pydantic v2 son inmutables, no se puede hacer +=)
-    by_method_totals: dict[int, dict] = {}
-    for sale in sales:
-        for p in sale.payments:
-            mid = p.payment_method_id
-            if mid not in by_method_totals:
-                by_method_totals[mid] = {
-                    "payment_method_id": mid,
-                    "payment_method_name": (
-                        p.payment_method.name if p.payment_method else str(mid)
-                    ),
-                    "total": Decimal("0"),
-                    "is_credit": p.is_credit,
-                }
-            by_method_totals[mid]["total"] += p.amount
+        *in_day, SalesDailyRollup.payment_method_id != SALE_ROW,
+    ).group_by(
+        SalesDailyRollup.payment_method_id, PaymentMethod.name, PaymentMethod.is_credit,
+    ).order_by(SalesDailyRollup.payment_method_id).all()
 
     return DailySummary(
-        total_sales=len(sales),
+        total_sales=total_sales,
         total_revenue=total_revenue,
         total_credit=total_credit,
         cancelled_count=cancelled_count,
-        by_method=[DailySummaryByMethod(**v) for v in by_method_totals.values()],
+        # Métodos cuyas ventas del día se anularon todas quedan en 0
+        by_method=[
+            DailySummaryByMethod(
+                payment_method_id=mid,
+                payment_method_name=name or str(mid),
+                total=amount,
+                is_credit=bool(is_credit),
+            )
+            for mid, name, is_credit, amount in by_method
+            if amount
+        ],
     )
\ No newline at end of file
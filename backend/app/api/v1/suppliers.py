@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session
 from sqlalchemy import desc
 from typing import List, Optional
 from datetime import datetime, timedelta
@@ -12,19 +12,22 @@ from app.models.supplier import (
 )
 from app.models.enums import SupplierStatus, PurchaseStatus, SupplierPaymentStatus
 from app.models.inventory import (
-    ProductPresentation, ProductStock,
     ProductLot, InventoryMovement, MovementType,
 )
 from app.models.user import User
 from app.schemas.supplier import (
     SupplierCreate, SupplierUpdate, SupplierResponse, SupplierStats,
     SupplierProductCreate, SupplierProductResponse,
-    PurchaseCreate, PurchaseResponse,
+    PurchaseCreate, PurchaseResponse, PurchaseItemResponse,
     SupplierPaymentCreate, SupplierPaymentResponse,
     SupplierPortfolioSummary,
 )
+from app.api import loaders
 from app.api.deps import get_current_active_user, verify_business_access
+from app.api.pagination import CursorPage
 from app.utils.audit import log_action
+from app.utils.idempotency import IdempotencyGuard, idempotency
+from app.utils.stock import change_stock
 
 router = APIRouter(prefix="/businesses/{business_id}/suppliers", tags=["Proveedores"])
 
@@ -42,22 +45,6 @@ def get_supplier_or_404(supplier_id: int, business_id: int, db: Session) -> Supp
     return supplier
 
 
-def get_or_create_stock(presentation_id: int, warehouse_id: int, db: Session) -> ProductStock:
-    stock = db.query(ProductStock).filter(
-        ProductStock.presentation_id == presentation_id,
-        ProductStock.warehouse_id == warehouse_id,
-    ).first()
-    if not stock:
-        stock = ProductStock(
-            presentation_id=presentation_id,
-            warehouse_id=warehouse_id,
-            quantity=0,
-        )
-        db.add(stock)
-        db.flush()
-    return stock
-
-
 def build_purchase_response(purchase: SupplierPurchase) -> PurchaseResponse:
     items = [
         PurchaseItemResponse(
@@ -108,9 +95,10 @@ def create_supplier(
 ):
     supplier = Supplier(business_id=business_id, **data.model_dump())
     db.add(supplier)
+    db.flush()
+    log_action(db, current_user.id, "CREATE", "Supplier", supplier.id, business_id=business_id)
     db.commit()
     db.refresh(supplier)
-    log_action(db, current_user.id, "CREATE", "Supplier", supplier.id, business_id=business_id)
     return supplier
 
 
@@ -200,9 +188,9 @@ def update_supplier(
     supplier = get_supplier_or_404(supplier_id, business_id, db)
     for field, value in data.model_dump(exclude_none=True).items():
         setattr(supplier, field, value)
+    log_action(db, current_user.id, "UPDATE", "Supplier", supplier.id, business_id=business_id)
     db.commit()
     db.refresh(supplier)
-    log_action(db, current_user.id, "UPDATE", "Supplier", supplier.id, business_id=business_id)
     return supplier
 
 
@@ -221,8 +209,8 @@ def delete_supplier(
             f"El proveedor tiene una deuda pendiente de ${supplier.current_balance}. Sáldala antes de eliminar."
         )
     supplier.is_active = False
-    db.commit()
     log_action(db, current_user.id, "DELETE", "Supplier", supplier.id, business_id=business_id)
+    db.commit()
 
 
 # ── Estadísticas ──────────────────────────────────────────────────────────────
@@ -286,7 +274,9 @@ def add_supplier_product(
     sp = SupplierProduct(supplier_id=supplier_id, **data.model_dump())
     db.add(sp)
     db.commit()
-    db.refresh(sp)
+    sp = db.query(SupplierProduct).options(*loaders.supplier_product()).filter(
+        SupplierProduct.id == sp.id
+    ).one()
     return _build_supplier_product_response(sp)
 
 
@@ -298,9 +288,7 @@ def list_supplier_products(
     db: Session = Depends(get_db),
 ):
     get_supplier_or_404(supplier_id, business_id, db)
-    products = db.query(SupplierProduct).options(
-        joinedload(SupplierProduct.presentation).joinedload(ProductPresentation.product)
-    ).filter(
+    products = db.query(SupplierProduct).options(*loaders.supplier_product()).filter(
         SupplierProduct.supplier_id == supplier_id,
         SupplierProduct.is_active == True,
     ).all()
@@ -347,8 +335,13 @@ def create_purchase(
     data: PurchaseCreate,
     result=Depends(verify_business_access),
     current_user: User = Depends(get_current_active_user),
+    idem: IdempotencyGuard = Depends(idempotency),
     db: Session = Depends(get_db),
 ):
+    replay = idem.begin(db, data)
+    if replay:
+        return replay
+
     supplier = get_supplier_or_404(supplier_id, business_id, db)
 
     if not data.items:
@@ -397,6 +390,7 @@ def create_purchase(
     db.flush()
 
     # Crear items + actualizar inventario
+    incoming: dict[tuple[int, int], Decimal] = {}
     for item in data.items:
         item_subtotal = item.quantity * item.cost_per_unit
 
@@ -425,9 +419,8 @@ def create_purchase(
         db.add(lot)
         db.flush()
 
-        # Actualizar stock
-        stock = get_or_create_stock(item.presentation_id, data.warehouse_id, db)
-        stock.quantity += item.quantity
+        key = (item.presentation_id, data.warehouse_id)
+        incoming[key] = incoming.get(key, Decimal("0")) + item.quantity
 
         # Movimiento de inventario
         db.add(InventoryMovement(
@@ -443,26 +436,30 @@ def create_purchase(
             created_by=current_user.id,
         ))
 
+    # Actualizar stock (un UPDATE relativo por presentación)
+    change_stock(db, incoming)
+
     # Actualizar deuda con proveedor
     if amount_credit > 0:
         supplier.current_balance += amount_credit
 
     supplier.last_purchase_at = datetime.utcnow()
 
-    db.commit()
     log_action(
         db, current_user.id, "PURCHASE", "Supplier", supplier_id,
         business_id=business_id,
         details={"total": str(total), "purchase_id": purchase.id},
     )
+    db.flush()
 
-    purchase = db.query(SupplierPurchase).options(
-        joinedload(SupplierPurchase.items)
-            .joinedload(SupplierPurchaseItem.presentation)
-            .joinedload(ProductPresentation.product)
-    ).filter(SupplierPurchase.id == purchase.id).first()
+    purchase = db.query(SupplierPurchase).options(*loaders.purchase()).filter(
+        SupplierPurchase.id == purchase.id
+    ).first()
+    response = build_purchase_response(purchase)
+    idem.save(db, response, 201)
+    db.commit()
 
-    return build_purchase_response(purchase)
+    return response
 
 
 @router.get("/{supplier_id}/purchases", response_model=List[PurchaseResponse])
@@ -471,17 +468,15 @@ def list_purchases(
     supplier_id: int,
     result=Depends(verify_business_access),
     db: Session = Depends(get_db),
+    page: CursorPage = Depends(),
     skip: int = 0,
     limit: int = 50,
 ):
     get_supplier_or_404(supplier_id, business_id, db)
-    purchases = db.query(SupplierPurchase).options(
-        joinedload(SupplierPurchase.items)
-            .joinedload(SupplierPurchaseItem.presentation)
-            .joinedload(ProductPresentation.product)
-    ).filter(
+    query = db.query(SupplierPurchase).options(*loaders.purchase()).filter(
         SupplierPurchase.supplier_id == supplier_id,
-    ).order_by(desc(SupplierPurchase.created_at)).offset(skip).limit(limit).all()
+    )
+    purchases = page.fetch(query, SupplierPurchase.created_at, SupplierPurchase.id, skip, limit)
 
     return [build_purchase_response(p) for p in purchases]
 
@@ -495,8 +490,13 @@ def add_supplier_payment(
     data: SupplierPaymentCreate,
     result=Depends(verify_business_access),
     current_user: User = Depends(get_current_active_user),
+    idem: IdempotencyGuard = Depends(idempotency),
     db: Session = Depends(get_db),
 ):
+    replay = idem.begin(db, data)
+    if replay:
+        return replay
+
     supplier = get_supplier_or_404(supplier_id, business_id, db)
 
     if data.amount > supplier.current_balance:
@@ -529,14 +529,17 @@ def add_supplier_payment(
                 purchase.amount_credit = Decimal("0")
                 purchase.payment_status = SupplierPaymentStatus.PAID
 
-    db.commit()
-    db.refresh(payment)
     log_action(
         db, current_user.id, "PAYMENT", "Supplier", supplier_id,
         business_id=business_id,
         details={"amount": str(data.amount)},
     )
-    return payment
+    db.flush()
+    db.refresh(payment)
+    response = SupplierPaymentResponse.model_validate(payment)
+    idem.save(db, response, 201)
+    db.commit()
+    return response
 
 
 @router.get("/{supplier_id}/payments", response_model=List[SupplierPaymentResponse])
@@ -545,10 +548,10 @@ def list_supplier_payments(
     supplier_id: int,
     result=Depends(verify_business_access),
     db: Session = Depends(get_db),
+    page: CursorPage = Depends(),
     skip: int = 0,
     limit: int = 50,
 ):
     get_supplier_or_404(supplier_id, business_id, db)
-    return db.query(SupplierPayment).filter(
-        SupplierPayment.supplier_id == supplier_id,
-    ).order_by(desc(SupplierPayment.created_at)).offset(skip).limit(limit).all()
\ No newline at end of file
+    query = db.query(SupplierPayment).filter(SupplierPayment.supplier_id == supplier_id)
+    return page.fetch(query, SupplierPayment.created_at, SupplierPayment.id, skip, limit)
\ No newline at end of file
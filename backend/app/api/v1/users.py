@@ -2,11 +2,11 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.user import User
-from app.models.role import AuditLog
 from app.schemas.user import UserResponse, UserUpdate
 from app.schemas.role import AuditLogResponse
 from app.api.deps import get_current_active_user, require_system_admin
 from app.utils.audit import log_action
+from app.utils.audit_archive import query_audit_logs
 from app.models.enums import SubscriptionPlan
 from typing import List
 
@@ -26,9 +26,9 @@ def update_me(
 ):
     for field, value in data.model_dump(exclude_none=True).items():
         setattr(current_user, field, value)
+    log_action(db, current_user.id, "UPDATE", "User", current_user.id)
     db.commit()
     db.refresh(current_user)
-    log_action(db, current_user.id, "UPDATE", "User", current_user.id)
     return current_user
 
 
@@ -37,10 +37,7 @@ def get_my_audit_logs(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    logs = db.query(AuditLog).filter(
-        AuditLog.user_id == current_user.id
-    ).order_by(AuditLog.created_at.desc()).limit(100).all()
-    return logs
+    return query_audit_logs(db, user_id=current_user.id, limit=100).items
 
 
 # ── Admin: listar todos los usuarios ──────────────────────────────────────────
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session
 from sqlalchemy import desc
 from typing import List, Optional
 from datetime import datetime, date
@@ -9,7 +9,7 @@ from app.database import get_db
 from app.models.waste import WasteRecord
 from app.models.enums import WasteCause
 from app.models.inventory import (
-    ProductPresentation, ProductStock,
+    ProductPresentation,
     ProductLot, InventoryMovement, MovementType,
 )
 from app.models.user import User
@@ -17,45 +17,25 @@ from app.schemas.waste import (
     WasteCreate, WasteResponse, WasteSummary,
     WasteByCause, AutoWasteResult,
 )
+from app.api import loaders
 from app.api.deps import get_current_active_user, verify_business_access
+from app.api.pagination import CursorPage
 from app.utils.audit import log_action
+from app.utils.stock import (
+    available_stock, change_stock, take_stock_upto, allocate_lots, InsufficientStock,
+)
 
 router = APIRouter(prefix="/businesses/{business_id}/waste", tags=["Mermas"])
 
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
-def get_or_create_stock(presentation_id: int, warehouse_id: int, db: Session) -> ProductStock:
-    stock = db.query(ProductStock).filter(
-        ProductStock.presentation_id == presentation_id,
-        ProductStock.warehouse_id == warehouse_id,
-    ).first()
-    if not stock:
-        stock = ProductStock(
-            presentation_id=presentation_id,
-            warehouse_id=warehouse_id,
-            quantity=0,
-        )
-        db.add(stock)
-        db.flush()
-    return stock
-
-
-def build_waste_response(record: WasteRecord, db: Session) -> WasteResponse:
-    pres = db.query(ProductPresentation).options(
-        joinedload(ProductPresentation.product)
-    ).filter(ProductPresentation.id == record.presentation_id).first()
-
-    from app.models.inventory import Warehouse
-    warehouse = db.query(Warehouse).filter(
-        Warehouse.id == record.warehouse_id
-    ).first()
-
-    lot = db.query(ProductLot).filter(
-        ProductLot.id == record.lot_id
-    ).first() if record.lot_id else None
-
-    creator = db.query(User).filter(User.id == record.created_by).first()
+def build_waste_response(record: WasteRecord) -> WasteResponse:
+    """Requiere las relaciones de loaders.waste() cargadas."""
+    pres = record.presentation
+    warehouse = record.warehouse
+    lot = record.lot
+    creator = record.creator
 
     return WasteResponse(
         id=record.id,
@@ -93,21 +73,41 @@ def _create_waste_record(
 ) -> WasteRecord:
     """Core — crea el registro de merma y actualiza stock/lote/movimiento."""
 
-    # Snapshot del costo desde el lote si existe, si no buscar último costo
+    # Descontar stock: la manual exige el stock completo, la automática
+    # descuenta lo que quede (no baja de 0)
+    if is_auto:
+        actual_deduct = take_stock_upto(db, presentation_id, warehouse_id, quantity)
+    else:
+        change_stock(db, {(presentation_id, warehouse_id): -quantity})
+        actual_deduct = quantity
+
+    # Costo: del lote indicado, o de los lotes que se consumen en orden FEFO;
+    # si no hay lotes con costo, el último costo registrado
     cost_per_unit = None
     if lot_id:
         lot = db.query(ProductLot).filter(ProductLot.id == lot_id).first()
         if lot:
             cost_per_unit = lot.cost_per_unit
+            lot.remaining = max(Decimal("0"), lot.remaining - quantity)
     else:
-        # Último lote con costo registrado para esta presentación y bodega
-        last_lot = db.query(ProductLot).filter(
-            ProductLot.presentation_id == presentation_id,
-            ProductLot.warehouse_id == warehouse_id,
-            ProductLot.cost_per_unit.isnot(None),
-        ).order_by(desc(ProductLot.arrival_date)).first()
-        if last_lot:
-            cost_per_unit = last_lot.cost_per_unit
+        key = (presentation_id, warehouse_id)
+        allocations = allocate_lots(db, {key: actual_deduct})[key]
+        if len(allocations) == 1:
+            lot_id = allocations[0].lot.id
+        allocated = sum((q for _, q in allocations), Decimal("0"))
+        if allocations and all(lot.cost_per_unit is not None for lot, _ in allocations):
+            cost_per_unit = (
+                sum(lot.cost_per_unit * q for lot, q in allocations) / allocated
+            ).quantize(Decimal("0.01"))
+        else:
+            # Último lote con costo registrado para esta presentación y bodega
+            last_lot = db.query(ProductLot).filter(
+                ProductLot.presentation_id == presentation_id,
+                ProductLot.warehouse_id == warehouse_id,
+                ProductLot.cost_per_unit.isnot(None),
+            ).order_by(desc(ProductLot.arrival_date)).first()
+            if last_lot:
+                cost_per_unit = last_lot.cost_per_unit
 
     total_cost = (quantity * cost_per_unit) if cost_per_unit else None
 
@@ -127,17 +127,6 @@ def _create_waste_record(
     db.add(record)
     db.flush()
 
-    # Descontar stock
-    stock = get_or_create_stock(presentation_id, warehouse_id, db)
-    actual_deduct = min(quantity, stock.quantity)  # No bajar de 0
-    stock.quantity -= actual_deduct
-
-    # Descontar del lote si aplica
-    if lot_id:
-        lot = db.query(ProductLot).filter(ProductLot.id == lot_id).first()
-        if lot:
-            lot.remaining = max(Decimal("0"), lot.remaining - quantity)
-
     # Movimiento de inventario
     db.add(InventoryMovement(
         business_id=business_id,
@@ -174,13 +163,13 @@ def create_waste(
         raise HTTPException(404, "Presentación no encontrada")
 
     # Validar stock disponible
-    stock = get_or_create_stock(data.presentation_id, data.warehouse_id, db)
-    if stock.quantity <= 0:
+    available = available_stock(db, data.presentation_id, data.warehouse_id)
+    if available <= 0:
         raise HTTPException(400, "No hay stock disponible en esta bodega para registrar la merma")
-    if data.quantity > stock.quantity:
+    if data.quantity > available:
         raise HTTPException(
             400,
-            f"Cantidad de merma ({data.quantity}) supera el stock disponible ({stock.quantity})"
+            f"Cantidad de merma ({data.quantity}) supera el stock disponible ({available})"
         )
 
     # Validar lote si se especifica
@@ -192,26 +181,34 @@ def create_waste(
         if not lot:
             raise HTTPException(404, "Lote no encontrado")
 
-    record = _create_waste_record(
-        business_id=business_id,
-        presentation_id=data.presentation_id,
-        warehouse_id=data.warehouse_id,
-        quantity=data.quantity,
-        cause=data.cause,
-        created_by=current_user.id,
-        db=db,
-        lot_id=data.lot_id,
-        notes=data.notes,
-        is_auto=False,
-    )
+    try:
+        record = _create_waste_record(
+            business_id=business_id,
+            presentation_id=data.presentation_id,
+            warehouse_id=data.warehouse_id,
+            quantity=data.quantity,
+            cause=data.cause,
+            created_by=current_user.id,
+            db=db,
+            lot_id=data.lot_id,
+            notes=data.notes,
+            is_auto=False,
+        )
+    except InsufficientStock as e:
+        # Otra operación consumió el stock después de la validación
+        raise HTTPException(
+            400,
+            f"Cantidad de merma ({data.quantity}) supera el stock disponible ({e.available})"
+        )
 
-    db.commit()
     log_action(
         db, current_user.id, "CREATE", "WasteRecord", record.id,
         business_id=business_id,
         details={"cause": data.cause.value, "quantity": str(data.quantity)},
     )
-    return build_waste_response(record, db)
+    db.commit()
+    record = db.query(WasteRecord).options(*loaders.waste()).filter(WasteRecord.id == record.id).one()
+    return build_waste_response(record)
 
 
 # ── Merma automática por lotes vencidos ───────────────────────────────────────
@@ -234,6 +231,9 @@ def process_expired_lots(
         ProductLot.expiry_date <= now,
         ProductLot.remaining > 0,
         ProductLot.is_active == True,
+    ).order_by(
+        # Mismo orden de bloqueo que utils.stock
+        ProductLot.warehouse_id, ProductLot.presentation_id, ProductLot.id,
     ).all()
 
     if not expired_lots:
@@ -264,17 +264,20 @@ def process_expired_lots(
 
         records.append(record)
 
-    db.commit()
     log_action(
         db, current_user.id, "AUTO_WASTE", "WasteRecord", 0,
         business_id=business_id,
         details={"processed": len(records), "total_cost": str(total_cost)},
     )
+    db.commit()
 
+    records = db.query(WasteRecord).options(*loaders.waste()).filter(
+        WasteRecord.id.in_([r.id for r in records])
+    ).order_by(WasteRecord.id).all()
     return AutoWasteResult(
         processed=len(records),
         total_cost=total_cost,
-        records=[build_waste_response(r, db) for r in records],
+        records=[build_waste_response(r) for r in records],
     )
 
 
@@ -291,10 +294,11 @@ def list_waste(
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
     is_auto: Optional[bool] = Query(None),
+    page: CursorPage = Depends(),
     skip: int = 0,
     limit: int = 50,
 ):
-    query = db.query(WasteRecord).filter(
+    query = db.query(WasteRecord).options(*loaders.waste()).filter(
         WasteRecord.business_id == business_id
     )
 
@@ -311,8 +315,8 @@ def list_waste(
     if is_auto is not None:
         query = query.filter(WasteRecord.is_auto == is_auto)
 
-    records = query.order_by(desc(WasteRecord.created_at)).offset(skip).limit(limit).all()
-    return [build_waste_response(r, db) for r in records]
+    records = page.fetch(query, WasteRecord.created_at, WasteRecord.id, skip, limit)
+    return [build_waste_response(r) for r in records]
 
 
 # ── Resumen ────────────────────────────────────────────────────────────────────
@@ -16,15 +16,69 @@ class Settings(BaseSettings):
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+
+    # Hashing de contraseñas
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 32
     
     DATABASE_URL: str
+
+    # Pool de conexiones (por proceso/worker). En SQLite se ignoran recycle y
+    # pre_ping; una BD en memoria usa una sola conexión compartida.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+
+    # Motor async para endpoints de lectura (requiere sqlalchemy[asyncio] +
+    # asyncpg/aiosqlite). Sin URL explícita se deriva de DATABASE_URL.
+    ASYNC_DB_ENABLED: bool = False
+    ASYNC_DATABASE_URL: str | None = None
     
     # Planes
     FREE_PLAN_MAX_BUSINESSES: int = 1
     BASIC_PLAN_MAX_BUSINESSES: int = 3
     PROFESSIONAL_PLAN_MAX_BUSINESSES: int = 10
     ENTERPRISE_PLAN_MAX_BUSINESSES: int = 999
-    
+
+    # Auditoría: "transaction" (en la transacción del llamador) o "batch"
+    # (cola en memoria + INSERTs masivos en segundo plano)
+    AUDIT_MODE: str = "transaction"
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_BATCH_FLUSH_MS: int = 200
+    AUDIT_BATCH_MAX_QUEUE: int = 10_000
+    # Meses que se conservan en la BD; los anteriores se archivan a disco
+    AUDIT_HOT_MONTHS: int = 6
+    AUDIT_PARTITIONS_AHEAD: int = 2
+    AUDIT_ARCHIVE_DIR: str = str(Path(__file__).parent.parent / "audit_archive")
+    # Vida del total "estimado" del listado de auditoría (SQLite)
+    AUDIT_COUNT_CACHE_SECONDS: int = 60
+
+    # Perfil de pruebas/CI: las relaciones sin estrategia explícita fallan al
+    # cargarse de forma perezosa con SQL (N+1 / cargas olvidadas)
+    ORM_RAISE_ON_LAZY_LOAD: bool = False
+
+    # Zona horaria de los negocios: define el día local del resumen diario de
+    # ventas (sales_daily_rollup). Al cambiarla hay que reconstruirlo:
+    # python -m app.utils.sales_rollup
+    BUSINESS_TIMEZONE: str = "America/Bogota"
+
+    # Sincronización de ventas offline (POST /sales/sync)
+    SALES_SYNC_MAX_BATCH: int = 500
+
+    # Cabecera Idempotency-Key: vida de las respuestas guardadas y cada cuánto
+    # (por proceso) se purgan las vencidas
+    IDEMPOTENCY_TTL_HOURS: int = 24
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: int = 300
+
+    # Caché de autorización (por proceso)
+    AUTHZ_CACHE_TTL_SECONDS: int = 60
+    AUTHZ_CACHE_MAX_ENTRIES: int = 10_000
+    TOKEN_CACHE_MAX_ENTRIES: int = 10_000
+
     class Config:
         env_file = str(ENV_PATH) if ENV_PATH.exists() else None
         env_file_encoding = "utf-8"
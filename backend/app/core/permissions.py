@@ -1,4 +1,4 @@
-from typing import List
+from typing import Iterable, List
 
 # Definición de permisos por módulo
 PERMISSIONS = {
@@ -35,4 +35,43 @@ def get_default_employee_permissions() -> List[str]:
         "inventory.view",
         "sales.view", "sales.create",
         "clients.view"
-    ]
\ No newline at end of file
+    ]
+
+# ── Bitmask de permisos ───────────────────────────────────────────────────────
+# Posición fija de cada código en BusinessRole.permission_mask.
+# El orden es persistente (se guarda en BD): solo agregar al final, nunca
+# reordenar ni reutilizar posiciones. Máximo 63 permisos (BigInteger con signo).
+PERMISSION_BIT_ORDER: List[str] = [
+    "inventory.view", "inventory.create", "inventory.update", "inventory.delete",
+    "inventory.adjust", "inventory.report",
+    "sales.view", "sales.create", "sales.cancel", "sales.report",
+    "clients.view", "clients.create", "clients.update", "clients.delete",
+    "portfolio.view", "portfolio.collect", "portfolio.adjust", "portfolio.report",
+    "finance.view", "finance.create", "finance.update", "finance.report",
+    "suppliers.view", "suppliers.create", "suppliers.update", "suppliers.delete",
+    "reports.sales", "reports.inventory", "reports.finance", "reports.clients",
+    "waste.view", "waste.register", "waste.report",
+]
+
+PERMISSION_BITS = {code: 1 << i for i, code in enumerate(PERMISSION_BIT_ORDER)}
+
+assert len(PERMISSION_BIT_ORDER) <= 63
+assert {c for codes in PERMISSIONS.values() for c in codes} <= PERMISSION_BITS.keys(), \
+    "Todo permiso de PERMISSIONS debe tener posición en PERMISSION_BIT_ORDER"
+
+
+def permission_bit(code: str) -> int:
+    """Bit del permiso. Lanza KeyError si el código no existe."""
+    return PERMISSION_BITS[code]
+
+
+def compile_permission_mask(codes: Iterable[str]) -> int:
+    """Compila códigos a bitmask. Ignora códigos desconocidos."""
+    mask = 0
+    for code in codes:
+        mask |= PERMISSION_BITS.get(code, 0)
+    return mask
+
+
+def decode_permission_mask(mask: int) -> List[str]:
+    return [code for code, bit in PERMISSION_BITS.items() if mask & bit]
@@ -0,0 +1,98 @@
+import threading
+import time
+from bisect import bisect_left
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool
+
+# Límites superiores (ms) del histograma de espera al pedir una conexión
+CHECKOUT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class PoolMetrics:
+    """
+    Contadores de un pool de conexiones: cuántos pedidos esperan, cuánto
+    tardan en obtener conexión y cuántos agotan `pool_timeout`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.errors = 0
+            self.waiting = 0
+            self.max_waiting = 0
+            self.total_ms = 0.0
+            self.max_ms = 0.0
+            self.buckets = [0] * (len(CHECKOUT_BUCKETS_MS) + 1)  # último = +inf
+
+    def start(self) -> float:
+        with self._lock:
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+        return time.perf_counter()
+
+    def finish(self, started: float, error: BaseException | None = None) -> None:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self.waiting -= 1
+            if isinstance(error, PoolTimeoutError):
+                self.timeouts += 1
+                return
+            if error is not None:
+                self.errors += 1
+                return
+            self.checkouts += 1
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+            self.buckets[bisect_left(CHECKOUT_BUCKETS_MS, elapsed_ms)] += 1
+
+    def snapshot(self, pool: Pool) -> dict:
+        # size/overflow solo existen en pools con cola (QueuePool y derivados)
+        def _call(name):
+            fn = getattr(pool, name, None)
+            return fn() if callable(fn) else None
+
+        with self._lock:
+            labels = [str(b) for b in CHECKOUT_BUCKETS_MS] + ["+inf"]
+            return {
+                "pool_class": type(pool).__mro__[1].__name__,
+                "size": _call("size"),
+                "checked_out": _call("checkedout"),
+                "checked_in": _call("checkedin"),
+                "overflow": _call("overflow"),
+                "waiting": self.waiting,
+                "max_waiting": self.max_waiting,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "errors": self.errors,
+                "avg_checkout_ms": (self.total_ms / self.checkouts) if self.checkouts else 0.0,
+                "max_checkout_ms": self.max_ms,
+                "checkout_histogram_ms": [
+                    {"le": label, "count": count}
+                    for label, count in zip(labels, self.buckets)
+                ],
+            }
+
+
+def instrumented_pool(base: type[Pool], metrics: PoolMetrics) -> type[Pool]:
+    """
+    Subclase de `base` que mide cada `connect()`. Se pasa como `poolclass`
+    a create_engine; `recreate()` (p. ej. tras dispose) conserva la clase y
+    por lo tanto las métricas.
+    """
+
+    def connect(self):
+        started = metrics.start()
+        try:
+            conn = base.connect(self)
+        except BaseException as exc:
+            metrics.finish(started, error=exc)
+            raise
+        metrics.finish(started)
+        return conn
+
+    return type(f"Instrumented{base.__name__}", (base,), {"connect": connect})
@@ -1,11 +1,26 @@
+import asyncio
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.config import get_settings
+from app.core.cache import TTLCache
 
 settings = get_settings()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# min/max = costo configurado: cualquier hash con otro costo se marca para
+# re-hash y se actualiza en el siguiente login exitoso.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
 
 def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
@@ -13,6 +28,47 @@ def verify_password(plain: str, hashed: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+# ── Hashing en pool dedicado ──────────────────────────────────────────────────
+# bcrypt libera el GIL, así que un pool de hilos propio basta para sacar el
+# hashing del threadpool de Starlette. El semáforo acota trabajos en curso +
+# en cola: si se llena se rechaza de inmediato en vez de acumular latencia.
+
+class PasswordHasherBusy(Exception):
+    """La cola del pool de hashing está llena."""
+
+_hash_pool = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="pwd-hash",
+)
+_hash_slots = threading.BoundedSemaphore(
+    settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_QUEUE
+)
+
+async def _run_in_hash_pool(fn, *args):
+    if not _hash_slots.acquire(blocking=False):
+        raise PasswordHasherBusy()
+    try:
+        future = asyncio.get_running_loop().run_in_executor(_hash_pool, fn, *args)
+    except BaseException:
+        _hash_slots.release()
+        raise
+    # El cupo se libera cuando termina el trabajo, aunque el request se cancele
+    future.add_done_callback(lambda _: _hash_slots.release())
+    return await future
+
+async def hash_password_async(password: str) -> str:
+    return await _run_in_hash_pool(pwd_context.hash, password)
+
+async def verify_password_async(plain: str, hashed: str) -> tuple[bool, Optional[str]]:
+    """
+    Retorna (válido, nuevo_hash). nuevo_hash viene informado cuando el hash
+    guardado usa un costo distinto al configurado y debe reemplazarse.
+    """
+    return await _run_in_hash_pool(pwd_context.verify_and_update, plain, hashed)
+
+def shutdown_hash_pool() -> None:
+    _hash_pool.shutdown(wait=True)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
@@ -25,14 +81,29 @@ def create_refresh_token(data: dict) -> str:
     to_encode.update({"exp": expire, "type": "refresh"})
     return jwt.encode(to_encode, settings.REFRESH_SECRET_KEY, algorithm=settings.ALGORITHM)
 
+# Tokens de acceso ya verificados, por digest del token y hasta su `exp`.
+# Solo se cachean tokens válidos; el usuario se sigue cargando en cada request,
+# así que desactivar una cuenta surte efecto de inmediato.
+_token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_MAX_ENTRIES, ttl=0)
+
 def decode_access_token(token: str) -> Optional[dict]:
+    key = hashlib.sha256(token.encode()).digest()
+    payload = _token_cache.get(key)
+    if payload is not None:
+        return dict(payload)
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         if payload.get("type") != "access":
             return None
-        return payload
     except JWTError:
         return None
+    ttl = payload.get("exp", 0) - time.time()
+    if ttl > 0:
+        _token_cache.set(key, payload, ttl=ttl)
+    return dict(payload)
+
+def token_cache_stats() -> dict:
+    return _token_cache.stats()
 
 def decode_refresh_token(token: str) -> Optional[dict]:
     try:
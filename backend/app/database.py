@@ -1,17 +1,64 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import orm
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool, StaticPool
+from fastapi.concurrency import run_in_threadpool
 from app.config import get_settings
+from app.core.pool_metrics import PoolMetrics, instrumented_pool
 
 settings = get_settings()
 
+# ── Pool de conexiones ────────────────────────────────────────────────────────
+
+pool_metrics: dict[str, PoolMetrics] = {"sync": PoolMetrics(), "async": PoolMetrics()}
+
+def _is_sqlite_memory(url) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+def _pool_options(url: str, queue_pool: type, metrics: PoolMetrics) -> dict:
+    if _is_sqlite_memory(url):
+        # Cada conexión sería una BD distinta: se comparte una sola
+        return {"poolclass": instrumented_pool(StaticPool, metrics)}
+
+    options = {
+        "poolclass": instrumented_pool(queue_pool, metrics),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+    if make_url(url).get_backend_name() != "sqlite":
+        options["pool_recycle"] = settings.DB_POOL_RECYCLE
+        options["pool_pre_ping"] = settings.DB_POOL_PRE_PING
+    return options
+
+def _configure_sqlite(engine_) -> None:
+    """WAL permite lecturas concurrentes a una escritura; busy_timeout evita
+    'database is locked' inmediato cuando dos conexiones escriben a la vez."""
+    use_wal = not _is_sqlite_memory(engine_.url)
+
+    @event.listens_for(engine_, "connect")
+    def _on_connect(dbapi_conn, _):
+        cursor = dbapi_conn.cursor()
+        cursor.execute(f"PRAGMA busy_timeout = {int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        if use_wal:
+            cursor.execute("PRAGMA journal_mode = WAL")
+        cursor.close()
+
 if settings.DATABASE_URL.startswith("sqlite"):
     engine = create_engine(
         settings.DATABASE_URL,
-        connect_args={"check_same_thread": False}
+        connect_args={"check_same_thread": False},
+        **_pool_options(settings.DATABASE_URL, QueuePool, pool_metrics["sync"]),
     )
+    _configure_sqlite(engine)
 else:
-    engine = create_engine(settings.DATABASE_URL)
+    engine = create_engine(
+        settings.DATABASE_URL,
+        **_pool_options(settings.DATABASE_URL, QueuePool, pool_metrics["sync"]),
+    )
     
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -21,9 +68,91 @@ SessionLocal = sessionmaker(
 
 Base = declarative_base()
 
+
+# ── Carga de relaciones ───────────────────────────────────────────────────────
+# Los modelos declaran sus relaciones con este `relationship`. Con
+# ORM_RAISE_ON_LAZY_LOAD (perfil de pruebas) una relación que no se cargó
+# explícitamente lanza error en vez de hacer un SELECT por fila, así un N+1
+# no llega a producción. Lo que carga cada endpoint está en app/api/loaders.py.
+
+def relationship(*args, **kwargs):
+    if settings.ORM_RAISE_ON_LAZY_LOAD:
+        kwargs.setdefault("lazy", "raise_on_sql")
+    return orm.relationship(*args, **kwargs)
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# ── Motor async (opcional) ────────────────────────────────────────────────────
+# Con ASYNC_DB_ENABLED los endpoints de lectura corren sobre AsyncSession
+# (asyncpg / aiosqlite) sin ocupar hilos del threadpool. Requiere
+# `sqlalchemy[asyncio]` y el driver; por eso el import es perezoso.
+
+_ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+def async_database_url(url: str) -> str:
+    """postgresql://… → postgresql+asyncpg://…, sqlite://… → sqlite+aiosqlite://…"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"Sin driver async conocido para '{backend}'")
+    return parsed.set(drivername=f"{backend}+{_ASYNC_DRIVERS[backend]}") \
+                 .render_as_string(hide_password=False)
+
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.ASYNC_DB_ENABLED:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    _async_url = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+    async_engine = create_async_engine(
+        _async_url,
+        **_pool_options(_async_url, AsyncAdaptedQueuePool, pool_metrics["async"]),
+    )
+    if _async_url.startswith("sqlite"):
+        _configure_sqlite(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+class ThreadpoolSession:
+    """
+    Respaldo de get_async_db sin motor async: expone `run_sync` igual que
+    AsyncSession, pero ejecuta la función con una sesión sync en el threadpool.
+    """
+
+    def __init__(self, session):
+        self.session = session
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(fn, self.session, *args, **kwargs)
+
+
+async def get_async_db():
+    """
+    Sesión para endpoints `async def`. Las consultas van en una función sync
+    `fn(db, ...)` ejecutada con `await db.run_sync(fn, ...)`: sobre AsyncSession
+    corre en un greenlet (sin hilos); sin motor async, en el threadpool.
+    La función debe devolver datos ya serializables — fuera de ella no hay
+    lazy loading.
+    """
+    if AsyncSessionLocal is None:
+        db = SessionLocal()
+        try:
+            yield ThreadpoolSession(db)
+        finally:
+            await run_in_threadpool(db.close)
+        return
+
+    async with AsyncSessionLocal() as db:
+        yield db
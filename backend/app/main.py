@@ -1,20 +1,17 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import get_settings
-from app.database import engine
+from app.database import async_engine
 from app.models import *
-from app.database import Base
 from app.api.v1 import api_router
+from app.core.security import shutdown_hash_pool
+from app.utils.audit import audit_writer
 
-# SEEDERS
-from app.utils.seeder import run_all_seeders
-from app.database import SessionLocal
+# Migraciones + SEEDERS
+from app.utils.bootstrap import prepare_database
 
 settings = get_settings()
 
-# Crea todas las tablas al iniciar
-Base.metadata.create_all(bind=engine)
-
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
@@ -25,11 +22,18 @@ app = FastAPI(
 
 @app.on_event("startup")
 def on_startup():
-    db = SessionLocal()
-    try:
-        run_all_seeders(db)
-    finally:
-        db.close()
+    # Esquema vía Alembic (ver alembic/); solo un worker migra y siembra
+    prepare_database()
+
+@app.on_event("shutdown")
+def on_shutdown():
+    shutdown_hash_pool()
+    audit_writer.stop()
+
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    if async_engine is not None:
+        await async_engine.dispose()
 
 # CORS
 app.add_middleware(
@@ -39,6 +43,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Paginación por cursor (app/api/pagination.py)
+    expose_headers=["Link", "X-Next-Cursor", "X-Prev-Cursor"],
 )
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
@@ -8,4 +8,4 @@ from app.models.enums import (
 # Modelos principales
 from app.models.user import User
 from app.models.business import Business, BusinessUser
-from app.models.role import BusinessRole, Permission, AuditLog, role_permissions
\ No newline at end of file
+from app.models.role import BusinessRole, Permission, AuditLog, AuditVocabulary, role_permissions
\ No newline at end of file
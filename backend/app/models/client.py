@@ -1,11 +1,10 @@
 from sqlalchemy import (
     Column, Integer, String, Boolean, DateTime, 
-    ForeignKey, Text, Numeric, Enum as SQLEnum
+    ForeignKey, Text, Numeric, Enum as SQLEnum, Index, text
 )
-from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
-from app.database import Base
+from app.database import Base, relationship
 from app.models.enums import ClientStatus, ClientType
 
 class Client(Base):
@@ -41,6 +40,10 @@ class Client(Base):
     purchase_history = relationship("ClientPurchase", back_populates="client", cascade="all, delete-orphan")
     credit_movements = relationship("CreditMovement", back_populates="client", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_clients_business_active", "business_id", postgresql_where=text("is_active"), sqlite_where=text("is_active = 1")),
+    )
+
 
 class ClientPurchase(Base):
     """Historial de compras — se creará desde el módulo de ventas,
@@ -59,6 +62,8 @@ class ClientPurchase(Base):
 
     client = relationship("Client", back_populates="purchase_history")
 
+    __table_args__ = (Index("ix_client_purchases_client_created", "client_id", "created_at"),)
+
 
 class CreditMovement(Base):
     """Abonos y cargos a la deuda del cliente."""
@@ -74,4 +79,9 @@ class CreditMovement(Base):
     created_by = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime, default=datetime.utcnow)
 
-    client = relationship("Client", back_populates="credit_movements")
\ No newline at end of file
+    client = relationship("Client", back_populates="credit_movements")
+
+    __table_args__ = (
+        Index("ix_credit_movements_business_created", "business_id", "created_at"),
+        Index("ix_credit_movements_client_created", "client_id", "created_at"),
+    )
\ No newline at end of file
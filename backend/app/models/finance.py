@@ -1,11 +1,10 @@
 from sqlalchemy import (
     Column, Integer, String, Boolean, DateTime,
-    ForeignKey, Text, Numeric, Enum as SQLEnum
+    ForeignKey, Text, Numeric, Enum as SQLEnum, Index
 )
-from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
-from app.database import Base
+from app.database import Base, relationship
 from app.models.enums import CashRegisterStatus, CashMovementType
 
 class CashRegister(Base):
@@ -56,9 +55,16 @@ class CashSession(Base):
     total_credit = Column(Numeric(12, 2), nullable=True)   # Ventas fiadas (no son caja)
 
     register = relationship("CashRegister", back_populates="sessions")
+    opener = relationship("User", foreign_keys=[opened_by])
+    closer = relationship("User", foreign_keys=[closed_by])
     movements = relationship("CashMovement", back_populates="session", cascade="all, delete-orphan")
     payment_breakdown = relationship("SessionPaymentBreakdown", back_populates="session", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_cash_sessions_register_status", "register_id", "status"),
+        Index("ix_cash_sessions_register_opened", "register_id", "opened_at"),
+    )
+
 
 class CashMovement(Base):
     """Entrada o salida manual de dinero en una sesión."""
@@ -76,6 +82,11 @@ class CashMovement(Base):
 
     session = relationship("CashSession", back_populates="movements")
 
+    __table_args__ = (
+        Index("ix_cash_movements_business_created", "business_id", "created_at"),
+        Index("ix_cash_movements_session", "session_id"),
+    )
+
 
 class SessionPaymentBreakdown(Base):
     """Desglose de ventas por método de pago al cierre."""
@@ -89,4 +100,6 @@ class SessionPaymentBreakdown(Base):
     is_credit = Column(Boolean, default=False)
 
     session = relationship("CashSession", back_populates="payment_breakdown")
-    payment_method = relationship("PaymentMethod")
\ No newline at end of file
+    payment_method = relationship("PaymentMethod")
+
+    __table_args__ = (Index("ix_session_payment_breakdowns_session", "session_id"),)
\ No newline at end of file
@@ -1,11 +1,10 @@
 from sqlalchemy import (
     Column, Integer, String, Boolean, DateTime,
-    ForeignKey, Text, Numeric, Enum as SQLEnum
+    ForeignKey, Text, Numeric, Enum as SQLEnum, Index, text
 )
-from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
-from app.database import Base
+from app.database import Base, relationship
 from app.models.enums import MovementType, ProductStatus
 
 # ── Categoría ─────────────────────────────────────────────────────────────────
@@ -63,6 +62,29 @@ class Product(Base):
     category = relationship("ProductCategory", back_populates="products")
     presentations = relationship("ProductPresentation", back_populates="product", cascade="all, delete-orphan")
 
+    # Listado de productos activos por nombre
+    __table_args__ = (
+        Index("ix_products_business_name_active", "business_id", "name", postgresql_where=text("is_active"), sqlite_where=text("is_active = 1")),
+    )
+
+
+# ── Búsqueda ──────────────────────────────────────────────────────────────────
+
+class ProductSearch(Base):
+    """
+    Texto de búsqueda normalizado (minúsculas, sin tildes) de un producto
+    activo; lo mantiene utils.product_search, que además crea el índice FTS5
+    (SQLite) o de trigramas (Postgres) sobre esta tabla.
+    """
+    __tablename__ = "product_search"
+
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True, autoincrement=False)
+    business_id = Column(Integer, ForeignKey("businesses.id"), nullable=False)
+    name = Column(String, nullable=False)       # nombre del producto
+    document = Column(Text, nullable=False)     # nombre + presentaciones + códigos de barras
+
+    __table_args__ = (Index("ix_product_search_business", "business_id"),)
+
 
 # ── Presentación (ej: 250ml, 500ml, 1L) ──────────────────────────────────────
 
@@ -84,6 +106,11 @@ class ProductPresentation(Base):
     stock = relationship("ProductStock", back_populates="presentation", cascade="all, delete-orphan")
     lots = relationship("ProductLot", back_populates="presentation", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_product_presentations_product", "product_id"),
+        Index("ix_product_presentations_business_barcode", "business_id", "barcode"),
+    )
+
 
 # ── Stock por bodega ──────────────────────────────────────────────────────────
 
@@ -95,9 +122,20 @@ class ProductStock(Base):
     presentation_id = Column(Integer, ForeignKey("product_presentations.id"), nullable=False)
     warehouse_id = Column(Integer, ForeignKey("warehouses.id"), nullable=False)
     quantity = Column(Numeric(12, 3), default=0)  # Decimal para productos a granel
+    # quantity <= min_stock (con min_stock > 0); lo mantiene utils.stock en
+    # cada cambio de stock o de min_stock
+    is_low = Column(Boolean, nullable=False, default=False, server_default=text("false"))
 
     presentation = relationship("ProductPresentation", back_populates="stock")
     warehouse = relationship("Warehouse", back_populates="stock")
+
+    # Una fila por (presentación, bodega). Las alertas de stock bajo leen solo
+    # las filas marcadas
+    __table_args__ = (
+        Index("ux_product_stock_presentation_warehouse", "presentation_id", "warehouse_id", unique=True),
+        Index("ix_product_stock_warehouse", "warehouse_id"),
+        Index("ix_product_stock_low", "presentation_id", postgresql_where=text("is_low"), sqlite_where=text("is_low = 1")),
+    )
     
     @property
     def warehouse_name(self):
@@ -125,6 +163,13 @@ class ProductLot(Base):
 
     presentation = relationship("ProductPresentation", back_populates="lots")
 
+    # Solo lotes con saldo: alertas de vencimiento y consumo FEFO (el orden
+    # completo de la cola, ver utils.stock.allocate_lots)
+    __table_args__ = (
+        Index("ix_product_lots_business_expiry_open", "business_id", "expiry_date", postgresql_where=text("remaining > 0"), sqlite_where=text("remaining > 0")),
+        Index("ix_product_lots_fefo_open", "presentation_id", "warehouse_id", "expiry_date", "arrival_date", "id", postgresql_where=text("remaining > 0"), sqlite_where=text("remaining > 0")),
+    )
+
     @property
     def is_expired(self):
         if not self.expiry_date:
@@ -163,4 +208,9 @@ class InventoryMovement(Base):
     reference_type = Column(String, nullable=True)     # "sale", "purchase", etc.
 
     created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_inventory_movements_business_created", "business_id", "created_at"),
+        Index("ix_inventory_movements_presentation_created", "presentation_id", "created_at"),
+    )
\ No newline at end of file
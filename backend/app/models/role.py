@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Table
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, ForeignKey, Text, Table, Index, event, inspect
+from sqlalchemy.orm import Session
 from datetime import datetime
-from app.database import Base
+from app.database import Base, relationship
+from app.core.permissions import compile_permission_mask
 
 # Tabla intermedia para la relación muchos-a-muchos entre roles y permisos
 role_permissions = Table(
@@ -34,6 +35,9 @@ class BusinessRole(Base):
     is_default = Column(Boolean, default=False)  # Empleado es el rol por defecto
     can_manage_users = Column(Boolean, default=False)
     can_manage_roles = Column(Boolean, default=False)
+    # Bitmask precompilado de `permissions` (ver core.permissions.PERMISSION_BIT_ORDER).
+    # Se recalcula automáticamente en cada flush que modifique la relación.
+    permission_mask = Column(BigInteger, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -41,6 +45,19 @@ class BusinessRole(Base):
     business = relationship("Business", back_populates="business_roles")
     permissions = relationship("Permission", secondary=role_permissions, back_populates="roles")
 
+    def refresh_permission_mask(self) -> None:
+        self.permission_mask = compile_permission_mask(p.code for p in self.permissions)
+
+
+@event.listens_for(Session, "before_flush")
+def _refresh_role_permission_masks(session, flush_context, instances):
+    """Mantiene permission_mask sincronizado con role_permissions."""
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, BusinessRole):
+            continue
+        if obj.permission_mask is None or inspect(obj).attrs.permissions.history.has_changes():
+            obj.refresh_permission_mask()
+
 class AuditLog(Base):
     __tablename__ = "audit_logs"
     
@@ -52,7 +69,27 @@ class AuditLog(Base):
     entity_id = Column(Integer)
     details = Column(Text)  # JSON con detalles adicionales
     ip_address = Column(String)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    # Clave de partición en Postgres: ahí la tabla está particionada por mes
+    # y su PK es (id, created_at) (migración 0010, ver utils.audit_archive)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     
     # Relaciones
-    user = relationship("User", back_populates="audit_logs")
\ No newline at end of file
+    user = relationship("User", back_populates="audit_logs")
+
+    __table_args__ = (
+        # Paginación keyset: ORDER BY created_at DESC, id DESC
+        Index("ix_audit_logs_created_id", "created_at", "id"),
+        Index("ix_audit_logs_business_created", "business_id", "created_at"),
+        Index("ix_audit_logs_user_created", "user_id", "created_at"),
+    )
+
+class AuditVocabulary(Base):
+    """
+    Valores distintos de `action` y `entity_type` vistos en el audit log.
+    Se mantiene al escribir (ver utils.audit) para que los filtros del admin
+    no hagan DISTINCT sobre toda la tabla.
+    """
+    __tablename__ = "audit_vocabulary"
+
+    kind = Column(String, primary_key=True)  # "action" | "entity_type"
+    value = Column(String, primary_key=True)
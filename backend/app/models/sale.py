@@ -1,11 +1,10 @@
 from sqlalchemy import (
-    Column, Integer, String, Boolean, DateTime,
-    ForeignKey, Text, Numeric, Enum as SQLEnum
+    Column, Integer, String, Boolean, Date, DateTime,
+    ForeignKey, Text, Numeric, Enum as SQLEnum, Index
 )
-from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
-from app.database import Base
+from app.database import Base, relationship
 from app.models.enums import SaleStatus
 
 class PaymentMethod(Base):
@@ -45,6 +44,8 @@ class Sale(Base):
     cancelled_at = Column(DateTime, nullable=True)
     cancelled_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     cancel_reason = Column(String, nullable=True)
+    # Id generado por el terminal en ventas offline (evita duplicar al reenviar)
+    client_ref = Column(String(64), nullable=True)
 
     created_at = Column(DateTime, default=datetime.utcnow)
 
@@ -56,6 +57,12 @@ class Sale(Base):
     items = relationship("SaleItem", back_populates="sale", cascade="all, delete-orphan")
     payments = relationship("SalePayment", back_populates="sale", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_sales_business_created", "business_id", "created_at"),
+        Index("ix_sales_client_created", "client_id", "created_at"),
+        Index("ux_sales_business_client_ref", "business_id", "client_ref", unique=True),
+    )
+
 
 class SaleItem(Base):
     __tablename__ = "sale_items"
@@ -68,9 +75,37 @@ class SaleItem(Base):
     unit_price = Column(Numeric(12, 2), nullable=False)
     discount = Column(Numeric(12, 2), default=0)
     subtotal = Column(Numeric(12, 2), nullable=False)
+    # Costo unitario al vender (lotes consumidos, ver utils.stock.line_unit_cost).
+    # NULL si no había ningún costo registrado
+    unit_cost = Column(Numeric(12, 4), nullable=True)
 
     sale = relationship("Sale", back_populates="items")
     presentation = relationship("ProductPresentation")
+    lots = relationship("SaleItemLot", back_populates="sale_item", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        Index("ix_sale_items_sale", "sale_id"),
+        Index("ix_sale_items_presentation", "presentation_id"),
+    )
+
+
+class SaleItemLot(Base):
+    """De qué lote salió cada parte de una línea de venta (consumo FEFO)."""
+    __tablename__ = "sale_item_lots"
+
+    id = Column(Integer, primary_key=True, index=True)
+    sale_item_id = Column(Integer, ForeignKey("sale_items.id"), nullable=False)
+    lot_id = Column(Integer, ForeignKey("product_lots.id"), nullable=False)
+    quantity = Column(Numeric(12, 3), nullable=False)
+    cost_per_unit = Column(Numeric(12, 2), nullable=True)  # snapshot del lote
+
+    sale_item = relationship("SaleItem", back_populates="lots")
+    lot = relationship("ProductLot")
+
+    __table_args__ = (
+        Index("ix_sale_item_lots_item", "sale_item_id"),
+        Index("ix_sale_item_lots_lot", "lot_id"),
+    )
 
 
 class SalePayment(Base):
@@ -85,3 +120,35 @@ class SalePayment(Base):
 
     sale = relationship("Sale", back_populates="payments")
     payment_method = relationship("PaymentMethod")
+
+    __table_args__ = (Index("ix_sale_payments_sale", "sale_id"),)
+
+
+class SalesDailyRollup(Base):
+    """
+    Totales de venta por día local, bodega y vendedor (utils.sales_rollup).
+    La fila con payment_method_id = 0 lleva conteos y totales de las ventas;
+    las demás, lo cobrado con cada método.
+    """
+    __tablename__ = "sales_daily_rollup"
+
+    id = Column(Integer, primary_key=True)
+    business_id = Column(Integer, ForeignKey("businesses.id"), nullable=False)
+    day = Column(Date, nullable=False)
+    warehouse_id = Column(Integer, ForeignKey("warehouses.id"), nullable=False)
+    seller_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    payment_method_id = Column(Integer, nullable=False, default=0)  # sin FK: 0 = venta
+
+    sales_count = Column(Integer, nullable=False, default=0)
+    cancelled_count = Column(Integer, nullable=False, default=0)
+    total = Column(Numeric(14, 2), nullable=False, default=0)
+    amount_credit = Column(Numeric(14, 2), nullable=False, default=0)
+    amount = Column(Numeric(14, 2), nullable=False, default=0)  # cobrado con el método
+
+    __table_args__ = (
+        Index(
+            "ux_sales_daily_rollup_key",
+            "business_id", "day", "warehouse_id", "seller_id", "payment_method_id",
+            unique=True,
+        ),
+    )
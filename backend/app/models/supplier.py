@@ -1,11 +1,10 @@
 from sqlalchemy import (
     Column, Integer, String, Boolean, DateTime,
-    ForeignKey, Text, Numeric, Enum as SQLEnum
+    ForeignKey, Text, Numeric, Enum as SQLEnum, Index
 )
-from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
-from app.database import Base
+from app.database import Base, relationship
 from app.models.enums import SupplierStatus, PurchaseStatus, SupplierPaymentStatus
 
 class Supplier(Base):
@@ -81,6 +80,8 @@ class SupplierPurchase(Base):
     items = relationship("SupplierPurchaseItem", back_populates="purchase", cascade="all, delete-orphan")
     payments = relationship("SupplierPayment", back_populates="purchase")
 
+    __table_args__ = (Index("ix_supplier_purchases_supplier_created", "supplier_id", "created_at"),)
+
 
 class SupplierPurchaseItem(Base):
     __tablename__ = "supplier_purchase_items"
@@ -116,4 +117,6 @@ class SupplierPayment(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     supplier = relationship("Supplier", back_populates="payments")
-    purchase = relationship("SupplierPurchase", back_populates="payments")
\ No newline at end of file
+    purchase = relationship("SupplierPurchase", back_populates="payments")
+
+    __table_args__ = (Index("ix_supplier_payments_supplier_created", "supplier_id", "created_at"),)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Index
 from datetime import datetime
 from app.database import Base
 
@@ -13,4 +13,30 @@ class SystemSetting(Base):
     description = Column(Text)
     group = Column(String, nullable=False, default="general")  # general | limits | features
     updated_by = Column(Integer, nullable=True)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
\ No newline at end of file
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class AppMeta(Base):
+    """Estado interno de la aplicación (p. ej. huella de los seeders). No se edita desde el admin."""
+    __tablename__ = "app_meta"
+
+    key = Column(String, primary_key=True)
+    value = Column(Text, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class IdempotencyKey(Base):
+    """
+    Respuesta guardada de una petición con cabecera `Idempotency-Key`
+    (ver utils.idempotency). Un reintento con la misma clave devuelve esta
+    respuesta sin volver a ejecutar el endpoint.
+    """
+    __tablename__ = "idempotency_keys"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False)  # sha256 de ruta + cuerpo
+    status_code = Column(Integer, nullable=True)       # NULL mientras se procesa
+    response_body = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (Index("ix_idempotency_keys_expires", "expires_at"),)
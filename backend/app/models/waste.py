@@ -1,11 +1,10 @@
 from sqlalchemy import (
     Column, Integer, String, Boolean, DateTime,
-    ForeignKey, Text, Numeric, Enum as SQLEnum
+    ForeignKey, Text, Numeric, Enum as SQLEnum, Index
 )
-from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
-from app.database import Base
+from app.database import Base, relationship
 from app.models.enums import WasteCause
 
 
@@ -32,4 +31,6 @@ class WasteRecord(Base):
     presentation = relationship("ProductPresentation")
     warehouse = relationship("Warehouse")
     lot = relationship("ProductLot")
-    creator = relationship("User")
\ No newline at end of file
+    creator = relationship("User")
+
+    __table_args__ = (Index("ix_waste_records_business_created", "business_id", "created_at"),)
\ No newline at end of file
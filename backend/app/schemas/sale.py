@@ -1,6 +1,6 @@
-from pydantic import BaseModel, model_validator
-from typing import Optional, List
-from datetime import datetime
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Optional, List, Literal
+from datetime import datetime, timezone
 from decimal import Decimal
 from app.models.enums import SaleStatus
 
@@ -98,6 +98,50 @@ class SaleCreate(BaseModel):
         return self
 
 
+class OfflineSaleCreate(SaleCreate):
+    """Venta registrada por un terminal sin conexión."""
+    client_ref: str = Field(min_length=1, max_length=64)  # id generado por el terminal (UUID)
+    sold_at: Optional[datetime] = None                     # hora real de la venta
+
+    @field_validator('sold_at')
+    @classmethod
+    def sold_at_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        # created_at se guarda en UTC sin tzinfo: se convierte el offset que
+        # mande el terminal en vez de descartarlo
+        if value is None:
+            return value
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        if value > datetime.utcnow():
+            raise ValueError("La fecha de la venta no puede estar en el futuro")
+        return value
+
+
+class SaleSyncRequest(BaseModel):
+    sales: List[OfflineSaleCreate]
+
+    @model_validator(mode='after')
+    def validate_unique_refs(self):
+        if len(self.sales) != len({s.client_ref for s in self.sales}):
+            raise ValueError("client_ref repetido en el lote")
+        return self
+
+
+class SaleSyncResult(BaseModel):
+    client_ref: str
+    status: Literal["created", "duplicate", "error"]
+    sale_id: Optional[int] = None
+    error: Optional[str] = None
+    retryable: bool = False  # falló por la BD, no por la venta: reenviarla
+
+
+class SaleSyncResponse(BaseModel):
+    created: int
+    duplicate: int
+    error: int
+    results: List[SaleSyncResult]
+
+
 class SaleCancelRequest(BaseModel):
     reason: str
 
@@ -1,6 +1,17 @@
 import json
+import logging
+import queue
+import threading
+from datetime import datetime
+from sqlalchemy import event, insert
 from sqlalchemy.orm import Session
-from app.models.role import AuditLog
+from app.config import get_settings
+from app.models.role import AuditLog, AuditVocabulary
+from app.utils.audit_archive import ensure_partitions_for
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
 
 def log_action(
     db: Session,
@@ -14,17 +25,178 @@ def log_action(
 ):
     """
     Registra una acción en el log de auditoría.
-    
+
+    No hace commit: el registro se persiste con el commit del llamador, así
+    que debe llamarse antes de `db.commit()` (con `db.flush()` previo si se
+    necesita el id de una entidad nueva). Si la transacción hace rollback, la
+    acción no queda registrada.
+
+    Con AUDIT_MODE="batch" la fila no viaja en la transacción: se encola al
+    hacer commit y el escritor en segundo plano la inserta por lotes.
+
     Acciones estándar: CREATE, UPDATE, DELETE, LOGIN, LOGOUT, INVITE, REMOVE
     """
-    log = AuditLog(
+    row = dict(
         user_id=user_id,
         business_id=business_id,
         action=action,
         entity_type=entity_type,
         entity_id=entity_id,
         details=json.dumps(details) if details else None,
-        ip_address=ip_address
+        ip_address=ip_address,
+        created_at=datetime.utcnow(),
     )
-    db.add(log)
-    db.commit()
\ No newline at end of file
+    ensure_partitions_for(row["created_at"])
+    if settings.AUDIT_MODE == "batch":
+        db.info.setdefault("pending_audit", []).append(row)
+    else:
+        db.add(AuditLog(**row))
+        record_vocabulary(db, [row])
+
+
+# ── Vocabulario (acciones / tipos de entidad) ─────────────────────────────────
+
+# Pares (kind, value) ya confirmados en la BD por este proceso
+_known_vocabulary: set[tuple[str, str]] = set()
+
+def _upsert_ignore(db: Session):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    return dialect_insert(AuditVocabulary).on_conflict_do_nothing()
+
+def record_vocabulary(db: Session, rows: list) -> None:
+    """Registra acciones/tipos nuevos; solo toca la BD la primera vez por proceso."""
+    terms = set()
+    for row in rows:
+        terms.add(("action", row["action"]))
+        terms.add(("entity_type", row["entity_type"]))
+    terms -= _known_vocabulary
+    if not terms:
+        return
+    db.execute(_upsert_ignore(db), [{"kind": k, "value": v} for k, v in sorted(terms)])
+    db.info.setdefault("new_vocabulary", set()).update(terms)
+
+
+# ── Escritor por lotes ────────────────────────────────────────────────────────
+
+class AuditBatchWriter:
+    """
+    Hilo que vacía una cola acotada de filas de auditoría con INSERTs
+    masivos cada `flush_ms` o al juntar `batch_size` filas. Si la cola está
+    llena, `submit` retorna False y el llamador escribe la fila él mismo.
+    """
+
+    def __init__(self, session_factory, max_queue: int, batch_size: int, flush_ms: int):
+        self._session_factory = session_factory
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._batch_size = batch_size
+        self._flush_interval = flush_ms / 1000
+        self._stop = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, row: dict) -> bool:
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            return False
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="audit-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _take_batch(self) -> list:
+        batch = []
+        try:
+            batch.append(self._queue.get(timeout=self._flush_interval))
+        except queue.Empty:
+            return batch
+        while len(batch) < self._batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def write(self, batch: list) -> None:
+        if not batch:
+            return
+        ensure_partitions_for(max(row["created_at"] for row in batch))
+        db = self._session_factory()
+        try:
+            db.execute(insert(AuditLog), batch)
+            record_vocabulary(db, batch)
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception("No se pudieron escribir %d registros de auditoría", len(batch))
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.write(self._take_batch())
+
+    def flush(self) -> None:
+        """Escribe lo que quede en la cola (desde el hilo que llama)."""
+        while True:
+            batch = []
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not batch:
+                return
+            self.write(batch)
+
+    def stop(self) -> None:
+        """Detiene el hilo y vacía la cola. Se llama al apagar la app."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+
+def _default_session_factory():
+    from app.database import SessionLocal
+    return SessionLocal()
+
+
+audit_writer = AuditBatchWriter(
+    _default_session_factory,
+    max_queue=settings.AUDIT_BATCH_MAX_QUEUE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_ms=settings.AUDIT_BATCH_FLUSH_MS,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_pending_audit(session: Session):
+    _known_vocabulary.update(session.info.pop("new_vocabulary", ()))
+    rows = session.info.pop("pending_audit", None)
+    if not rows:
+        return
+    overflow = [row for row in rows if not audit_writer.submit(row)]
+    if overflow:
+        # Cola llena: se escriben de forma síncrona en vez de perderlas
+        audit_writer.write(overflow)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_audit(session: Session):
+    session.info.pop("pending_audit", None)
+    session.info.pop("new_vocabulary", None)
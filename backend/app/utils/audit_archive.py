@@ -0,0 +1,588 @@
+"""
+Particionado por mes y archivo frío del log de auditoría.
+
+- Postgres: `audit_logs` es una tabla particionada por RANGE (created_at)
+  (migración 0010) con una partición por mes, más una DEFAULT de respaldo;
+  el planner poda particiones con los filtros de fecha. Las particiones de
+  los próximos meses se crean al iniciar y al escribir en un mes nuevo.
+- SQLite: `audit_logs` guarda el mes en curso y `rotate_audit_logs` mueve los
+  meses cerrados a tablas `audit_logs_YYYY_MM`.
+
+Los meses más antiguos que AUDIT_HOT_MONTHS se vuelcan a
+`AUDIT_ARCHIVE_DIR/audit_logs_YYYY_MM.jsonl.gz` y se eliminan de la BD; el
+manifiesto guarda por archivo su rango de fechas y conteos por campo.
+`query_audit_logs` consulta ambos lados de forma transparente.
+"""
+import gzip
+import json
+import logging
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional
+
+from sqlalchemy import (
+    Table, Column, MetaData, Index, func, inspect, select, text, union_all,
+    insert, delete, or_, tuple_,
+)
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.core.cache import TTLCache
+from app.models.role import AuditLog
+from app.models.user import User
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+AUDIT_TABLE = AuditLog.__tablename__
+DEFAULT_PARTITION = f"{AUDIT_TABLE}_default"
+_PARTITION_RE = re.compile(rf"^{AUDIT_TABLE}_(\d{{4}})_(\d{{2}})$")
+_MANIFEST = "manifest.json"
+
+
+# ── Meses ─────────────────────────────────────────────────────────────────────
+
+def month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+def add_months(month: datetime, n: int) -> datetime:
+    years, index = divmod(month.month - 1 + n, 12)
+    return datetime(month.year + years, index + 1, 1)
+
+def partition_name(month: datetime) -> str:
+    return f"{AUDIT_TABLE}_{month.year:04d}_{month.month:02d}"
+
+def partition_month(name: str) -> Optional[datetime]:
+    match = _PARTITION_RE.match(name)
+    return datetime(int(match[1]), int(match[2]), 1) if match else None
+
+def _overlaps(month: datetime, date_from: Optional[datetime], date_to: Optional[datetime]) -> bool:
+    if date_from and add_months(month, 1) <= date_from:
+        return False
+    if date_to and month > date_to:
+        return False
+    return True
+
+def archive_cutoff(now: Optional[datetime] = None) -> datetime:
+    """Primer mes que se conserva en la BD; los anteriores se archivan."""
+    return add_months(month_start(now or datetime.utcnow()), -settings.AUDIT_HOT_MONTHS)
+
+
+# ── Tablas ────────────────────────────────────────────────────────────────────
+
+_tables: dict[str, Table] = {}
+
+def _audit_table(name: str) -> Table:
+    """Table Core con las columnas de AuditLog (sin FKs) para una partición/mes."""
+    if name == AUDIT_TABLE:
+        return AuditLog.__table__
+    if name not in _tables:
+        _tables[name] = Table(
+            name, MetaData(),
+            *[Column(c.name, c.type, primary_key=c.primary_key, nullable=c.nullable)
+              for c in AuditLog.__table__.columns],
+            Index(f"ix_{name}_created_id", "created_at", "id"),
+        )
+    return _tables[name]
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+def _is_partitioned(db: Session) -> bool:
+    return bool(db.execute(text(
+        "SELECT 1 FROM pg_partitioned_table pt "
+        "JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = :name"
+    ), {"name": AUDIT_TABLE}).first())
+
+def _monthly_tables(db: Session) -> list[str]:
+    """Tablas/particiones mensuales existentes, de la más nueva a la más vieja."""
+    if _is_postgres(db):
+        names = db.execute(text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent WHERE p.relname = :name"
+        ), {"name": AUDIT_TABLE}).scalars().all()
+    else:
+        names = inspect(db.connection()).get_table_names()
+    return sorted((n for n in names if partition_month(n)), reverse=True)
+
+
+# ── Particiones (Postgres) ────────────────────────────────────────────────────
+# La conversión de `audit_logs` en tabla particionada es la migración 0010.
+# Aquí solo se crean las particiones mensuales que falten: al iniciar cada
+# worker (utils.bootstrap) y, en el camino de escritura, la primera vez que
+# un proceso escribe en un mes nuevo.
+
+# Clave del advisory lock (de transacción) que serializa la creación
+_PARTITION_LOCK_KEY = 0x616C746F5F70
+# Mes en el que este proceso verificó las particiones por última vez; None
+# si no aplica (SQLite, tabla sin particionar) o aún no se verificó
+_partitions_checked: Optional[datetime] = None
+
+def _has_default_partition(db: Session) -> bool:
+    return bool(db.execute(text("SELECT to_regclass(:name)"), {"name": DEFAULT_PARTITION}).scalar())
+
+def _create_pg_partition(db: Session, month: datetime) -> None:
+    name = partition_name(month)
+    bounds = f"FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+    in_month = {"start": month, "end": add_months(month, 1)}
+    stranded = _has_default_partition(db) and db.execute(text(
+        f"SELECT 1 FROM {DEFAULT_PARTITION} WHERE created_at >= :start AND created_at < :end LIMIT 1"
+    ), in_month).first()
+    if not stranded:
+        db.execute(text(f"CREATE TABLE {name} PARTITION OF {AUDIT_TABLE} FOR VALUES {bounds}"))
+        return
+    # El mes ya tiene filas en DEFAULT y PARTITION OF fallaría: la partición
+    # se crea suelta, recibe esas filas y se adjunta
+    db.execute(text(f"CREATE TABLE {name} (LIKE {AUDIT_TABLE} INCLUDING ALL)"))
+    db.execute(text(
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+        f"WHERE created_at >= :start AND created_at < :end RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved"
+    ), in_month)
+    db.execute(text(f"ALTER TABLE {AUDIT_TABLE} ATTACH PARTITION {name} FOR VALUES {bounds}"))
+
+def ensure_audit_partitions(
+    db: Session, now: Optional[datetime] = None, since: Optional[datetime] = None,
+) -> list[str]:
+    """
+    Postgres: crea las particiones que falten desde `since` (por defecto el
+    mes en curso) hasta AUDIT_PARTITIONS_AHEAD meses adelante, y la DEFAULT.
+    Idempotente y seguro entre procesos. Hace commit si crea algo. Retorna
+    las particiones creadas. En SQLite no hace nada.
+    """
+    global _partitions_checked
+    if not _is_postgres(db) or not _is_partitioned(db):
+        return []
+    current = month_start(now or datetime.utcnow())
+    month = month_start(since) if since and since < current else current
+    wanted = []
+    while month <= add_months(current, settings.AUDIT_PARTITIONS_AHEAD):
+        wanted.append(month)
+        month = add_months(month, 1)
+
+    created = []
+    existing = set(_monthly_tables(db))
+    if any(partition_name(m) not in existing for m in wanted) or not _has_default_partition(db):
+        db.execute(text("SELECT pg_advisory_xact_lock(:k)"), {"k": _PARTITION_LOCK_KEY})
+        # Otro proceso pudo crearlas mientras esperábamos el lock
+        existing = set(_monthly_tables(db))
+        for month in wanted:
+            if partition_name(month) not in existing:
+                _create_pg_partition(db, month)
+                created.append(partition_name(month))
+        db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {AUDIT_TABLE} DEFAULT"
+        ))
+        db.commit()
+        if created:
+            logger.info("Particiones de auditoría creadas: %s", ", ".join(created))
+    else:
+        db.rollback()
+    _partitions_checked = current
+    return created
+
+def ensure_partitions_for(when: datetime) -> None:
+    """
+    Camino de escritura: la primera fila de un mes nuevo en este proceso
+    verifica las particiones de los meses siguientes, en su propia
+    transacción. Sin costo en SQLite ni mientras no cambie el mes.
+    """
+    if _partitions_checked is None or month_start(when) <= _partitions_checked:
+        return
+    from app.database import SessionLocal
+    db = SessionLocal()
+    try:
+        # No esperar locks de la tabla padre: si no se puede ahora, la fila
+        # va a la partición del mes (ya existe) y el siguiente write reintenta
+        db.execute(text("SET LOCAL lock_timeout = '2s'"))
+        ensure_audit_partitions(db, now=when)
+    except Exception:
+        db.rollback()
+        logger.warning("No se pudieron crear las particiones de auditoría", exc_info=True)
+    finally:
+        db.close()
+
+def rotate_audit_logs(db: Session, now: Optional[datetime] = None) -> int:
+    """
+    SQLite: mueve los meses cerrados de `audit_logs` a su tabla mensual.
+    Postgres: asegura las particiones de los próximos meses.
+    Retorna cuántas filas se movieron.
+    """
+    now = now or datetime.utcnow()
+    if _is_postgres(db):
+        ensure_audit_partitions(db, now)
+        return 0
+
+    hot = AuditLog.__table__
+    current = month_start(now)
+    oldest = db.execute(select(func.min(hot.c.created_at)).where(hot.c.created_at < current)).scalar()
+    moved = 0
+    month = month_start(oldest) if oldest else current
+    while month < current:
+        end = add_months(month, 1)
+        in_month = (hot.c.created_at >= month) & (hot.c.created_at < end)
+        target = _audit_table(partition_name(month))
+        target.create(db.connection(), checkfirst=True)
+        result = db.execute(insert(target).from_select(
+            [c.name for c in hot.columns], select(*hot.columns).where(in_month)
+        ))
+        db.execute(delete(hot).where(in_month))
+        moved += result.rowcount or 0
+        month = end
+    db.commit()
+    return moved
+
+
+# ── Archivo frío ──────────────────────────────────────────────────────────────
+
+def _archive_dir() -> Path:
+    return Path(settings.AUDIT_ARCHIVE_DIR)
+
+def _read_manifest() -> dict:
+    path = _archive_dir() / _MANIFEST
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+def _write_manifest(manifest: dict) -> None:
+    path = _archive_dir() / _MANIFEST
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True))
+    os.replace(tmp, path)
+
+def _serialize(row: dict) -> str:
+    return json.dumps({
+        k: (v.isoformat() if isinstance(v, datetime) else v) for k, v in row.items()
+    })
+
+def _deserialize(line: str) -> dict:
+    row = json.loads(line)
+    if row.get("created_at"):
+        row["created_at"] = datetime.fromisoformat(row["created_at"])
+    return row
+
+# Campos con conteo por valor en el índice de cada archivo
+_INDEXED_FIELDS = ("action", "entity_type", "user_id", "business_id")
+
+def _index_key(value) -> str:
+    return "null" if value is None else str(value)
+
+def _file_index(rows: Iterable[dict]) -> dict:
+    """
+    Resumen de un archivo del manifiesto: rango de fechas y conteo por valor
+    de cada campo filtrable. Permite saltar archivos sin descomprimirlos y
+    contar sin leerlos cuando el filtro es de un solo campo.
+    """
+    index = {"min": None, "max": None, **{field: {} for field in _INDEXED_FIELDS}}
+    for row in rows:
+        stamp = row["created_at"].isoformat()
+        index["min"] = stamp if index["min"] is None else min(index["min"], stamp)
+        index["max"] = stamp if index["max"] is None else max(index["max"], stamp)
+        for field in _INDEXED_FIELDS:
+            counts = index[field]
+            key = _index_key(row[field])
+            counts[key] = counts.get(key, 0) + 1
+    return index
+
+def _dump_month(rows: list[dict], month: datetime, manifest: dict) -> Path:
+    """Escribe las filas de un mes en un .jsonl.gz nuevo (tmp + rename)."""
+    directory = _archive_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    key = f"{month:%Y-%m}"
+    entry = manifest.setdefault(key, {"files": {}})
+    base = partition_name(month)
+    name = f"{base}.jsonl.gz" if not entry["files"] else f"{base}.{len(entry['files'])}.jsonl.gz"
+    tmp = directory / f"{name}.tmp"
+    with gzip.open(tmp, "wt", encoding="utf-8") as fh:
+        for row in rows:
+            fh.write(_serialize(row) + "\n")
+    os.replace(tmp, directory / name)
+    entry["files"][name] = len(rows)
+    entry.setdefault("index", {})[name] = _file_index(rows)
+    return directory / name
+
+def _archive_range(db: Session, table: Table, before: datetime, manifest: dict) -> int:
+    """Archiva por mes las filas de `table` anteriores a `before` y las borra."""
+    archived = 0
+    oldest = db.execute(select(func.min(table.c.created_at)).where(table.c.created_at < before)).scalar()
+    month = month_start(oldest) if oldest else before
+    while month < before:
+        end = add_months(month, 1)
+        in_month = (table.c.created_at >= month) & (table.c.created_at < end)
+        rows = [dict(r) for r in db.execute(
+            select(table).where(in_month).order_by(table.c.created_at, table.c.id)
+        ).mappings()]
+        if rows:
+            _dump_month(rows, month, manifest)
+            db.execute(delete(table).where(in_month))
+            archived += len(rows)
+        month = end
+    return archived
+
+def archive_audit_logs(db: Session, now: Optional[datetime] = None) -> dict:
+    """
+    Job de mantenimiento: rota, vuelca a disco los meses anteriores a
+    `archive_cutoff` y los elimina de la BD. Idempotente; pensado para
+    correr a diario.
+    """
+    now = now or datetime.utcnow()
+    moved = rotate_audit_logs(db, now)
+    cutoff = archive_cutoff(now)
+    manifest = _read_manifest()
+    archived = 0
+    dropped = []
+
+    for name in _monthly_tables(db):
+        month = partition_month(name)
+        if month >= cutoff:
+            continue
+        table = _audit_table(name)
+        archived += _archive_range(db, table, add_months(month, 1), manifest)
+        if _is_postgres(db):
+            db.execute(text(f"ALTER TABLE {AUDIT_TABLE} DETACH PARTITION {name}"))
+        db.execute(text(f"DROP TABLE {name}"))
+        _tables.pop(name, None)
+        dropped.append(name)
+
+    # Filas viejas fuera de una tabla mensual (partición DEFAULT, tabla sin particionar)
+    archived += _archive_range(db, AuditLog.__table__, cutoff, manifest)
+
+    _write_manifest(manifest)
+    db.commit()
+    return {"rotated": moved, "archived": archived, "dropped_tables": dropped,
+            "cutoff": cutoff}
+
+def _archived_months(date_from: Optional[datetime], date_to: Optional[datetime]) -> list[tuple[datetime, dict]]:
+    months = []
+    for key, entry in _read_manifest().items():
+        month = datetime.strptime(key, "%Y-%m")
+        if _overlaps(month, date_from, date_to):
+            months.append((month, entry))
+    return sorted(months, key=lambda m: m[0], reverse=True)
+
+def _read_file(name: str) -> Iterable[dict]:
+    with gzip.open(_archive_dir() / name, "rt", encoding="utf-8") as fh:
+        for line in fh:
+            yield _deserialize(line)
+
+def _archived_files(entry: dict, may_match) -> list[tuple[str, dict]]:
+    """(archivo, índice) del mes que pueden tener filas."""
+    return [(name, entry["index"][name]) for name in entry["files"] if may_match(entry["index"][name])]
+
+
+# ── Consulta unificada ────────────────────────────────────────────────────────
+
+class AuditPage(NamedTuple):
+    items: list[dict]
+    total: Optional[int]
+    total_is_estimate: bool
+    next_cursor: Optional[tuple[datetime, int]]
+
+
+# Totales por combinación de filtros (modo "estimated")
+_count_cache = TTLCache(maxsize=1024, ttl=settings.AUDIT_COUNT_CACHE_SECONDS)
+
+def _hot_tables(db: Session, date_from: Optional[datetime], date_to: Optional[datetime]) -> list[Table]:
+    tables = [AuditLog.__table__]
+    if not _is_postgres(db):
+        # En Postgres la poda la hace el planner sobre la tabla padre
+        tables += [
+            _audit_table(name) for name in _monthly_tables(db)
+            if _overlaps(partition_month(name), date_from, date_to)
+        ]
+    return tables
+
+def _planner_estimate(db: Session, stmt) -> int:
+    """Filas estimadas por el planner de Postgres para `stmt` (sin ejecutarlo)."""
+    compiled = stmt.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True})
+    plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+def query_audit_logs(
+    db: Session,
+    *,
+    search: Optional[str] = None,
+    action: Optional[str] = None,
+    entity_type: Optional[str] = None,
+    user_id: Optional[int] = None,
+    business_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    cursor: Optional[tuple[datetime, int]] = None,
+    offset: int = 0,
+    limit: int = 50,
+    count: str = "none",
+) -> AuditPage:
+    """
+    Página de registros (más recientes primero) sobre datos calientes y
+    archivados. Solo se leen las tablas y archivos cuyo mes cae en
+    [date_from, date_to]. Cada fila incluye `user_email`.
+
+    Con `cursor` (created_at, id de la última fila vista) la página se
+    resuelve por índice sin OFFSET; `offset` queda para compatibilidad.
+    `count`: "exact", "estimated" (planner en Postgres / caché en SQLite) o
+    "none".
+    """
+    term = f"%{search.lower()}%" if search else None
+    needle = search.lower() if search else None
+    users = User.__table__
+
+    def hot_select(table: Table, keyset: bool):
+        stmt = select(*table.columns)
+        if term:
+            stmt = stmt.join(users, table.c.user_id == users.c.id).where(or_(
+                users.c.email.ilike(term), table.c.action.ilike(term), table.c.entity_type.ilike(term),
+            ))
+        if action:
+            stmt = stmt.where(table.c.action == action)
+        if entity_type:
+            stmt = stmt.where(table.c.entity_type == entity_type)
+        if user_id:
+            stmt = stmt.where(table.c.user_id == user_id)
+        if business_id:
+            stmt = stmt.where(table.c.business_id == business_id)
+        if date_from:
+            stmt = stmt.where(table.c.created_at >= date_from)
+        if date_to:
+            stmt = stmt.where(table.c.created_at <= date_to)
+        if keyset and cursor:
+            # Comparación de fila: usa el índice (created_at, id) como rango
+            stmt = stmt.where(tuple_(table.c.created_at, table.c.id) < tuple_(*cursor))
+        return stmt
+
+    tables = _hot_tables(db, date_from, date_to)
+
+    def hot_query(keyset: bool):
+        if len(tables) == 1:
+            return hot_select(tables[0], keyset)
+        return select(union_all(*(hot_select(t, keyset) for t in tables)).subquery())
+
+    # El total ignora el cursor: es el mismo para todas las páginas
+    hot_stmt = hot_query(keyset=False)
+    page_stmt = hot_query(keyset=True)
+    cols = page_stmt.selected_columns
+    page_stmt = page_stmt.order_by(cols.created_at.desc(), cols.id.desc()).limit(limit)
+    if not cursor:
+        page_stmt = page_stmt.offset(offset)
+    rows = [dict(r) for r in db.execute(page_stmt).mappings()]
+
+    hot_total = None
+    def count_hot() -> int:
+        nonlocal hot_total
+        if hot_total is None:
+            hot_total = db.execute(select(func.count()).select_from(hot_stmt.subquery())).scalar()
+        return hot_total
+
+    # Archivo frío: siempre más antiguo que lo caliente, va a continuación
+    matching_users = None
+    if term:
+        matching_users = set(db.execute(
+            select(users.c.id).where(users.c.email.ilike(term))
+        ).scalars())
+
+    def matches(row: dict) -> bool:
+        if term and not (
+            row["user_id"] in matching_users
+            or needle in (row["action"] or "").lower()
+            or needle in (row["entity_type"] or "").lower()
+        ):
+            return False
+        return (
+            (not action or row["action"] == action)
+            and (not entity_type or row["entity_type"] == entity_type)
+            and (not user_id or row["user_id"] == user_id)
+            and (not business_id or row["business_id"] == business_id)
+            and (not date_from or row["created_at"] >= date_from)
+            and (not date_to or row["created_at"] <= date_to)
+        )
+
+    # Índice de cada archivo: descarta archivos sin filas del filtro y cuenta
+    # sin leerlos cuando hay un solo filtro de igualdad
+    equal_filters = [
+        (field, value)
+        for field, value in zip(_INDEXED_FIELDS, (action, entity_type, user_id, business_id))
+        if value
+    ]
+
+    def may_match(index: dict, keyset: bool = False) -> bool:
+        if date_from and datetime.fromisoformat(index["max"]) < date_from:
+            return False
+        if date_to and datetime.fromisoformat(index["min"]) > date_to:
+            return False
+        if keyset and cursor and datetime.fromisoformat(index["min"]) > cursor[0]:
+            return False
+        if any(_index_key(value) not in index[field] for field, value in equal_filters):
+            return False
+        if term:
+            return (
+                any(_index_key(u) in index["user_id"] for u in matching_users)
+                or any(needle in value.lower() for value in index["action"])
+                or any(needle in value.lower() for value in index["entity_type"])
+            )
+        return True
+
+    def count_file(name: str, index: dict, file_rows: int) -> int:
+        whole_file = (
+            (not date_from or datetime.fromisoformat(index["min"]) >= date_from)
+            and (not date_to or datetime.fromisoformat(index["max"]) <= date_to)
+        )
+        if whole_file and not term and not equal_filters:
+            return file_rows
+        if whole_file and not term and len(equal_filters) == 1:
+            field, value = equal_filters[0]
+            return index[field].get(_index_key(value), 0)
+        return sum(1 for r in _read_file(name) if matches(r))
+
+    archived = _archived_months(date_from, date_to)
+    if len(rows) < limit and archived:
+        # Si la página ya trajo filas calientes, el OFFSET quedó consumido
+        skip = 0 if cursor or rows else max(0, offset - count_hot())
+        for month, entry in archived:
+            if cursor and month > cursor[0]:
+                continue
+            month_rows = [
+                r
+                for name, _ in _archived_files(entry, lambda index: may_match(index, keyset=True))
+                for r in _read_file(name)
+                if matches(r) and (not cursor or (r["created_at"], r["id"]) < cursor)
+            ]
+            month_rows.sort(key=lambda r: (r["created_at"], r["id"]), reverse=True)
+            rows.extend(month_rows[skip:skip + limit - len(rows)])
+            skip = max(0, skip - len(month_rows))
+            if len(rows) >= limit:
+                break
+
+    total, estimated = None, False
+    if count != "none":
+        def archived_total() -> int:
+            return sum(
+                count_file(name, index, entry["files"][name])
+                for _, entry in archived
+                for name, index in _archived_files(entry, may_match)
+            )
+
+        if count == "estimated":
+            key = (search, action, entity_type, user_id, business_id, date_from, date_to)
+            total = _count_cache.get(key)
+            if total is None:
+                hot_part = _planner_estimate(db, hot_stmt) if _is_postgres(db) else count_hot()
+                total = hot_part + archived_total()
+                _count_cache.set(key, total)
+            estimated = True
+        else:
+            total = count_hot() + archived_total()
+
+    user_ids = {r["user_id"] for r in rows}
+    emails = dict(db.execute(
+        select(users.c.id, users.c.email).where(users.c.id.in_(user_ids))
+    ).all()) if user_ids else {}
+    for r in rows:
+        r["user_email"] = emails.get(r["user_id"])
+
+    next_cursor = (rows[-1]["created_at"], rows[-1]["id"]) if len(rows) == limit else None
+    return AuditPage(rows, total, estimated, next_cursor)
@@ -0,0 +1,174 @@
+"""
+Preparación de la BD al arrancar: migraciones (Alembic) y seeders.
+
+Cada worker llama a `prepare_database()`. El camino normal (esquema en
+`head` y seeders al día) son dos consultas y no toma ningún lock (en
+Postgres, más la verificación de las particiones de auditoría). Si hay
+trabajo pendiente, un lock entre procesos (advisory lock en Postgres,
+archivo en SQLite) hace que lo haga un solo worker; los demás esperan y al
+entrar encuentran todo listo.
+"""
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect, select, text
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, engine
+from app.models.system_settings import AppMeta
+from app.utils import seeder
+from app.utils.audit_archive import ensure_audit_partitions
+from app.utils.product_search import ensure_search_index
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+# Revisión cuyo esquema es el que creaba `create_all` antes de Alembic
+BASELINE_REVISION = "0001"
+
+# Clave del advisory lock de Postgres (cualquier bigint fijo)
+_STARTUP_LOCK_KEY = 0x616C746F5F76
+
+# Subir al cambiar la lógica de los seeders sin cambiar sus datos
+SEED_LOGIC_VERSION = 1
+SEED_FINGERPRINT_KEY = "seed_fingerprint"
+
+
+# ── Lock entre procesos ───────────────────────────────────────────────────────
+
+@contextmanager
+def startup_lock():
+    """Serializa el trabajo de arranque entre workers de la misma BD."""
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as conn:
+            conn.execute(text("SELECT pg_advisory_lock(:k)"), {"k": _STARTUP_LOCK_KEY})
+            try:
+                yield
+            finally:
+                conn.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": _STARTUP_LOCK_KEY})
+                conn.commit()
+        return
+
+    database = engine.url.database
+    if fcntl is None or not database or database == ":memory:":
+        # BD en memoria: un solo proceso la ve
+        yield
+        return
+    with open(f"{database}.startup.lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+# ── Migraciones ───────────────────────────────────────────────────────────────
+
+def _alembic_config() -> Config:
+    return Config(str(ALEMBIC_INI))
+
+def _head_revisions(cfg: Config) -> set:
+    return set(ScriptDirectory.from_config(cfg).get_heads())
+
+def _current_revisions(db: Session) -> set:
+    return set(MigrationContext.configure(db.connection()).get_current_heads())
+
+def migrate(db: Session, cfg: Config) -> str:
+    """
+    Lleva el esquema a `head`. Una BD creada antes de Alembic (con
+    `create_all`) tiene el esquema de la migración inicial: se marca en
+    BASELINE_REVISION y recibe el resto de las migraciones como cualquier otra.
+    """
+    if _current_revisions(db):
+        action = "upgrade"
+    elif inspect(db.connection()).has_table("users"):
+        action = "stamp"
+    else:
+        action = "create"
+
+    cfg.attributes["connection"] = db.connection()
+    if action == "stamp":
+        command.stamp(cfg, BASELINE_REVISION)
+    command.upgrade(cfg, "head")
+    db.commit()
+    if ensure_search_index(db):
+        db.commit()
+    return action
+
+
+# ── Seeders ───────────────────────────────────────────────────────────────────
+
+def seed_fingerprint() -> str:
+    """Huella de los datos semilla: si no cambia, los seeders no tienen nada que hacer."""
+    payload = json.dumps(
+        [SEED_LOGIC_VERSION, seeder.PERMISSIONS_DATA, seeder.DEFAULT_SETTINGS],
+        sort_keys=True, ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def _stored_fingerprint(db: Session):
+    # Core (no ORM): no dispara la configuración de mappers dentro del lock
+    meta = AppMeta.__table__
+    return db.execute(
+        select(meta.c.value).where(meta.c.key == SEED_FINGERPRINT_KEY)
+    ).scalar()
+
+def seed(db: Session, fingerprint: str) -> None:
+    seeder.run_all_seeders(db)
+    db.merge(AppMeta(key=SEED_FINGERPRINT_KEY, value=fingerprint))
+    db.commit()
+
+
+# ── Arranque ──────────────────────────────────────────────────────────────────
+
+def _is_up_to_date(db: Session, heads: set, fingerprint: str) -> bool:
+    if _current_revisions(db) != heads:
+        return False
+    return _stored_fingerprint(db) == fingerprint
+
+def prepare_database() -> dict:
+    """Migraciones + seeders, una sola vez entre todos los workers. Retorna tiempos (ms)."""
+    started = time.perf_counter()
+    cfg = _alembic_config()
+    heads = _head_revisions(cfg)
+    fingerprint = seed_fingerprint()
+    timings = {"pid": os.getpid(), "migrate": None, "seed": None}
+
+    db = SessionLocal()
+    try:
+        up_to_date = _is_up_to_date(db, heads, fingerprint)
+        db.rollback()
+        if not up_to_date:
+            wait_start = time.perf_counter()
+            with startup_lock():
+                timings["lock_wait"] = round((time.perf_counter() - wait_start) * 1000, 1)
+                # Otro worker pudo terminar mientras esperábamos
+                if _current_revisions(db) != heads:
+                    t0 = time.perf_counter()
+                    timings["schema"] = migrate(db, cfg)
+                    timings["migrate"] = round((time.perf_counter() - t0) * 1000, 1)
+                if _stored_fingerprint(db) != fingerprint:
+                    t0 = time.perf_counter()
+                    seed(db, fingerprint)
+                    timings["seed"] = round((time.perf_counter() - t0) * 1000, 1)
+                db.rollback()
+        # Postgres: particiones de auditoría de este mes y los siguientes. Es
+        # una consulta al catálogo; si faltan, las crea con su propio lock
+        ensure_audit_partitions(db)
+    finally:
+        db.close()
+
+    timings["total"] = round((time.perf_counter() - started) * 1000, 1)
+    print(f"⏱️  Arranque de BD en {timings['total']} ms — {timings}")
+    return timings
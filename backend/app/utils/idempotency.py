@@ -0,0 +1,141 @@
+"""
+Cabecera `Idempotency-Key` para endpoints que crean dinero o stock.
+
+Un terminal que reintenta tras un timeout manda la misma clave; si la
+primera petición ya se aplicó, se devuelve la respuesta guardada sin volver
+a ejecutar el endpoint (una búsqueda por clave primaria).
+
+La clave se reserva con un INSERT al inicio, en la misma transacción que el
+endpoint, y la respuesta se guarda en esa fila antes del commit:
+- Si el endpoint falla (4xx/5xx) hay rollback y la clave queda libre, así
+  que los errores no se memorizan.
+- Dos peticiones simultáneas con la misma clave chocan en la clave
+  primaria; la segunda espera a que la primera confirme y devuelve su
+  respuesta.
+"""
+import hashlib
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import Depends, Header, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_active_user
+from app.config import get_settings
+from app.models.system_settings import IdempotencyKey
+from app.models.user import User
+
+settings = get_settings()
+
+_last_purge = 0.0
+
+
+def purge_expired(db: Session) -> int:
+    """Borra las claves vencidas (usa ix_idempotency_keys_expires)."""
+    return db.execute(
+        delete(IdempotencyKey).where(IdempotencyKey.expires_at < datetime.utcnow())
+    ).rowcount
+
+
+def _maybe_purge(db: Session) -> None:
+    global _last_purge
+    now = time.monotonic()
+    if now - _last_purge >= settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS:
+        _last_purge = now
+        purge_expired(db)
+
+
+class IdempotencyGuard:
+    """Se obtiene con `Depends(idempotency)`. Sin cabecera no hace nada."""
+
+    def __init__(self, key: Optional[str], user_id: int, path: str):
+        self.key = key
+        self.user_id = user_id
+        self.path = path
+        self._claimed = False
+
+    def _request_hash(self, payload: BaseModel) -> str:
+        body = json.dumps(jsonable_encoder(payload), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(f"{self.path}\n{body}".encode()).hexdigest()
+
+    def _stored(self, db: Session):
+        return db.execute(select(
+            IdempotencyKey.request_hash, IdempotencyKey.status_code,
+            IdempotencyKey.response_body, IdempotencyKey.expires_at,
+        ).where(
+            IdempotencyKey.user_id == self.user_id,
+            IdempotencyKey.key == self.key,
+        )).first()
+
+    def _replay(self, row, request_hash: str) -> JSONResponse:
+        if row.request_hash != request_hash:
+            raise HTTPException(422, "Idempotency-Key ya usada con otra petición")
+        if row.status_code is None:
+            # Solo pasa si la BD no bloquea al insertar la misma clave
+            raise HTTPException(409, "Hay una petición en curso con esta Idempotency-Key")
+        return JSONResponse(
+            content=json.loads(row.response_body),
+            status_code=row.status_code,
+            headers={"Idempotent-Replayed": "true"},
+        )
+
+    def begin(self, db: Session, payload: BaseModel) -> Optional[JSONResponse]:
+        """
+        Llamar antes de cualquier escritura. Retorna la respuesta a devolver
+        si la petición ya se procesó; si no, reserva la clave y retorna None.
+        """
+        if self.key is None:
+            return None
+        request_hash = self._request_hash(payload)
+
+        row = self._stored(db)
+        if row is not None:
+            if row.expires_at > datetime.utcnow():
+                return self._replay(row, request_hash)
+            db.execute(delete(IdempotencyKey).where(
+                IdempotencyKey.user_id == self.user_id,
+                IdempotencyKey.key == self.key,
+            ))
+
+        _maybe_purge(db)
+        try:
+            db.add(IdempotencyKey(
+                user_id=self.user_id,
+                key=self.key,
+                request_hash=request_hash,
+                expires_at=datetime.utcnow() + timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS),
+            ))
+            db.flush()
+        except IntegrityError:
+            # Otra petición con la misma clave confirmó primero
+            db.rollback()
+            return self._replay(self._stored(db), request_hash)
+        self._claimed = True
+        return None
+
+    def save(self, db: Session, response, status_code: int = 200) -> None:
+        """Guarda la respuesta en la clave reservada; se confirma con el commit del endpoint."""
+        if not self._claimed:
+            return
+        db.execute(update(IdempotencyKey).where(
+            IdempotencyKey.user_id == self.user_id,
+            IdempotencyKey.key == self.key,
+        ).values(
+            status_code=status_code,
+            response_body=json.dumps(jsonable_encoder(response)),
+        ))
+
+
+def idempotency(
+    request: Request,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
+    current_user: User = Depends(get_current_active_user),
+) -> IdempotencyGuard:
+    return IdempotencyGuard(idempotency_key, current_user.id, request.url.path)
@@ -0,0 +1,45 @@
+import base64
+from datetime import datetime
+
+
+# ── Cursores opacos (keyset) ──────────────────────────────────────────────────
+#
+# Un cursor codifica la clave de orden de la última fila entregada
+# (created_at, id). La página siguiente filtra `(created_at, id) < cursor`
+# sobre el índice en vez de saltar filas con OFFSET. Los cursores hacia
+# atrás (`backward`) llevan la clave de la primera fila y piden las filas
+# más nuevas que ella.
+
+_BACKWARD = "prev"
+
+
+def encode_cursor(created_at: datetime, id_: int, backward: bool = False) -> str:
+    raw = f"{created_at.isoformat()}|{id_}"
+    if backward:
+        raw += f"|{_BACKWARD}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_parts(cursor: str) -> list[str]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return base64.urlsafe_b64decode(padded).decode().split("|")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Lanza ValueError si el cursor no es válido."""
+    try:
+        created_at, id_ = _decode_parts(cursor)
+        return datetime.fromisoformat(created_at), int(id_)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Cursor inválido") from e
+
+
+def decode_page_cursor(cursor: str) -> tuple[datetime, int, bool]:
+    """Como `decode_cursor`, más la dirección: (created_at, id, backward)."""
+    try:
+        parts = _decode_parts(cursor)
+        backward = parts[2:] == [_BACKWARD]
+        created_at, id_ = parts[:2] if backward else parts
+        return datetime.fromisoformat(created_at), int(id_), backward
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Cursor inválido") from e
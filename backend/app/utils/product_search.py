@@ -0,0 +1,231 @@
+"""
+Búsqueda de productos sin tildes, por prefijo y ordenada por relevancia.
+
+`product_search` guarda por producto activo su nombre y un documento (nombre,
+presentaciones activas y códigos de barras) normalizados: minúsculas y sin
+tildes, así "cafe" encuentra "Café" en cualquier motor sin depender de
+`unaccent`. Se reescribe con `index_products` en la misma transacción que
+cambia el producto o sus presentaciones.
+
+El índice depende del motor; lo crean las migraciones y `ensure_search_index`
+lo repone al iniciar si falta (idempotente):
+- SQLite: tabla FTS5 `product_search_fts` (contenido externo, triggers,
+  índices de prefijo de 2 y 3 letras para autocompletar) y búsqueda
+  `MATCH "tok"*` por cada palabra, ordenada por bm25 (el nombre del
+  producto pesa más que las presentaciones). `business_id` va en la tabla
+  FTS sin indexar para filtrar el negocio dentro del mismo MATCH.
+- Postgres: índice GIN de trigramas (pg_trgm) sobre `document` para el
+  `LIKE '%tok%'` de cada palabra, más `~ '\\mtok'` para que, como en SQLite,
+  cuente solo como inicio de palabra; ordenado por word_similarity con el
+  nombre y el documento.
+
+Reconstrucción completa (backfill o reparación):
+
+    python -m app.utils.product_search [--business ID]
+"""
+import re
+import unicodedata
+from typing import Iterable, Optional
+
+from sqlalchemy import column, delete, func, inspect, insert, literal_column, select, table, text
+from sqlalchemy.orm import Session
+
+from app.models.inventory import Product, ProductPresentation, ProductSearch
+
+SEARCH_FTS_TABLE = "product_search_fts"
+SEARCH_TRGM_INDEX = "ix_product_search_document_trgm"
+# Peso bm25 de (name, document) en SQLite
+_FTS_WEIGHTS = (5.0, 1.0)
+# Productos leídos por lote al reconstruir
+_REBUILD_BATCH = 1000
+
+_SQLITE_DDL = (
+    f"CREATE VIRTUAL TABLE {SEARCH_FTS_TABLE} USING fts5("
+    "name, document, business_id UNINDEXED, content='product_search', content_rowid='product_id',"
+    " tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    f"CREATE TRIGGER product_search_ai AFTER INSERT ON product_search BEGIN"
+    f" INSERT INTO {SEARCH_FTS_TABLE}(rowid, name, document, business_id)"
+    f" VALUES (new.product_id, new.name, new.document, new.business_id); END",
+    f"CREATE TRIGGER product_search_ad AFTER DELETE ON product_search BEGIN"
+    f" INSERT INTO {SEARCH_FTS_TABLE}({SEARCH_FTS_TABLE}, rowid, name, document, business_id)"
+    f" VALUES ('delete', old.product_id, old.name, old.document, old.business_id); END",
+    f"CREATE TRIGGER product_search_au AFTER UPDATE ON product_search BEGIN"
+    f" INSERT INTO {SEARCH_FTS_TABLE}({SEARCH_FTS_TABLE}, rowid, name, document, business_id)"
+    f" VALUES ('delete', old.product_id, old.name, old.document, old.business_id);"
+    f" INSERT INTO {SEARCH_FTS_TABLE}(rowid, name, document, business_id)"
+    f" VALUES (new.product_id, new.name, new.document, new.business_id); END",
+    f"INSERT INTO {SEARCH_FTS_TABLE}({SEARCH_FTS_TABLE}) VALUES ('rebuild')",
+)
+
+
+# ── Texto normalizado ─────────────────────────────────────────────────────────
+
+def normalize(value: Optional[str]) -> str:
+    """Minúsculas, sin tildes y con espacios simples: "Café  Molido" -> "cafe molido"."""
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", value)
+    plain = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(plain.lower().split())
+
+
+def search_tokens(term: Optional[str]) -> list[str]:
+    """Palabras del término de búsqueda (solo letras y números)."""
+    return [tok for tok in re.split(r"[^0-9a-z]+", normalize(term)) if tok]
+
+
+def _like_escape(value: str) -> str:
+    """Literal para LIKE ... ESCAPE '\\': `%` y `_` no actúan como comodines."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+# ── Escritura ─────────────────────────────────────────────────────────────────
+
+def _documents(db: Session, product_ids: Iterable[int]) -> list[dict]:
+    products = db.query(Product.id, Product.business_id, Product.name).filter(
+        Product.id.in_(product_ids),
+        Product.is_active == True,
+    ).all()
+    extra: dict[int, list[str]] = {}
+    for product_id, name, barcode in db.query(
+        ProductPresentation.product_id, ProductPresentation.name, ProductPresentation.barcode,
+    ).filter(
+        ProductPresentation.product_id.in_([p.id for p in products]),
+        ProductPresentation.is_active == True,
+    ).order_by(ProductPresentation.id):
+        extra.setdefault(product_id, []).extend(v for v in (name, barcode) if v)
+    return [
+        {
+            "product_id": product_id,
+            "business_id": business_id,
+            "name": normalize(name),
+            "document": normalize(" ".join([name, *extra.get(product_id, [])])),
+        }
+        for product_id, business_id, name in products
+    ]
+
+
+def index_products(db: Session, product_ids: Iterable[int]) -> None:
+    """Reescribe la entrada de búsqueda de estos productos (los inactivos salen)."""
+    product_ids = list(product_ids)
+    if not product_ids:
+        return
+    # La sesión no hace autoflush: las presentaciones recién agregadas deben
+    # estar en BD antes de leer el documento
+    db.flush()
+    db.execute(delete(ProductSearch).where(ProductSearch.product_id.in_(product_ids)))
+    rows = _documents(db, product_ids)
+    if rows:
+        db.execute(insert(ProductSearch), rows)
+
+
+def rebuild(db: Session, business_id: Optional[int] = None) -> int:
+    """Recalcula todas las entradas (o las de un negocio). No hace commit."""
+    scope = [Product.business_id == business_id] if business_id is not None else []
+    stale = delete(ProductSearch)
+    if business_id is not None:
+        stale = stale.where(ProductSearch.business_id == business_id)
+    db.execute(stale)
+    ids = [pid for (pid,) in db.query(Product.id).filter(Product.is_active == True, *scope).order_by(Product.id)]
+    written = 0
+    for start in range(0, len(ids), _REBUILD_BATCH):
+        rows = _documents(db, ids[start:start + _REBUILD_BATCH])
+        if rows:
+            db.execute(insert(ProductSearch), rows)
+        written += len(rows)
+    return written
+
+
+# ── Índice por motor ──────────────────────────────────────────────────────────
+
+def ensure_search_index(db: Session) -> bool:
+    """
+    Crea el índice de búsqueda del motor si falta y, si `product_search`
+    está vacía, la llena. Retorna True si creó algo.
+    """
+    conn = db.connection()
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        existing = {ix["name"] for ix in inspect(conn).get_indexes(ProductSearch.__tablename__)}
+        if SEARCH_TRGM_INDEX in existing:
+            return False
+        _fill_if_empty(db)
+        db.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        db.execute(text(
+            f"CREATE INDEX {SEARCH_TRGM_INDEX} ON product_search USING gin (document gin_trgm_ops)"
+        ))
+        return True
+    if dialect != "sqlite" or inspect(conn).has_table(SEARCH_FTS_TABLE):
+        return False
+    # Primero el contenido: la tabla FTS se arma de una vez con 'rebuild'
+    _fill_if_empty(db)
+    for statement in _SQLITE_DDL:
+        db.execute(text(statement))
+    return True
+
+
+def _fill_if_empty(db: Session) -> None:
+    if db.execute(select(ProductSearch.product_id).limit(1)).first() is None:
+        rebuild(db)
+
+
+# ── Consulta ──────────────────────────────────────────────────────────────────
+
+def search_hits(db: Session, business_id: int, term: str):
+    """
+    Subconsulta (product_id, rank) de los productos que contienen todas las
+    palabras de `term`, cada una como prefijo ("caf mol" -> "café molido");
+    menor rank = más relevante. None si el término no tiene palabras.
+    """
+    tokens = search_tokens(term)
+    if not tokens:
+        return None
+    if db.get_bind().dialect.name == "postgresql":
+        query = normalize(term)
+        rank = -(
+            2 * func.word_similarity(query, ProductSearch.name)
+            + func.word_similarity(query, ProductSearch.document)
+        )
+        # LIKE (con ESCAPE) usa el índice de trigramas; la expresión regular
+        # exige, como FTS5 en SQLite, que la palabra empiece ahí: "mol"
+        # encuentra "molido" pero no "gramol"
+        return select(
+            ProductSearch.product_id, rank.label("rank"),
+        ).where(
+            ProductSearch.business_id == business_id,
+            *[ProductSearch.document.like(f"%{_like_escape(tok)}%", escape="\\") for tok in tokens],
+            *[ProductSearch.document.regexp_match(rf"\m{re.escape(tok)}") for tok in tokens],
+        ).subquery()
+
+    # La palabra exacta también cuenta como término propio: en bm25 "cafe"
+    # queda por encima de "cafetera"
+    fts = table(SEARCH_FTS_TABLE, column("rowid"), column("business_id"))
+    match = " AND ".join(f'("{tok}" OR "{tok}"*)' for tok in tokens)
+    return select(
+        fts.c.rowid.label("product_id"),
+        func.bm25(literal_column(SEARCH_FTS_TABLE), *_FTS_WEIGHTS).label("rank"),
+    ).where(
+        literal_column(SEARCH_FTS_TABLE).op("MATCH")(match),
+        fts.c.business_id == business_id,
+    ).subquery()
+
+
+# ── Ejecución directa ─────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    import argparse
+
+    from app.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Reconstruye el índice de búsqueda de productos")
+    parser.add_argument("--business", type=int, default=None)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        ensure_search_index(db)
+        rows = rebuild(db, args.business)
+        db.commit()
+        print(f"✅ product_search reconstruido — {rows} productos")
+    finally:
+        db.close()
@@ -0,0 +1,193 @@
+"""
+Resumen diario de ventas (`sales_daily_rollup`) mantenido al escribir.
+
+Cada venta suma sus conteos y totales en la fila de su día local, bodega y
+vendedor con payment_method_id = 0, y lo cobrado con cada método en la fila
+de ese método. Anular la venta resta lo mismo y suma 1 a `cancelled_count`.
+Las escrituras son UPSERT relativos (`x = x + excluded.x`) dentro de la
+transacción de la venta: el resumen nunca ve una venta a medias y los
+tableros leen unas pocas filas por día en vez de recorrer las ventas.
+
+`created_at` se guarda en UTC; el día es la fecha local en
+settings.BUSINESS_TIMEZONE. `rebuild` recalcula un rango desde `sales`
+(backfill, reparación o cambio de zona horaria):
+
+    python -m app.utils.sales_rollup [--business ID] [--from AAAA-MM-DD] [--to AAAA-MM-DD]
+"""
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from functools import lru_cache
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.enums import SaleStatus
+from app.models.sale import Sale, SalePayment, SalesDailyRollup
+
+settings = get_settings()
+
+_KEY = ("business_id", "day", "warehouse_id", "seller_id", "payment_method_id")
+_MEASURES = ("sales_count", "cancelled_count", "total", "amount_credit", "amount")
+# Fila de la venta (conteos y totales); las demás son métodos de pago
+SALE_ROW = 0
+# Filas de `sales` leídas por lote al reconstruir
+_REBUILD_BATCH = 2000
+
+
+# ── Día local ─────────────────────────────────────────────────────────────────
+
+@lru_cache()
+def business_tz() -> ZoneInfo:
+    return ZoneInfo(settings.BUSINESS_TIMEZONE)
+
+
+def local_day(value: datetime) -> date:
+    """Fecha local de un datetime UTC sin tzinfo (como se guarda created_at)."""
+    return value.replace(tzinfo=timezone.utc).astimezone(business_tz()).date()
+
+
+def local_today() -> date:
+    return datetime.now(business_tz()).date()
+
+
+def day_bounds(first: date, last: date) -> tuple[datetime, datetime]:
+    """Rango UTC [inicio, fin) que cubre los días locales first..last."""
+    def utc(d: date) -> datetime:
+        start = datetime.combine(d, time.min, business_tz())
+        return start.astimezone(timezone.utc).replace(tzinfo=None)
+    return utc(first), utc(last + timedelta(days=1))
+
+
+# ── Escritura ─────────────────────────────────────────────────────────────────
+
+def _upsert(db: Session, deltas: dict[tuple, dict]) -> None:
+    if not deltas:
+        return
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    table = SalesDailyRollup.__table__
+    stmt = dialect_insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(_KEY),
+        set_={m: table.c[m] + stmt.excluded[m] for m in _MEASURES},
+    )
+    # Orden fijo de claves: dos transacciones no se bloquean en cruz
+    db.execute(stmt, [
+        {**dict(zip(_KEY, key)), **{m: values.get(m, 0) for m in _MEASURES}}
+        for key, values in sorted(deltas.items())
+    ])
+
+
+def _add(deltas: dict, base: tuple, method_id: int, **measures) -> None:
+    row = deltas.setdefault(base + (method_id,), {})
+    for name, value in measures.items():
+        row[name] = row.get(name, 0) + value
+
+
+def _sale_base(sale: Sale) -> tuple:
+    return sale.business_id, local_day(sale.created_at), sale.warehouse_id, sale.created_by
+
+
+def _sale_deltas(sale: Sale, sign: int) -> dict:
+    deltas = {}
+    base = _sale_base(sale)
+    _add(deltas, base, SALE_ROW,
+         sales_count=sign, total=sign * sale.total, amount_credit=sign * (sale.amount_credit or 0))
+    for payment in sale.payments:
+        _add(deltas, base, payment.payment_method_id, amount=sign * payment.amount)
+    return deltas
+
+
+def record_sale(db: Session, sale: Sale) -> None:
+    """Suma una venta recién registrada (con sus pagos cargados)."""
+    _upsert(db, _sale_deltas(sale, 1))
+
+
+def record_cancellation(db: Session, sale: Sale) -> None:
+    """Resta una venta anulada de su día y la cuenta como cancelada."""
+    deltas = _sale_deltas(sale, -1)
+    _add(deltas, _sale_base(sale), SALE_ROW, cancelled_count=1)
+    _upsert(db, deltas)
+
+
+# ── Reconstrucción ────────────────────────────────────────────────────────────
+
+def rebuild(
+    db: Session,
+    business_id: Optional[int] = None,
+    first: Optional[date] = None,
+    last: Optional[date] = None,
+) -> int:
+    """
+    Borra y recalcula el resumen (todo, o un negocio y/o rango de días
+    locales) leyendo `sales` por lotes. No hace commit. Retorna las filas
+    escritas.
+    """
+    rollup = SalesDailyRollup.__table__
+    rollup_scope, sales_scope = [], []
+    if business_id is not None:
+        rollup_scope.append(rollup.c.business_id == business_id)
+        sales_scope.append(Sale.business_id == business_id)
+    if first is not None:
+        rollup_scope.append(rollup.c.day >= first)
+        sales_scope.append(Sale.created_at >= day_bounds(first, first)[0])
+    if last is not None:
+        rollup_scope.append(rollup.c.day <= last)
+        sales_scope.append(Sale.created_at < day_bounds(last, last)[1])
+    db.execute(delete(rollup).where(*rollup_scope))
+
+    deltas: dict[tuple, dict] = {}
+    sales = db.execute(
+        select(
+            Sale.business_id, Sale.warehouse_id, Sale.created_by, Sale.created_at,
+            Sale.status, Sale.total, Sale.amount_credit,
+        ).where(Sale.status.in_([SaleStatus.COMPLETED, SaleStatus.CANCELLED]), *sales_scope)
+        .execution_options(yield_per=_REBUILD_BATCH)
+    )
+    for business, warehouse, seller, created_at, status, total, credit in sales:
+        base = (business, local_day(created_at), warehouse, seller)
+        if status == SaleStatus.CANCELLED:
+            _add(deltas, base, SALE_ROW, cancelled_count=1)
+        else:
+            _add(deltas, base, SALE_ROW, sales_count=1, total=total, amount_credit=credit or Decimal("0"))
+
+    payments = db.execute(
+        select(
+            Sale.business_id, Sale.warehouse_id, Sale.created_by, Sale.created_at,
+            SalePayment.payment_method_id, SalePayment.amount,
+        ).join(SalePayment, SalePayment.sale_id == Sale.id)
+        .where(Sale.status == SaleStatus.COMPLETED, *sales_scope)
+        .execution_options(yield_per=_REBUILD_BATCH)
+    )
+    for business, warehouse, seller, created_at, method_id, amount in payments:
+        _add(deltas, (business, local_day(created_at), warehouse, seller), method_id, amount=amount)
+
+    _upsert(db, deltas)
+    return len(deltas)
+
+
+# ── Ejecución directa ─────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    import argparse
+
+    from app.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Reconstruye sales_daily_rollup desde las ventas")
+    parser.add_argument("--business", type=int, default=None)
+    parser.add_argument("--from", dest="first", type=date.fromisoformat, default=None)
+    parser.add_argument("--to", dest="last", type=date.fromisoformat, default=None)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        rows = rebuild(db, args.business, args.first, args.last)
+        db.commit()
+        print(f"✅ sales_daily_rollup reconstruido — {rows} filas ({settings.BUSINESS_TIMEZONE})")
+    finally:
+        db.close()
@@ -1,8 +1,8 @@
 import sys, os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sqlalchemy.orm import Session
-from app.models.role import Permission
+from sqlalchemy.orm import Session, selectinload
+from app.models.role import Permission, BusinessRole, AuditLog, AuditVocabulary
 from app.models.system_settings import SystemSetting
 
 # ── Permissions ───────────────────────────────────────────────────────────────
@@ -151,11 +151,35 @@ def seed_default_settings(db: Session) -> int:
     return count
 
 
+def seed_role_permission_masks(db: Session) -> int:
+    """Compila permission_mask de roles creados antes de los bitmasks. Idempotente."""
+    roles = db.query(BusinessRole).options(selectinload(BusinessRole.permissions)).filter(
+        BusinessRole.permission_mask.is_(None)
+    ).all()
+    for role in roles:
+        role.refresh_permission_mask()
+    db.commit()
+    return len(roles)
+
+
+def seed_audit_vocabulary(db: Session) -> int:
+    """Llena audit_vocabulary desde el audit log existente. Solo si está vacía."""
+    if db.query(AuditVocabulary).first():
+        return 0
+    terms = {("action", a) for (a,) in db.query(AuditLog.action).distinct()}
+    terms |= {("entity_type", e) for (e,) in db.query(AuditLog.entity_type).distinct()}
+    db.add_all(AuditVocabulary(kind=k, value=v) for k, v in terms)
+    db.commit()
+    return len(terms)
+
+
 def run_all_seeders(db: Session) -> None:
     """Ejecuta todos los seeders en orden."""
     p = seed_permissions(db)
     s = seed_default_settings(db)
-    print(f"✅ Seeders completados — {p} permisos, {s} settings insertados.")
+    r = seed_role_permission_masks(db)
+    v = seed_audit_vocabulary(db)
+    print(f"✅ Seeders completados — {p} permisos, {s} settings insertados, {r} roles compilados, {v} términos de auditoría.")
 
 
 # ── Ejecución directa ─────────────────────────────────────────────────────────
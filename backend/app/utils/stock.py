@@ -0,0 +1,284 @@
+"""
+Mutaciones de stock sin carreras.
+
+Toda escritura sobre ProductStock es un UPDATE relativo
+(`quantity = quantity ± q`) que la BD aplica de forma atómica. Las salidas
+llevan además la condición `quantity >= q`: si dos cajeros venden las
+últimas unidades a la vez, el UPDATE del segundo no encuentra fila y la
+operación falla con InsufficientStock en vez de dejar stock negativo.
+
+Las filas se actualizan siempre en orden (warehouse_id, presentation_id).
+Como cada UPDATE bloquea su fila hasta el commit, un orden único evita que
+dos transacciones se esperen mutuamente (deadlock) en Postgres. En SQLite
+las escrituras ya se serializan por BD.
+
+El mismo UPDATE recalcula `is_low` (quantity <= min_stock de la
+presentación), así las alertas de stock bajo son una lectura indexada y no
+un recorrido del catálogo. Cambiar min_stock exige `refresh_low_stock`.
+
+Los lotes (ProductLot.remaining) se consumen FEFO — primero el que vence
+antes, y los que no vencen por orden de llegada (FIFO) — siempre después de
+descontar el ProductStock de la misma presentación/bodega, cuya fila ya
+bloqueada serializa a quienes consumen esos lotes.
+"""
+from decimal import Decimal
+from typing import Iterator, Mapping, NamedTuple, Optional
+
+from sqlalchemy import and_, bindparam, func, select, update
+from sqlalchemy.orm import Session
+
+from app.models.inventory import ProductLot, ProductPresentation, ProductStock
+
+# (presentation_id, warehouse_id) -> cantidad (+ entra, - sale)
+StockChanges = Mapping[tuple[int, int], Decimal]
+
+
+class InsufficientStock(Exception):
+    def __init__(self, presentation_id: int, warehouse_id: int, available: Decimal, requested: Decimal):
+        self.presentation_id = presentation_id
+        self.warehouse_id = warehouse_id
+        self.available = available
+        self.requested = requested
+        super().__init__(f"Stock insuficiente: disponible {available}, solicitado {requested}")
+
+
+def _insert_ignore(db: Session):
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    # Depende del índice único (presentation_id, warehouse_id)
+    return dialect_insert(ProductStock).on_conflict_do_nothing()
+
+
+def _lock_order(key: tuple[int, int]) -> tuple[int, int]:
+    presentation_id, warehouse_id = key
+    return warehouse_id, presentation_id
+
+
+def available_stock(db: Session, presentation_id: int, warehouse_id: int) -> Decimal:
+    quantity = db.execute(select(ProductStock.quantity).where(
+        ProductStock.presentation_id == presentation_id,
+        ProductStock.warehouse_id == warehouse_id,
+    )).scalar()
+    return quantity if quantity is not None else Decimal("0")
+
+
+def _is_low(quantity, min_stock):
+    min_stock = func.coalesce(min_stock, 0)
+    return and_(min_stock > 0, quantity <= min_stock)
+
+
+def _add_quantity(db: Session, key: tuple[int, int], quantity: Decimal) -> bool:
+    presentation_id, warehouse_id = key
+    min_stock = select(ProductPresentation.min_stock).where(
+        ProductPresentation.id == ProductStock.presentation_id,
+    ).scalar_subquery()
+    # Ambos SET leen los valores previos: is_low se calcula con la cantidad nueva
+    stmt = update(ProductStock).where(
+        ProductStock.presentation_id == presentation_id,
+        ProductStock.warehouse_id == warehouse_id,
+    ).values(
+        quantity=ProductStock.quantity + quantity,
+        is_low=_is_low(ProductStock.quantity + quantity, min_stock),
+    )
+    if quantity < 0:
+        stmt = stmt.where(ProductStock.quantity >= -quantity)
+    return db.execute(stmt).rowcount == 1
+
+
+def change_stock(db: Session, changes: StockChanges) -> None:
+    """
+    Aplica entradas y salidas en una sola pasada ordenada, todo o nada: si
+    alguna salida no tiene stock suficiente revierte las ya aplicadas (en la
+    misma transacción) y lanza InsufficientStock. Así el llamador puede
+    descartar solo esta operación sin hacer rollback de la transacción.
+    """
+    incoming = [key for key, quantity in changes.items() if quantity > 0]
+    if incoming:
+        db.execute(_insert_ignore(db), [
+            {"presentation_id": p, "warehouse_id": w, "quantity": 0} for p, w in incoming
+        ])
+
+    applied = []
+    for key in sorted(changes, key=_lock_order):
+        quantity = changes[key]
+        if _add_quantity(db, key, quantity):
+            applied.append(key)
+            continue
+        for done in applied:
+            _add_quantity(db, done, -changes[done])
+        presentation_id, warehouse_id = key
+        raise InsufficientStock(
+            presentation_id, warehouse_id,
+            available_stock(db, presentation_id, warehouse_id), -quantity,
+        )
+
+
+def refresh_low_stock(db: Session, presentation_id: int, min_stock: Optional[int]) -> None:
+    """Recalcula `is_low` en todas las bodegas al cambiar el min_stock."""
+    db.execute(update(ProductStock).where(
+        ProductStock.presentation_id == presentation_id,
+    ).values(is_low=ProductStock.quantity <= min_stock if min_stock and min_stock > 0 else False))
+
+
+def take_stock_upto(db: Session, presentation_id: int, warehouse_id: int, quantity: Decimal) -> Decimal:
+    """
+    Descuenta hasta `quantity` sin bajar de 0 (mermas automáticas).
+    Retorna lo descontado realmente.
+    """
+    while True:
+        available = db.execute(select(ProductStock.quantity).where(
+            ProductStock.presentation_id == presentation_id,
+            ProductStock.warehouse_id == warehouse_id,
+        ).with_for_update()).scalar() or Decimal("0")
+        deduct = min(quantity, available)
+        if deduct <= 0:
+            return Decimal("0")
+        try:
+            change_stock(db, {(presentation_id, warehouse_id): -deduct})
+            return deduct
+        except InsufficientStock:
+            # Otra transacción descontó entre la lectura y el UPDATE (SQLite
+            # no tiene FOR UPDATE): se reintenta con el nuevo disponible
+            continue
+
+
+# ── Lotes (FEFO / FIFO) ───────────────────────────────────────────────────────
+
+# Lotes leídos por consulta; casi siempre basta la primera página
+_LOT_PAGE = 8
+# Escala de SaleItem.unit_cost
+_UNIT_COST_QUANTUM = Decimal("0.0001")
+
+
+class LotAllocation(NamedTuple):
+    lot: ProductLot
+    quantity: Decimal
+
+
+def _fefo_queue(db: Session, presentation_id: int, warehouse_id: int) -> Iterator[ProductLot]:
+    """
+    Lotes con saldo en orden FEFO, por páginas. En Postgres el orden sale
+    directo de ix_product_lots_fefo_open (ASC deja los NULL al final); SQLite
+    ordena solo los lotes abiertos de esta presentación y bodega.
+    """
+    stmt = select(ProductLot).where(
+        ProductLot.presentation_id == presentation_id,
+        ProductLot.warehouse_id == warehouse_id,
+        ProductLot.remaining > 0,
+    ).order_by(
+        ProductLot.expiry_date.asc().nulls_last(), ProductLot.arrival_date, ProductLot.id,
+    ).limit(_LOT_PAGE).with_for_update()
+    offset = 0
+    while True:
+        # Sin autoflush: el saldo en BD no cambia entre páginas
+        page = db.execute(stmt.offset(offset)).scalars().all()
+        yield from page
+        if len(page) < _LOT_PAGE:
+            return
+        offset += _LOT_PAGE
+
+
+def allocate_lots(db: Session, requested: StockChanges) -> dict[tuple[int, int], list[LotAllocation]]:
+    """
+    Consume de los lotes abiertos, en orden FEFO, las cantidades pedidas por
+    (presentation_id, warehouse_id) y retorna de qué lotes salió cada una.
+    Llamar después de `change_stock` sobre las mismas claves. Si los lotes
+    no alcanzan (stock cargado sin lote) el resto queda sin asignar.
+    """
+    result = {}
+    consumed = []
+    for key in sorted(requested, key=_lock_order):
+        pending = requested[key]
+        allocations = []
+        for lot in _fefo_queue(db, *key):
+            take = min(pending, lot.remaining)
+            allocations.append(LotAllocation(lot, take))
+            consumed.append({"lot_id": lot.id, "take": take})
+            pending -= take
+            if pending <= 0:
+                break
+        result[key] = allocations
+
+    if consumed:
+        # Un solo executemany para todos los lotes
+        lots = ProductLot.__table__
+        db.execute(
+            update(lots).where(lots.c.id == bindparam("lot_id"))
+            .values(remaining=lots.c.remaining - bindparam("take")),
+            consumed,
+        )
+        for allocations in result.values():
+            for lot, _ in allocations:
+                db.expire(lot, ["remaining"])
+    return result
+
+
+def return_to_lots(db: Session, allocations: list[tuple[int, Decimal]]) -> None:
+    """Devuelve a sus lotes lo consumido (lot_id, cantidad), p. ej. al anular una venta."""
+    if not allocations:
+        return
+    lots = ProductLot.__table__
+    db.execute(
+        update(lots).where(lots.c.id == bindparam("lot_id"))
+        .values(remaining=lots.c.remaining + bindparam("amount"), is_active=True),
+        [{"lot_id": lot_id, "amount": quantity} for lot_id, quantity in sorted(allocations)],
+    )
+
+
+def average_lot_costs(db: Session, presentation_ids) -> dict[int, Decimal]:
+    """Costo promedio ponderado (por cantidad ingresada) de los lotes con costo."""
+    ids = set(presentation_ids)
+    if not ids:
+        return {}
+    rows = db.execute(select(
+        ProductLot.presentation_id,
+        func.sum(ProductLot.cost_per_unit * ProductLot.quantity),
+        func.sum(ProductLot.quantity),
+    ).where(
+        ProductLot.presentation_id.in_(ids),
+        ProductLot.cost_per_unit.isnot(None),
+        ProductLot.quantity > 0,
+    ).group_by(ProductLot.presentation_id)).all()
+    return {pid: Decimal(cost) / Decimal(units) for pid, cost, units in rows}
+
+
+def line_unit_cost(quantity: Decimal, allocations: list[LotAllocation], fallback: Optional[Decimal]) -> Optional[Decimal]:
+    """
+    Costo unitario de una línea: el de los lotes de los que salió; lo que no
+    salió de un lote con costo se valora a `fallback` (promedio de lotes).
+    """
+    known_units = Decimal("0")
+    known_cost = Decimal("0")
+    for lot, taken in allocations:
+        if lot.cost_per_unit is not None:
+            known_units += taken
+            known_cost += lot.cost_per_unit * taken
+    if quantity <= 0:
+        return None
+    if known_units < quantity and fallback is not None:
+        known_cost += (quantity - known_units) * fallback
+        known_units = quantity
+    if not known_units:
+        return None
+    return (known_cost / known_units).quantize(_UNIT_COST_QUANTUM)
+
+
+def split_allocations(allocations: list[LotAllocation], quantities: list[Decimal]) -> list[list[LotAllocation]]:
+    """Reparte lo asignado a una presentación entre sus líneas, en orden."""
+    queue = list(allocations)
+    result = []
+    for quantity in quantities:
+        line = []
+        while quantity > 0 and queue:
+            lot, available = queue[0]
+            take = min(quantity, available)
+            line.append(LotAllocation(lot, take))
+            quantity -= take
+            if take == available:
+                queue.pop(0)
+            else:
+                queue[0] = LotAllocation(lot, available - take)
+        result.append(line)
+    return result
@@ -0,0 +1,111 @@
+"""
+Utilidades comunes de los benchmarks (`python scripts/bench_*.py` desde
+backend/).
+
+Cada benchmark corre sobre una BD SQLite temporal propia, nunca sobre la del
+.env, salvo que se indique BENCH_DATABASE_URL (p. ej. un Postgres de
+pruebas). Las variables obligatorias que falten se completan con valores de
+prueba para poder correr sin .env.
+"""
+import os
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+_DEFAULT_ENV = {
+    "PROJECT_NAME": "alto-vivo-bench",
+    "VERSION": "bench",
+    "API_V1_STR": "/api/v1",
+    "PROJECT_DESCRIPTION": "benchmark",
+    "SECRET_KEY": "bench-secret",
+    "REFRESH_SECRET_KEY": "bench-refresh-secret",
+    "ALGORITHM": "HS256",
+}
+
+
+def setup_environment(**settings) -> str:
+    """
+    Debe llamarse antes de importar `app`: apunta DATABASE_URL a la BD del
+    benchmark y aplica `settings` como variables de entorno. Retorna la URL.
+    """
+    url = os.environ.get("BENCH_DATABASE_URL")
+    if not url:
+        url = f"sqlite:///{tempfile.mkdtemp(prefix='alto_bench_')}/bench.db"
+    os.environ["DATABASE_URL"] = url
+    for key, value in _DEFAULT_ENV.items():
+        os.environ.setdefault(key, value)
+    for key, value in settings.items():
+        os.environ[key] = str(value)
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
+    return url
+
+
+# ── Medición ──────────────────────────────────────────────────────────────────
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def summary(values_ms: list[float]) -> str:
+    """"p50 / p95 / máx" de una lista de tiempos en ms."""
+    return (
+        f"p50 {statistics.median(values_ms):.1f} ms  "
+        f"p95 {percentile(values_ms, 95):.1f} ms  max {max(values_ms):.1f} ms"
+    )
+
+
+# ── Datos de prueba por API ───────────────────────────────────────────────────
+
+def expect(response, status: int = 200):
+    assert response.status_code == status, (response.status_code, response.text)
+    return response.json() if response.content else None
+
+
+def register_and_login(client, email: str = "owner@example.com", password: str = "bench12345") -> dict:
+    """Registra un usuario y retorna las cabeceras con su token."""
+    username = email.split("@")[0]
+    expect(client.post("/api/v1/auth/register", json={
+        "email": email, "username": username, "password": password, "full_name": username,
+    }), 201)
+    token = expect(client.post("/api/v1/auth/login", json={"email": email, "password": password}))
+    return {"Authorization": f"Bearer {token['access_token']}"}
+
+
+def create_store(client, headers: dict) -> dict:
+    """
+    Negocio con una bodega por defecto. Retorna `base` (prefijo de rutas del
+    negocio), `business_id`, `warehouse_id` y `cash_method_id`.
+    """
+    business = expect(client.post("/api/v1/businesses", json={
+        "name": "Tienda benchmark", "plan_type": "professional",
+    }, headers=headers), 201)
+    base = f"/api/v1/businesses/{business['id']}"
+    warehouse = expect(client.post(f"{base}/inventory/warehouses", json={
+        "name": "Principal", "is_default": True,
+    }, headers=headers), 201)
+    methods = expect(client.get(f"{base}/payment-methods", headers=headers))
+    return {
+        "base": base,
+        "business_id": business["id"],
+        "warehouse_id": warehouse["id"],
+        "cash_method_id": next(m["id"] for m in methods if not m["is_credit"]),
+    }
+
+
+def create_stocked_presentation(client, headers: dict, store: dict, quantity, name: str = "Producto") -> int:
+    """Producto con una presentación y `quantity` unidades en la bodega. Retorna el id de la presentación."""
+    product = expect(client.post(f"{store['base']}/inventory/products", json={
+        "name": name, "presentations": [{"name": "Unidad", "sale_price": "10.00"}],
+    }, headers=headers), 201)
+    presentation_id = product["presentations"][0]["id"]
+    expect(client.post(f"{store['base']}/inventory/entry", json={
+        "presentation_id": presentation_id, "warehouse_id": store["warehouse_id"],
+        "quantity": str(quantity), "cost_per_unit": "6.00",
+    }, headers=headers), 201)
+    return presentation_id
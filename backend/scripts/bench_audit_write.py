@@ -0,0 +1,73 @@
+"""
+Costo del registro de auditoría en un endpoint de escritura.
+
+Hace SALES ventas secuenciales (POST /sales, una fila de auditoría cada una)
+en tres modos y reporta ms por request y las filas de auditoría escritas:
+
+- "commit": línea base, como antes de AUDIT_MODE. log_action hacía su
+  propio commit; aquí se emula con un commit extra tras cada registro.
+- "transaction" y "batch": los valores de AUDIT_MODE.
+
+    python scripts/bench_audit_write.py [--sales 300]
+"""
+import argparse
+import time
+
+from _bench import setup_environment, summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sales", type=int, default=300)
+    args = parser.parse_args()
+
+    setup_environment()
+    from fastapi.testclient import TestClient
+    from sqlalchemy import func, select
+    from _bench import create_stocked_presentation, create_store, expect, register_and_login
+    from app.config import get_settings
+    from app.database import SessionLocal
+    from app.api.v1 import sales
+    from app.main import app
+    from app.models.role import AuditLog
+    from app.utils.audit import audit_writer, log_action
+
+    settings = get_settings()
+
+    def log_action_and_commit(db, *args, **kwargs):
+        log_action(db, *args, **kwargs)
+        db.commit()
+
+    def audit_rows() -> int:
+        with SessionLocal() as db:
+            return db.execute(select(func.count()).select_from(AuditLog)).scalar()
+
+    with TestClient(app) as client:
+        headers = register_and_login(client)
+        store = create_store(client, headers)
+        presentation_id = create_stocked_presentation(client, headers, store, quantity=args.sales * 3)
+        body = {
+            "warehouse_id": store["warehouse_id"],
+            "items": [{"presentation_id": presentation_id, "quantity": "1", "unit_price": "10"}],
+            "payments": [{"payment_method_id": store["cash_method_id"], "amount": "10"}],
+        }
+
+        for mode in ("commit", "transaction", "batch"):
+            settings.AUDIT_MODE = "transaction" if mode == "commit" else mode
+            sales.log_action = log_action_and_commit if mode == "commit" else log_action
+            before = audit_rows()
+            samples = []
+            started = time.perf_counter()
+            for _ in range(args.sales):
+                t0 = time.perf_counter()
+                expect(client.post(f"{store['base']}/sales", json=body, headers=headers), 201)
+                samples.append((time.perf_counter() - t0) * 1000)
+            elapsed = time.perf_counter() - started
+            # Espera el lote en curso del hilo escritor y vacía la cola
+            audit_writer.stop()
+            print(f"{mode:11} {args.sales} ventas: {elapsed / args.sales * 1000:.2f} ms/req "
+                  f"({summary(samples)}), {audit_rows() - before} filas de auditoría")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Logins concurrentes frente a la latencia del resto de la API.
+
+Lanza LOGINS logins simultáneos por ASGI (httpx.ASGITransport) mientras un
+cliente hace GET / cada 10 ms, y reporta logins/s, respuestas 503 (pool de
+hashing lleno) y la latencia del ping. Con el hashing fuera del threadpool
+de Starlette el ping no debe esperar a bcrypt.
+
+    python scripts/bench_login.py [--logins 40] [--rounds 12] [--workers 2]
+"""
+import argparse
+import asyncio
+import time
+
+from _bench import setup_environment, summary
+
+
+async def run(logins: int) -> None:
+    import httpx
+    from app.main import app, on_startup
+
+    on_startup()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        credentials = {"email": "login@example.com", "password": "bench12345"}
+        await client.post("/api/v1/auth/register", json={
+            **credentials, "username": "login", "full_name": "Login",
+        })
+
+        ping_ms: list[float] = []
+        done = asyncio.Event()
+
+        async def ping() -> None:
+            while not done.is_set():
+                started = time.perf_counter()
+                await client.get("/")
+                ping_ms.append((time.perf_counter() - started) * 1000)
+                await asyncio.sleep(0.01)
+
+        async def login() -> int:
+            response = await client.post("/api/v1/auth/login", json=credentials)
+            return response.status_code
+
+        pinger = asyncio.create_task(ping())
+        started = time.perf_counter()
+        codes = await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await pinger
+
+    accepted = codes.count(200)
+    print(f"{logins} logins en {elapsed:.2f} s -> {accepted / elapsed:.1f} logins/s "
+          f"(200: {accepted}, 503: {codes.count(503)})")
+    print(f"ping GET /: {summary(ping_ms)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--rounds", type=int, default=12, help="BCRYPT_ROUNDS")
+    parser.add_argument("--workers", type=int, default=2, help="PASSWORD_HASH_WORKERS")
+    args = parser.parse_args()
+
+    setup_environment(BCRYPT_ROUNDS=args.rounds, PASSWORD_HASH_WORKERS=args.workers)
+    asyncio.run(run(args.logins))
+
+
+if __name__ == "__main__":
+    main()
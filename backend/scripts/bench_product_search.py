@@ -0,0 +1,73 @@
+"""
+Búsqueda de productos (GET /inventory/products?search=) sobre un catálogo
+grande.
+
+Crea PRODUCTS productos de 2 palabras con 3 presentaciones y código de
+barras cada uno, reconstruye el índice de búsqueda y reporta, por término,
+los resultados (limit 50) y la latencia de REQUESTS requests.
+
+    python scripts/bench_product_search.py [--products 4000] [--requests 15]
+"""
+import argparse
+import random
+import time
+
+from _bench import setup_environment, summary
+
+WORDS = [
+    "cafe", "café", "arroz", "azúcar", "leche", "jabón", "aceite", "harina", "pan", "queso",
+    "atún", "frijol", "sal", "té", "chocolate", "galleta", "jugo", "agua", "papel", "maíz",
+]
+TERMS = ["cafe", "queso", "leche", "azucar", "caf choc", "7700123", "choc", "zz"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, default=4000)
+    parser.add_argument("--requests", type=int, default=15)
+    args = parser.parse_args()
+
+    setup_environment()
+    from fastapi.testclient import TestClient
+    from _bench import create_store, expect, register_and_login
+    from app.database import SessionLocal
+    from app.main import app
+    from app.models.inventory import Product, ProductPresentation
+    from app.utils.product_search import rebuild
+
+    random.seed(1)
+    with TestClient(app) as client:
+        headers = register_and_login(client)
+        store = create_store(client, headers)
+        with SessionLocal() as db:
+            for i in range(args.products):
+                product = Product(
+                    business_id=store["business_id"], is_active=True,
+                    name=f"{random.choice(WORDS).title()} {random.choice(WORDS)} {i}",
+                )
+                db.add(product)
+                db.flush()
+                db.add_all(
+                    ProductPresentation(
+                        product_id=product.id, business_id=store["business_id"],
+                        name=f"{j + 1}kg", barcode=f"77{i:05d}{j}", sale_price=1,
+                    )
+                    for j in range(3)
+                )
+            db.flush()
+            rebuild(db, store["business_id"])
+            db.commit()
+
+        for term in TERMS:
+            params = {"search": term, "limit": 50}
+            hits = len(expect(client.get(f"{store['base']}/inventory/products", params=params, headers=headers)))
+            samples = []
+            for _ in range(args.requests):
+                started = time.perf_counter()
+                client.get(f"{store['base']}/inventory/products", params=params, headers=headers)
+                samples.append((time.perf_counter() - started) * 1000)
+            print(f"{term!r:11} {hits:3} resultados  {summary(samples)}")
+
+
+if __name__ == "__main__":
+    main()
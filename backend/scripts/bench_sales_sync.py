@@ -0,0 +1,72 @@
+"""
+Throughput de la sincronización de ventas offline (POST /sales/sync).
+
+Sincroniza SALES ventas de 2 líneas, repartidas en 3 días, en envíos de
+BATCH, y compara con las mismas ventas por POST /sales una a una. Reporta
+ventas/s de cada camino y el tiempo por envío.
+
+    python scripts/bench_sales_sync.py [--sales 500] [--batch 100]
+"""
+import argparse
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from _bench import setup_environment, summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sales", type=int, default=500)
+    parser.add_argument("--batch", type=int, default=100)
+    args = parser.parse_args()
+
+    setup_environment()
+    from fastapi.testclient import TestClient
+    from _bench import create_stocked_presentation, create_store, expect, register_and_login
+    from app.main import app
+
+    with TestClient(app) as client:
+        headers = register_and_login(client)
+        store = create_store(client, headers)
+        presentation_ids = [
+            create_stocked_presentation(client, headers, store, quantity=args.sales * 2, name=f"Producto {i}")
+            for i in range(2)
+        ]
+        now = datetime.utcnow()
+
+        def sale(i: int) -> dict:
+            return {
+                "warehouse_id": store["warehouse_id"],
+                "items": [
+                    {"presentation_id": pid, "quantity": "1", "unit_price": "10"}
+                    for pid in presentation_ids
+                ],
+                "payments": [{"payment_method_id": store["cash_method_id"], "amount": "20"}],
+                "client_ref": uuid.uuid4().hex,
+                "sold_at": (now - timedelta(days=i % 3)).isoformat(),
+            }
+
+        samples = []
+        started = time.perf_counter()
+        for first in range(0, args.sales, args.batch):
+            batch = [sale(i) for i in range(first, min(first + args.batch, args.sales))]
+            t0 = time.perf_counter()
+            result = expect(client.post(f"{store['base']}/sales/sync", json={"sales": batch}, headers=headers))
+            samples.append((time.perf_counter() - t0) * 1000)
+            assert result["created"] == len(batch), result
+        elapsed = time.perf_counter() - started
+        print(f"sync  {args.sales} ventas en envíos de {args.batch}: "
+              f"{args.sales / elapsed:.0f} ventas/s (por envío: {summary(samples)})")
+
+        started = time.perf_counter()
+        for i in range(args.sales):
+            body = sale(i)
+            del body["client_ref"], body["sold_at"]
+            expect(client.post(f"{store['base']}/sales", json=body, headers=headers), 201)
+        elapsed = time.perf_counter() - started
+        print(f"POST /sales una a una: {args.sales / elapsed:.0f} ventas/s")
+
+
+if __name__ == "__main__":
+    main()
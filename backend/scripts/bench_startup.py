@@ -0,0 +1,59 @@
+"""
+Costo de preparar la BD al arrancar (utils.bootstrap.prepare_database).
+
+1. BD nueva: WORKERS procesos arrancan a la vez; uno migra y siembra y los
+   demás esperan el lock y no repiten nada. Reporta las fases de cada uno.
+2. BD al día: ROUNDS llamadas en un proceso, con ms y consultas por llamada.
+
+    python scripts/bench_startup.py [--workers 4] [--rounds 20]
+"""
+import argparse
+import multiprocessing
+import time
+
+from _bench import setup_environment, summary
+
+
+def _start_worker(_) -> dict:
+    from app.utils.bootstrap import prepare_database
+    return prepare_database()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_environment()
+    # spawn: cada worker importa la app desde cero, como un worker de uvicorn
+    with multiprocessing.get_context("spawn").Pool(args.workers) as pool:
+        started = time.perf_counter()
+        results = pool.map(_start_worker, range(args.workers))
+        elapsed = time.perf_counter() - started
+    print(f"BD nueva, {args.workers} workers a la vez ({elapsed * 1000:.0f} ms con imports):")
+    for timings in results:
+        print(f"  {timings}")
+
+    from sqlalchemy import event
+    from app.database import engine
+    from app.utils.bootstrap import prepare_database
+
+    queries = 0
+
+    def count(*_):
+        nonlocal queries
+        queries += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    samples = []
+    for _ in range(args.rounds):
+        started = time.perf_counter()
+        prepare_database()
+        samples.append((time.perf_counter() - started) * 1000)
+    print(f"BD al día, {args.rounds} arranques: {summary(samples)}, "
+          f"{queries / args.rounds:.0f} consultas por arranque")
+
+
+if __name__ == "__main__":
+    main()
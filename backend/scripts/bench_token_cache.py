@@ -0,0 +1,60 @@
+"""
+Costo de verificar el token de acceso, con y sin la caché de tokens.
+
+1. Micro: decode_access_token con acierto en caché frente a jose.decode.
+2. Por request: GET /auth/me con la caché caliente y vaciándola antes de
+   cada request (cada request verifica la firma).
+
+    python scripts/bench_token_cache.py [--decodes 20000] [--requests 500]
+"""
+import argparse
+import time
+import timeit
+
+from _bench import setup_environment, summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--decodes", type=int, default=20_000)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    setup_environment()
+    from fastapi.testclient import TestClient
+    from _bench import register_and_login
+    from app.core import security
+    from app.main import app
+
+    token = security.create_access_token({"sub": "1"})
+    security.decode_access_token(token)
+    n = args.decodes
+    cached = timeit.timeit(lambda: security.decode_access_token(token), number=n) / n
+    raw = timeit.timeit(
+        lambda: security.jwt.decode(token, security.settings.SECRET_KEY,
+                                    algorithms=[security.settings.ALGORITHM]),
+        number=n,
+    ) / n
+    print(f"decode x{n}: jose {raw * 1e6:.1f} us, caché {cached * 1e6:.1f} us")
+
+    with TestClient(app) as client:
+        headers = register_and_login(client)
+
+        def measure(clear: bool) -> list[float]:
+            samples = []
+            for _ in range(args.requests):
+                if clear:
+                    security._token_cache.clear()
+                started = time.perf_counter()
+                client.get("/api/v1/auth/me", headers=headers)
+                samples.append((time.perf_counter() - started) * 1000)
+            return samples
+
+        measure(clear=False)  # calentamiento
+        print(f"GET /auth/me sin caché: {summary(measure(clear=True))}")
+        print(f"GET /auth/me con caché: {summary(measure(clear=False))}")
+        print(f"caché de tokens: {security.token_cache_stats()}")
+
+
+if __name__ == "__main__":
+    main()
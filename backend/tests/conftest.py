@@ -0,0 +1,58 @@
+"""
+Configuración común de los tests (`python -m pytest` desde backend/).
+
+Los tests corren sobre una BD SQLite temporal, nunca sobre la del .env, salvo
+que se indique TEST_DATABASE_URL (p. ej. un Postgres de pruebas). Las
+variables obligatorias que falten se completan con valores de prueba.
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+TMP_DIR = Path(tempfile.mkdtemp(prefix="alto_tests_"))
+
+os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL") or f"sqlite:///{TMP_DIR}/test.db"
+os.environ["AUDIT_ARCHIVE_DIR"] = str(TMP_DIR / "audit_archive")
+for key, value in {
+    "PROJECT_NAME": "alto-vivo-tests",
+    "VERSION": "test",
+    "API_V1_STR": "/api/v1",
+    "PROJECT_DESCRIPTION": "tests",
+    "SECRET_KEY": "test-secret",
+    "REFRESH_SECRET_KEY": "test-refresh-secret",
+    "ALGORITHM": "HS256",
+}.items():
+    os.environ.setdefault(key, value)
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+
+@pytest.fixture(scope="session")
+def database():
+    """BD de la sesión de tests migrada a head y sembrada, como al arrancar la app."""
+    from app.utils.bootstrap import prepare_database
+    prepare_database()
+
+
+@pytest.fixture
+def db(database):
+    from app.database import SessionLocal
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+
+
+@pytest.fixture(scope="session")
+def client(database):
+    """Cliente de la API; los errores no capturados llegan como 500, no como excepción."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+    with TestClient(app, raise_server_exceptions=False) as test_client:
+        yield test_client
@@ -0,0 +1,584 @@
+-- BD SQLite creada por la app antes de Alembic (esquema de `create_all`,
+-- commit c786541): un negocio con bodega, un producto con stock y lote,
+-- una venta y su auditoría. La usa tests/test_migrations.py.
+BEGIN TRANSACTION;
+CREATE TABLE audit_logs (
+	id INTEGER NOT NULL, 
+	user_id INTEGER NOT NULL, 
+	business_id INTEGER, 
+	action VARCHAR NOT NULL, 
+	entity_type VARCHAR NOT NULL, 
+	entity_id INTEGER, 
+	details TEXT, 
+	ip_address VARCHAR, 
+	created_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id), 
+	FOREIGN KEY(business_id) REFERENCES businesses (id)
+);
+INSERT INTO "audit_logs" VALUES(1,1,NULL,'REGISTER','User',1,'{"username": "owner"}',NULL,'2026-10-17 05:12:37.428563');
+INSERT INTO "audit_logs" VALUES(2,1,NULL,'LOGIN','User',1,NULL,'testclient','2026-10-17 05:12:37.747058');
+INSERT INTO "audit_logs" VALUES(3,1,1,'CREATE','Business',1,'{"name": "Tienda"}',NULL,'2026-10-17 05:12:37.797097');
+INSERT INTO "audit_logs" VALUES(4,1,1,'CREATE','Product',1,NULL,NULL,'2026-10-17 05:12:37.883224');
+INSERT INTO "audit_logs" VALUES(5,1,1,'ENTRY','Inventory',1,'{"presentation_id": 1, "quantity": "5"}',NULL,'2026-10-17 05:12:37.906530');
+INSERT INTO "audit_logs" VALUES(6,1,1,'CREATE','Sale',1,'{"total": "30", "payments": [{"method_id": 1, "amount": "30"}]}',NULL,'2026-10-17 05:12:38.087669');
+CREATE TABLE business_roles (
+	id INTEGER NOT NULL, 
+	business_id INTEGER NOT NULL, 
+	name VARCHAR NOT NULL, 
+	description TEXT, 
+	is_default BOOLEAN, 
+	can_manage_users BOOLEAN, 
+	can_manage_roles BOOLEAN, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(business_id) REFERENCES businesses (id)
+);
+INSERT INTO "business_roles" VALUES(1,1,'Empleado','Rol básico para empleados',1,0,0,'2026-10-17 05:12:37.784313','2026-10-17 05:12:37.784319');
+CREATE TABLE business_users (
+	id INTEGER NOT NULL, 
+	business_id INTEGER NOT NULL, 
+	user_id INTEGER NOT NULL, 
+	business_role_id INTEGER, 
+	is_active BOOLEAN, 
+	invited_by INTEGER, 
+	joined_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(business_id) REFERENCES businesses (id), 
+	FOREIGN KEY(user_id) REFERENCES users (id), 
+	FOREIGN KEY(business_role_id) REFERENCES business_roles (id), 
+	FOREIGN KEY(invited_by) REFERENCES users (id)
+);
+CREATE TABLE businesses (
+	id INTEGER NOT NULL, 
+	name VARCHAR NOT NULL, 
+	description TEXT, 
+	business_type VARCHAR(10), 
+	plan_type VARCHAR(12), 
+	max_users INTEGER, 
+	max_products INTEGER, 
+	owner_id INTEGER NOT NULL, 
+	is_active BOOLEAN, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	module_inventory BOOLEAN, 
+	module_sales BOOLEAN, 
+	module_clients BOOLEAN, 
+	module_portfolio BOOLEAN, 
+	module_finance BOOLEAN, 
+	module_suppliers BOOLEAN, 
+	module_reports BOOLEAN, 
+	module_waste BOOLEAN, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(owner_id) REFERENCES users (id)
+);
+INSERT INTO "businesses" VALUES(1,'Tienda',NULL,'RETAIL','PROFESSIONAL',20,2000,1,1,'2026-10-17 05:12:37.781821','2026-10-17 05:12:37.781828',1,1,1,1,1,1,1,1);
+CREATE TABLE cash_movements (
+	id INTEGER NOT NULL, 
+	session_id INTEGER NOT NULL, 
+	business_id INTEGER NOT NULL, 
+	created_by INTEGER NOT NULL, 
+	movement_type VARCHAR(7) NOT NULL, 
+	amount NUMERIC(12, 2) NOT NULL, 
+	description VARCHAR NOT NULL, 
+	created_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(session_id) REFERENCES cash_sessions (id), 
+	FOREIGN KEY(business_id) REFERENCES businesses (id), 
+	FOREIGN KEY(created_by) REFERENCES users (id)
+);
+CREATE TABLE cash_registers (
+	id INTEGER NOT NULL, 
+	business_id INTEGER NOT NULL, 
+	warehouse_id INTEGER NOT NULL, 
+	name VARCHAR NOT NULL, 
+	is_active BOOLEAN, 
+	created_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(business_id) REFERENCES businesses (id), 
+	FOREIGN KEY(warehouse_id) REFERENCES warehouses (id)
+);
+CREATE TABLE cash_sessions (
+	id INTEGER NOT NULL, 
+	register_id INTEGER NOT NULL, 
+	business_id INTEGER NOT NULL, 
+	opened_by INTEGER NOT NULL, 
+	closed_by INTEGER, 
+	status VARCHAR(6), 
+	opening_amount NUMERIC(12, 2) NOT NULL, 
+	opened_at DATETIME, 
+	opening_notes VARCHAR, 
+	closing_amount NUMERIC(12, 2), 
+	expected_amount NUMERIC(12, 2), 
+	difference NUMERIC(12, 2), 
+	closed_at DATETIME, 
+	closing_notes VARCHAR, 
+	total_sales NUMERIC(12, 2), 
+	total_income NUMERIC(12, 2), 
+	total_expense NUMERIC(12, 2), 
+	total_credit NUMERIC(12, 2), 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(register_id) REFERENCES cash_registers (id), 
+	FOREIGN KEY(business_id) REFERENCES businesses (id), 
+	FOREIGN KEY(opened_by) REFERENCES users (id), 
+	FOREIGN KEY(closed_by) REFERENCES users (id)
+);
+CREATE TABLE client_purchases (
+	id INTEGER NOT NULL, 
+	client_id INTEGER NOT NULL, 
+	business_id INTEGER NOT NULL, 
+	total NUMERIC(12, 2) NOT NULL, 
+	payment_method VARCHAR, 
+	is_credit BOOLEAN, 
+	notes VARCHAR, 
+	created_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(client_id) REFERENCES clients (id), 
+	FOREIGN KEY(business_id) REFERENCES businesses (id)
+);
+CREATE TABLE clients (
+	id INTEGER NOT NULL, 
+	business_id INTEGER NOT NULL, 
+	name VARCHAR NOT NULL, 
+	client_type VARCHAR(7), 
+	phone VARCHAR, 
+	email VARCHAR, 
+	address VARCHAR, 
+	document_id VARCHAR, 
+	notes TEXT, 
+	credit_limit NUMERIC(12, 2), 
+	current_balance NUMERIC(12, 2), 
+	credit_days INTEGER, 
+	status VARCHAR(8), 
+	is_active BOOLEAN, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	last_purchase_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(business_id) REFERENCES businesses (id)
+);
+CREATE TABLE credit_movements (
+	id INTEGER NOT NULL, 
+	client_id INTEGER NOT NULL, 
+	business_id INTEGER NOT NULL, 
+	amount NUMERIC(12, 2) NOT NULL, 
+	movement_type VARCHAR NOT NULL, 
+	description VARCHAR, 
+	created_by INTEGER, 
+	created_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(client_id) REFERENCES clients (id), 
+	FOREIGN KEY(business_id) REFERENCES businesses (id), 
+	FOREIGN KEY(created_by) REFERENCES users (id)
+);
+CREATE TABLE inventory_movements (
+	id INTEGER NOT NULL, 
+	business_id INTEGER NOT NULL, 
+	presentation_id INTEGER NOT NULL, 
+	warehouse_id INTEGER NOT NULL, 
+	lot_id INTEGER, 
+	movement_type VARCHAR(12) NOT NULL, 
+	quantity NUMERIC(12, 3) NOT NULL, 
+	cost_per_unit NUMERIC(12, 2), 
+	reason VARCHAR, 
+	destination_warehouse_id INTEGER, 
+	reference_id INTEGER, 
+	reference_type VARCHAR, 
+	created_by INTEGER NOT NULL, 
+	created_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(business_id) REFERENCES businesses (id), 
+	FOREIGN KEY(presentation_id) REFERENCES product_presentations (id), 
+	FOREIGN KEY(warehouse_id) REFERENCES warehouses (id), 
+	FOREIGN KEY(lot_id) REFERENCES product_lots (id), 
+	FOREIGN KEY(destination_warehouse_id) REFERENCES warehouses (id), 
+	FOREIGN KEY(created_by) REFERENCES users (id)
+);
+INSERT INTO "inventory_movements" VALUES(1,1,1,1,1,'ENTRY',5,6,NULL,NULL,NULL,NULL,1,'2026-10-17 05:12:37.901585');
+INSERT INTO "inventory_movements" VALUES(2,1,1,1,NULL,'SALE',-3,NULL,NULL,NULL,1,'sale',1,'2026-10-17 05:12:37.981705');
+CREATE TABLE payment_methods (
+	id INTEGER NOT NULL, 
+	business_id INTEGER NOT NULL, 
+	name VARCHAR NOT NULL, 
+	description VARCHAR, 
+	is_default BOOLEAN, 
+	is_credit BOOLEAN, 
+	is_active BOOLEAN, 
+	created_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(business_id) REFERENCES businesses (id)
+);
+INSERT INTO "payment_methods" VALUES(1,1,'Efectivo',NULL,1,0,1,'2026-10-17 05:12:37.791864');
+INSERT INTO "payment_methods" VALUES(2,1,'Credito',NULL,1,1,1,'2026-10-17 05:12:37.791869');
+CREATE TABLE permissions (
+	id INTEGER NOT NULL, 
+	code VARCHAR NOT NULL, 
+	name VARCHAR NOT NULL, 
+	description TEXT, 
+	module VARCHAR NOT NULL, 
+	created_at DATETIME, 
+	PRIMARY KEY (id), 
+	UNIQUE (code)
+);
+INSERT INTO "permissions" VALUES(1,'inventory.view','Ver inventario',NULL,'inventory','2026-10-17 05:12:37.058232');
+INSERT INTO "permissions" VALUES(2,'inventory.create','Crear productos',NULL,'inventory','2026-10-17 05:12:37.058237');
+INSERT INTO "permissions" VALUES(3,'inventory.update','Editar productos',NULL,'inventory','2026-10-17 05:12:37.058237');
+INSERT INTO "permissions" VALUES(4,'inventory.delete','Eliminar productos',NULL,'inventory','2026-10-17 05:12:37.058238');
+INSERT INTO "permissions" VALUES(5,'inventory.adjust','Ajustar stock',NULL,'inventory','2026-10-17 05:12:37.058241');
+INSERT INTO "permissions" VALUES(6,'inventory.report','Reportes de inventario',NULL,'inventory','2026-10-17 05:12:37.058242');
+INSERT INTO "permissions" VALUES(7,'sales.view','Ver ventas',NULL,'sales','2026-10-17 05:12:37.058242');
+INSERT INTO "permissions" VALUES(8,'sales.create','Registrar ventas',NULL,'sales','2026-10-17 05:12:37.058243');
+INSERT INTO "permissions" VALUES(9,'sales.cancel','Cancelar ventas',NULL,'sales','2026-10-17 05:12:37.058243');
+INSERT INTO "permissions" VALUES(10,'sales.report','Reportes de ventas',NULL,'sales','2026-10-17 05:12:37.058244');
+INSERT INTO "permissions" VALUES(11,'clients.view','Ver clientes',NULL,'clients','2026-10-17 05:12:37.058244');
+INSERT INTO "permissions" VALUES(12,'clients.create','Crear clientes',NULL,'clients','2026-10-17 05:12:37.058244');
+INSERT INTO "permissions" VALUES(13,'clients.update','Editar clientes',NULL,'clients','2026-10-17 05:12:37.058245');
+INSERT INTO "permissions" VALUES(14,'clients.delete','Eliminar clientes',NULL,'clients','2026-10-17 05:12:37.058248');
+INSERT INTO "permissions" VALUES(15,'portfolio.view','Ver cartera',NULL,'portfolio','2026-10-17 05:12:37.058248');
+INSERT INTO "permissions" VALUES(16,'portfolio.collect','Registrar cobros',NULL,'portfolio','2026-10-17 05:12:37.058249');
+INSERT INTO "permissions" VALUES(17,'portfolio.adjust','Ajustar deudas',NULL,'portfolio','2026-10-17 05:12:37.058249');
+INSERT INTO "permissions" VALUES(18,'portfolio.report','Reportes de cartera',NULL,'portfolio','2026-10-17 05:12:37.058249');
+INSERT INTO "permissions" VALUES(19,'finance.view','Ver finanzas',NULL,'finance','2026-10-17 05:12:37.058250');
+INSERT INTO "permissions" VALUES(20,'finance.create','Registrar movimientos',NULL,'finance','2026-10-17 05:12:37.058250');
+INSERT INTO "permissions" VALUES(21,'finance.update','Editar movimientos',NULL,'finance','2026-10-17 05:12:37.058250');
+INSERT INTO "permissions" VALUES(22,'finance.report','Reportes financieros',NULL,'finance','2026-10-17 05:12:37.058251');
+INSERT INTO "permissions" VALUES(23,'suppliers.view','Ver proveedores',NULL,'suppliers','2026-10-17 05:12:37.058251');
+INSERT INTO "permissions" VALUES(24,'suppliers.create','Crear proveedores',NULL,'suppliers','2026-10-17 05:12:37.058251');
+INSERT INTO "permissions" VALUES(25,'suppliers.update','Editar proveedores',NULL,'suppliers','2026-10-17 05:12:37.058252');
+INSERT INTO "permissions" VALUES(26,'suppliers.delete','Eliminar proveedores',NULL,'suppliers','2026-10-17 05:12:37.058252');
+INSERT INTO "permissions" VALUES(27,'reports.sales','Reporte de ventas',NULL,'reports','2026-10-17 05:12:37.058252');
+INSERT INTO "permissions" VALUES(28,'reports.inventory','Reporte de inventario',NULL,'reports','2026-10-17 05:12:37.058253');
+INSERT INTO "permissions" VALUES(29,'reports.finance','Reporte financiero',NULL,'reports','2026-10-17 05:12:37.058253');
+INSERT INTO "permissions" VALUES(30,'reports.clients','Reporte de clientes',NULL,'reports','2026-10-17 05:12:37.058253');
+INSERT INTO "permissions" VALUES(31,'waste.view','Ver mermas',NULL,'waste','2026-10-17 05:12:37.058254');
+INSERT INTO "permissions" VALUES(32,'waste.register','Registrar mermas',NULL,'waste','2026-10-17 05:12:37.058254');
+INSERT INTO "permissions" VALUES(33,'waste.report','Reportes de mermas',NULL,'waste','2026-10-17 05:12:37.058254');
+CREATE TABLE product_categories (
+	id INTEGER NOT NULL, 
+	business_id INTEGER NOT NULL, 
+	name VARCHAR NOT NULL, 
+	description TEXT, 
+	color VARCHAR, 
+	is_active BOOLEAN, 
+	created_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(business_id) REFERENCES businesses (id)
+);
+CREATE TABLE product_lots (
+	id INTEGER NOT NULL, 
+	presentation_id INTEGER NOT NULL, 
+	warehouse_id INTEGER NOT NULL, 
+	business_id INTEGER NOT NULL, 
+	lot_number VARCHAR, 
+	quantity NUMERIC(12, 3) NOT NULL, 
+	remaining NUMERIC(12, 3) NOT NULL, 
+	cost_per_unit NUMERIC(12, 2), 
+	arrival_date DATETIME, 
+	expiry_date DATETIME, 
+	is_active BOOLEAN, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(presentation_id) REFERENCES product_presentations (id), 
+	FOREIGN KEY(warehouse_id) REFERENCES warehouses (id), 
+	FOREIGN KEY(business_id) REFERENCES businesses (id)
+);
+INSERT INTO "product_lots" VALUES(1,1,1,1,NULL,5,5,6,'2026-10-17 05:12:37.895540',NULL,1);
+CREATE TABLE product_presentations (
+	id INTEGER NOT NULL, 
+	product_id INTEGER NOT NULL, 
+	business_id INTEGER NOT NULL, 
+	name VARCHAR NOT NULL, 
+	barcode VARCHAR, 
+	sale_price NUMERIC(12, 2) NOT NULL, 
+	min_stock INTEGER, 
+	is_active BOOLEAN, 
+	created_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(product_id) REFERENCES products (id), 
+	FOREIGN KEY(business_id) REFERENCES businesses (id)
+);
+INSERT INTO "product_presentations" VALUES(1,1,1,'500g',NULL,10,3,1,'2026-10-17 05:12:37.877137');
+CREATE TABLE product_stock (
+	id INTEGER NOT NULL, 
+	presentation_id INTEGER NOT NULL, 
+	warehouse_id INTEGER NOT NULL, 
+	quantity NUMERIC(12, 3), 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(presentation_id) REFERENCES product_presentations (id), 
+	FOREIGN KEY(warehouse_id) REFERENCES warehouses (id)
+);
+INSERT INTO "product_stock" VALUES(1,1,1,2);
+CREATE TABLE products (
+	id INTEGER NOT NULL, 
+	business_id INTEGER NOT NULL, 
+	category_id INTEGER, 
+	name VARCHAR NOT NULL, 
+	description TEXT, 
+	is_perishable BOOLEAN, 
+	status VARCHAR(8), 
+	is_active BOOLEAN, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(business_id) REFERENCES businesses (id), 
+	FOREIGN KEY(category_id) REFERENCES product_categories (id)
+);
+INSERT INTO "products" VALUES(1,1,NULL,'Café molido',NULL,0,'ACTIVE',1,'2026-10-17 05:12:37.874668','2026-10-17 05:12:37.874672');
+CREATE TABLE role_permissions (
+	role_id INTEGER NOT NULL, 
+	permission_id INTEGER NOT NULL, 
+	PRIMARY KEY (role_id, permission_id), 
+	FOREIGN KEY(role_id) REFERENCES business_roles (id), 
+	FOREIGN KEY(permission_id) REFERENCES permissions (id)
+);
+INSERT INTO "role_permissions" VALUES(1,11);
+INSERT INTO "role_permissions" VALUES(1,1);
+INSERT INTO "role_permissions" VALUES(1,8);
+INSERT INTO "role_permissions" VALUES(1,7);
+CREATE TABLE sale_items (
+	id INTEGER NOT NULL, 
+	sale_id INTEGER NOT NULL, 
+	presentation_id INTEGER NOT NULL, 
+	quantity NUMERIC(12, 3) NOT NULL, 
+	unit_price NUMERIC(12, 2) NOT NULL, 
+	discount NUMERIC(12, 2), 
+	subtotal NUMERIC(12, 2) NOT NULL, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(sale_id) REFERENCES sales (id), 
+	FOREIGN KEY(presentation_id) REFERENCES product_presentations (id)
+);
+INSERT INTO "sale_items" VALUES(1,1,1,3,10,0,30);
+CREATE TABLE sale_payments (
+	id INTEGER NOT NULL, 
+	sale_id INTEGER NOT NULL, 
+	payment_method_id INTEGER NOT NULL, 
+	amount NUMERIC(12, 2) NOT NULL, 
+	is_credit BOOLEAN, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(sale_id) REFERENCES sales (id), 
+	FOREIGN KEY(payment_method_id) REFERENCES payment_methods (id)
+);
+INSERT INTO "sale_payments" VALUES(1,1,1,30,0);
+CREATE TABLE sales (
+	id INTEGER NOT NULL, 
+	business_id INTEGER NOT NULL, 
+	client_id INTEGER, 
+	warehouse_id INTEGER NOT NULL, 
+	created_by INTEGER NOT NULL, 
+	subtotal NUMERIC(12, 2) NOT NULL, 
+	discount NUMERIC(12, 2), 
+	total NUMERIC(12, 2) NOT NULL, 
+	amount_paid NUMERIC(12, 2) NOT NULL, 
+	amount_credit NUMERIC(12, 2), 
+	status VARCHAR(9), 
+	notes TEXT, 
+	cancelled_at DATETIME, 
+	cancelled_by INTEGER, 
+	cancel_reason VARCHAR, 
+	created_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(business_id) REFERENCES businesses (id), 
+	FOREIGN KEY(client_id) REFERENCES clients (id), 
+	FOREIGN KEY(warehouse_id) REFERENCES warehouses (id), 
+	FOREIGN KEY(created_by) REFERENCES users (id), 
+	FOREIGN KEY(cancelled_by) REFERENCES users (id)
+);
+INSERT INTO "sales" VALUES(1,1,NULL,1,1,30,0,30,30,0,'COMPLETED',NULL,NULL,NULL,NULL,'2026-10-17 05:12:37.980062');
+CREATE TABLE session_payment_breakdowns (
+	id INTEGER NOT NULL, 
+	session_id INTEGER NOT NULL, 
+	payment_method_id INTEGER NOT NULL, 
+	payment_method_name VARCHAR NOT NULL, 
+	total NUMERIC(12, 2) NOT NULL, 
+	is_credit BOOLEAN, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(session_id) REFERENCES cash_sessions (id), 
+	FOREIGN KEY(payment_method_id) REFERENCES payment_methods (id)
+);
+CREATE TABLE supplier_payments (
+	id INTEGER NOT NULL, 
+	supplier_id INTEGER NOT NULL, 
+	purchase_id INTEGER, 
+	business_id INTEGER NOT NULL, 
+	created_by INTEGER NOT NULL, 
+	amount NUMERIC(12, 2) NOT NULL, 
+	description VARCHAR, 
+	created_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(supplier_id) REFERENCES suppliers (id), 
+	FOREIGN KEY(purchase_id) REFERENCES supplier_purchases (id), 
+	FOREIGN KEY(business_id) REFERENCES businesses (id), 
+	FOREIGN KEY(created_by) REFERENCES users (id)
+);
+CREATE TABLE supplier_products (
+	id INTEGER NOT NULL, 
+	supplier_id INTEGER NOT NULL, 
+	presentation_id INTEGER NOT NULL, 
+	cost_price NUMERIC(12, 2), 
+	is_active BOOLEAN, 
+	created_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(supplier_id) REFERENCES suppliers (id), 
+	FOREIGN KEY(presentation_id) REFERENCES product_presentations (id)
+);
+CREATE TABLE supplier_purchase_items (
+	id INTEGER NOT NULL, 
+	purchase_id INTEGER NOT NULL, 
+	presentation_id INTEGER NOT NULL, 
+	quantity NUMERIC(12, 3) NOT NULL, 
+	cost_per_unit NUMERIC(12, 2) NOT NULL, 
+	subtotal NUMERIC(12, 2) NOT NULL, 
+	lot_number VARCHAR, 
+	expiry_date DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(purchase_id) REFERENCES supplier_purchases (id), 
+	FOREIGN KEY(presentation_id) REFERENCES product_presentations (id)
+);
+CREATE TABLE supplier_purchases (
+	id INTEGER NOT NULL, 
+	supplier_id INTEGER NOT NULL, 
+	business_id INTEGER NOT NULL, 
+	warehouse_id INTEGER NOT NULL, 
+	created_by INTEGER NOT NULL, 
+	subtotal NUMERIC(12, 2) NOT NULL, 
+	discount NUMERIC(12, 2), 
+	total NUMERIC(12, 2) NOT NULL, 
+	amount_paid NUMERIC(12, 2), 
+	amount_credit NUMERIC(12, 2), 
+	payment_status VARCHAR(7), 
+	status VARCHAR(9), 
+	notes TEXT, 
+	expected_payment_date DATETIME, 
+	created_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(supplier_id) REFERENCES suppliers (id), 
+	FOREIGN KEY(business_id) REFERENCES businesses (id), 
+	FOREIGN KEY(warehouse_id) REFERENCES warehouses (id), 
+	FOREIGN KEY(created_by) REFERENCES users (id)
+);
+CREATE TABLE suppliers (
+	id INTEGER NOT NULL, 
+	business_id INTEGER NOT NULL, 
+	name VARCHAR NOT NULL, 
+	contact_name VARCHAR, 
+	phone VARCHAR, 
+	email VARCHAR, 
+	address VARCHAR, 
+	document_id VARCHAR, 
+	notes TEXT, 
+	credit_limit NUMERIC(12, 2), 
+	current_balance NUMERIC(12, 2), 
+	credit_days INTEGER, 
+	status VARCHAR(8), 
+	is_active BOOLEAN, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	last_purchase_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(business_id) REFERENCES businesses (id)
+);
+CREATE TABLE system_settings (
+	id INTEGER NOT NULL, 
+	"key" VARCHAR NOT NULL, 
+	value TEXT NOT NULL, 
+	value_type VARCHAR NOT NULL, 
+	label VARCHAR NOT NULL, 
+	description TEXT, 
+	"group" VARCHAR NOT NULL, 
+	updated_by INTEGER, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id)
+);
+INSERT INTO "system_settings" VALUES(1,'app_maintenance_mode','false','bool','Modo mantenimiento','Bloquea el acceso a todos los usuarios no administradores','general',NULL,'2026-10-17 05:12:37.067804');
+INSERT INTO "system_settings" VALUES(2,'allow_registration','true','bool','Registro abierto','Permite que nuevos usuarios se registren','general',NULL,'2026-10-17 05:12:37.067809');
+INSERT INTO "system_settings" VALUES(3,'default_max_users_free','1','int','Máx. usuarios plan Free','Límite de usuarios por negocio en el plan Free','limits',NULL,'2026-10-17 05:12:37.067810');
+INSERT INTO "system_settings" VALUES(4,'default_max_products_free','100','int','Máx. productos plan Free','Límite de productos por negocio en el plan Free','limits',NULL,'2026-10-17 05:12:37.067810');
+INSERT INTO "system_settings" VALUES(5,'default_max_users_basic','5','int','Máx. usuarios plan Basic',NULL,'limits',NULL,'2026-10-17 05:12:37.067811');
+INSERT INTO "system_settings" VALUES(6,'default_max_products_basic','500','int','Máx. productos plan Basic',NULL,'limits',NULL,'2026-10-17 05:12:37.067811');
+INSERT INTO "system_settings" VALUES(7,'default_max_users_professional','20','int','Máx. usuarios plan Professional',NULL,'limits',NULL,'2026-10-17 05:12:37.067811');
+INSERT INTO "system_settings" VALUES(8,'default_max_products_professional','5000','int','Máx. productos plan Professional',NULL,'limits',NULL,'2026-10-17 05:12:37.067812');
+INSERT INTO "system_settings" VALUES(9,'audit_log_retention_days','90','int','Retención de audit logs (días)','Días que se conservan los registros de auditoría','features',NULL,'2026-10-17 05:12:37.067812');
+CREATE TABLE users (
+	id INTEGER NOT NULL, 
+	email VARCHAR NOT NULL, 
+	username VARCHAR NOT NULL, 
+	hashed_password VARCHAR NOT NULL, 
+	full_name VARCHAR, 
+	phone VARCHAR, 
+	system_role VARCHAR(11), 
+	subscription_plan VARCHAR(12), 
+	is_active BOOLEAN, 
+	is_verified BOOLEAN, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id)
+);
+INSERT INTO "users" VALUES(1,'owner@example.com','owner','$2b$12$XgtPMKmULIzmVeP3KmpOp.ajLia8SUu8P6npXBYTx8tnjlq3qsgae','Owner',NULL,'USER','FREE',1,0,'2026-10-17 05:12:37.422242','2026-10-17 05:12:37.422248');
+CREATE TABLE warehouses (
+	id INTEGER NOT NULL, 
+	business_id INTEGER NOT NULL, 
+	name VARCHAR NOT NULL, 
+	description TEXT, 
+	is_default BOOLEAN, 
+	is_active BOOLEAN, 
+	created_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(business_id) REFERENCES businesses (id)
+);
+INSERT INTO "warehouses" VALUES(1,1,'Principal',NULL,1,1,'2026-10-17 05:12:37.860091');
+CREATE TABLE waste_records (
+	id INTEGER NOT NULL, 
+	business_id INTEGER NOT NULL, 
+	presentation_id INTEGER NOT NULL, 
+	warehouse_id INTEGER NOT NULL, 
+	lot_id INTEGER, 
+	created_by INTEGER NOT NULL, 
+	cause VARCHAR(15) NOT NULL, 
+	quantity NUMERIC(12, 3) NOT NULL, 
+	cost_per_unit NUMERIC(12, 2), 
+	total_cost NUMERIC(12, 2), 
+	notes TEXT, 
+	is_auto BOOLEAN, 
+	created_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(business_id) REFERENCES businesses (id), 
+	FOREIGN KEY(presentation_id) REFERENCES product_presentations (id), 
+	FOREIGN KEY(warehouse_id) REFERENCES warehouses (id), 
+	FOREIGN KEY(lot_id) REFERENCES product_lots (id), 
+	FOREIGN KEY(created_by) REFERENCES users (id)
+);
+CREATE UNIQUE INDEX ix_users_email ON users (email);
+CREATE INDEX ix_users_id ON users (id);
+CREATE UNIQUE INDEX ix_users_username ON users (username);
+CREATE INDEX ix_permissions_id ON permissions (id);
+CREATE UNIQUE INDEX ix_system_settings_key ON system_settings ("key");
+CREATE INDEX ix_system_settings_id ON system_settings (id);
+CREATE INDEX ix_businesses_id ON businesses (id);
+CREATE INDEX ix_business_roles_id ON business_roles (id);
+CREATE INDEX ix_audit_logs_id ON audit_logs (id);
+CREATE INDEX ix_payment_methods_id ON payment_methods (id);
+CREATE INDEX ix_product_categories_id ON product_categories (id);
+CREATE INDEX ix_warehouses_id ON warehouses (id);
+CREATE INDEX ix_clients_id ON clients (id);
+CREATE INDEX ix_suppliers_id ON suppliers (id);
+CREATE INDEX ix_business_users_id ON business_users (id);
+CREATE INDEX ix_sales_id ON sales (id);
+CREATE INDEX ix_products_id ON products (id);
+CREATE INDEX ix_client_purchases_id ON client_purchases (id);
+CREATE INDEX ix_credit_movements_id ON credit_movements (id);
+CREATE INDEX ix_supplier_purchases_id ON supplier_purchases (id);
+CREATE INDEX ix_cash_registers_id ON cash_registers (id);
+CREATE INDEX ix_sale_payments_id ON sale_payments (id);
+CREATE INDEX ix_product_presentations_id ON product_presentations (id);
+CREATE INDEX ix_supplier_payments_id ON supplier_payments (id);
+CREATE INDEX ix_cash_sessions_id ON cash_sessions (id);
+CREATE INDEX ix_sale_items_id ON sale_items (id);
+CREATE INDEX ix_product_stock_id ON product_stock (id);
+CREATE INDEX ix_product_lots_id ON product_lots (id);
+CREATE INDEX ix_supplier_products_id ON supplier_products (id);
+CREATE INDEX ix_supplier_purchase_items_id ON supplier_purchase_items (id);
+CREATE INDEX ix_cash_movements_id ON cash_movements (id);
+CREATE INDEX ix_session_payment_breakdowns_id ON session_payment_breakdowns (id);
+CREATE INDEX ix_inventory_movements_id ON inventory_movements (id);
+CREATE INDEX ix_waste_records_id ON waste_records (id);
+COMMIT;
@@ -0,0 +1,89 @@
+"""
+Arranque sobre una BD creada antes de Alembic (fixtures/baseline_sqlite.sql):
+`migrate` la marca en la revisión base y aplica el resto de las migraciones,
+así que termina con el mismo esquema que una BD nueva y conserva sus datos.
+"""
+import sqlite3
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import Session
+
+from app.models.inventory import ProductStock
+from app.models.role import BusinessRole
+from app.models.sale import Sale, SaleItem
+from app.utils.bootstrap import _alembic_config, _current_revisions, _head_revisions, migrate
+
+BASELINE_SQL = Path(__file__).parent / "fixtures" / "baseline_sqlite.sql"
+
+
+def _migrated_engine(path: Path, script: str = ""):
+    if script:
+        with sqlite3.connect(path) as conn:
+            conn.executescript(script)
+    engine = create_engine(f"sqlite:///{path}")
+    with Session(engine) as db:
+        action = migrate(db, _alembic_config())
+    return engine, action
+
+
+def _schema(engine) -> dict:
+    insp = inspect(engine)
+    return {
+        table: {
+            "columns": {c["name"]: (str(c["type"]), c["nullable"]) for c in insp.get_columns(table)},
+            "indexes": {ix["name"]: (tuple(ix["column_names"]), bool(ix["unique"])) for ix in insp.get_indexes(table)},
+            "foreign_keys": sorted(
+                (tuple(fk["constrained_columns"]), fk["referred_table"]) for fk in insp.get_foreign_keys(table)
+            ),
+        }
+        for table in insp.get_table_names()
+    }
+
+
+@pytest.fixture(scope="module")
+def baseline(tmp_path_factory):
+    tmp = tmp_path_factory.mktemp("migrations")
+    engine, action = _migrated_engine(tmp / "baseline.db", BASELINE_SQL.read_text())
+    fresh, _ = _migrated_engine(tmp / "fresh.db")
+    yield engine, action, fresh
+    engine.dispose()
+    fresh.dispose()
+
+
+def test_baseline_database_reaches_head(baseline):
+    engine, action, _ = baseline
+    assert action == "stamp"
+    with Session(engine) as db:
+        assert _current_revisions(db) == _head_revisions(_alembic_config())
+
+
+def test_baseline_schema_matches_fresh_database(baseline):
+    engine, _, fresh = baseline
+    assert _schema(engine) == _schema(fresh)
+
+
+def test_baseline_data_is_kept_and_backfilled(baseline):
+    engine, _, _ = baseline
+    with Session(engine) as db:
+        sale = db.query(Sale).one()
+        assert sale.client_ref is None
+        assert sale.total == Decimal("30")
+
+        item = db.query(SaleItem).one()
+        assert item.unit_cost == Decimal("6")
+
+        stock = db.query(ProductStock).one()
+        assert stock.quantity == Decimal("2")
+        assert stock.is_low  # 2 <= min_stock 3
+
+        role = db.query(BusinessRole).one()
+        assert role.permission_mask
+
+
+def test_migrate_is_idempotent(baseline):
+    engine, _, _ = baseline
+    with Session(engine) as db:
+        assert migrate(db, _alembic_config()) == "upgrade"
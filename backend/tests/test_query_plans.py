@@ -0,0 +1,106 @@
+"""
+Planes de las consultas más frecuentes de los endpoints: ninguna debe
+terminar en un recorrido completo de tabla. Un fallo indica que falta (o
+dejó de usarse) un índice de los modelos/migraciones.
+"""
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import desc, select, text
+
+from app.models.client import Client, CreditMovement
+from app.models.finance import CashMovement, CashSession
+from app.models.inventory import InventoryMovement, Product, ProductLot, ProductStock
+from app.models.role import AuditLog
+from app.models.sale import Sale
+from app.models.supplier import SupplierPurchase
+from app.models.waste import WasteRecord
+
+_SINCE = datetime.utcnow() - timedelta(days=30)
+
+# Réplicas de las consultas de los endpoints, con parámetros de ejemplo
+HOT_QUERIES = {
+    "sales.list": select(Sale.id).where(
+        Sale.business_id == 1, Sale.created_at >= _SINCE,
+    ).order_by(desc(Sale.created_at)).limit(50),
+    "inventory.products": select(Product.id).where(
+        Product.business_id == 1, Product.is_active == True,
+    ).order_by(Product.name).limit(50),
+    "inventory.stock": select(ProductStock.id).where(
+        ProductStock.presentation_id == 1, ProductStock.warehouse_id == 1,
+    ),
+    "inventory.low_stock": select(ProductStock.presentation_id).where(
+        ProductStock.is_low == True,
+    ),
+    "inventory.movements": select(InventoryMovement.id).where(
+        InventoryMovement.business_id == 1, InventoryMovement.created_at >= _SINCE,
+    ),
+    "inventory.expiring_lots": select(ProductLot.id).where(
+        ProductLot.business_id == 1,
+        ProductLot.expiry_date <= datetime.utcnow(),
+        ProductLot.remaining > 0,
+    ),
+    "wastes.list": select(WasteRecord.id).where(
+        WasteRecord.business_id == 1, WasteRecord.created_at >= _SINCE,
+    ),
+    "clients.list": select(Client.id).where(
+        Client.business_id == 1, Client.is_active == True,
+    ),
+    "clients.credit_movements": select(CreditMovement.id).where(
+        CreditMovement.client_id == 1,
+    ).order_by(desc(CreditMovement.created_at)).limit(50),
+    "portfolio.recent_payments": select(CreditMovement.id).where(
+        CreditMovement.business_id == 1, CreditMovement.created_at >= _SINCE,
+    ),
+    "finances.sessions": select(CashSession.id).where(
+        CashSession.register_id == 1,
+    ).order_by(desc(CashSession.opened_at), desc(CashSession.id)).limit(30),
+    "suppliers.purchases": select(SupplierPurchase.id).where(
+        SupplierPurchase.supplier_id == 1,
+    ).order_by(desc(SupplierPurchase.created_at), desc(SupplierPurchase.id)).limit(50),
+    "finances.today_expenses": select(CashMovement.id).where(
+        CashMovement.business_id == 1, CashMovement.created_at >= _SINCE,
+    ),
+    "audit.business": select(AuditLog.id).where(
+        AuditLog.business_id == 1,
+    ).order_by(desc(AuditLog.created_at)).limit(200),
+}
+
+
+def plan_lines(db, stmt) -> list[str]:
+    bind = db.get_bind()
+    sql = str(stmt.compile(dialect=bind.dialect, compile_kwargs={"literal_binds": True}))
+    if bind.dialect.name == "postgresql":
+        # Sin seq scan forzado: la pregunta es si existe un índice utilizable,
+        # no qué elige el planner sobre tablas chicas
+        db.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        lines, stack = [], [plan[0]["Plan"]]
+        while stack:
+            node = stack.pop()
+            lines.append(f'{node["Node Type"]} {node.get("Relation Name", "")}'.strip())
+            stack.extend(node.get("Plans", []))
+        return lines
+    return [row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+
+def is_full_scan(line: str) -> bool:
+    if line.startswith("Seq Scan"):
+        return True
+    # SQLite: "SCAN sales" sin índice (con índice: "... USING INDEX ...")
+    return line.startswith("SCAN ") and "INDEX" not in line
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_query_uses_index(db, name):
+    plan = plan_lines(db, HOT_QUERIES[name])
+    assert not any(is_full_scan(line) for line in plan), plan
+
+
+def test_full_scan_is_detected(db):
+    # Control: una consulta sin índice utilizable sí se marca
+    plan = plan_lines(db, select(Sale.id).where(Sale.notes == "x"))
+    assert any(is_full_scan(line) for line in plan), plan
@@ -0,0 +1,110 @@
+"""
+Sincronización de ventas offline (POST /sales/sync): la hora real de la
+venta (`sold_at`) se guarda en UTC aunque el terminal la mande con offset, y
+el resumen diario la cuenta en su día local; el saldo de un cliente se
+acumula venta a venta dentro del mismo lote.
+"""
+import itertools
+import uuid
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.models.client import Client
+from app.models.sale import Sale, SalesDailyRollup
+
+_owners = itertools.count(1)
+
+
+def expect(response, status: int = 200):
+    assert response.status_code == status, (response.status_code, response.text)
+    return response.json() if response.content else None
+
+
+@pytest.fixture
+def store(client):
+    username = f"sync{next(_owners)}"
+    credentials = {"email": f"{username}@example.com", "password": "sync12345"}
+    expect(client.post("/api/v1/auth/register", json={
+        **credentials, "username": username, "full_name": "Sync",
+    }), 201)
+    token = expect(client.post("/api/v1/auth/login", json=credentials))["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    business = expect(client.post("/api/v1/businesses", json={
+        "name": "Tienda offline", "plan_type": "professional",
+    }, headers=headers), 201)
+    base = f"/api/v1/businesses/{business['id']}"
+    warehouse_id = expect(client.post(f"{base}/inventory/warehouses", json={
+        "name": "Principal", "is_default": True,
+    }, headers=headers), 201)["id"]
+    product = expect(client.post(f"{base}/inventory/products", json={
+        "name": "Producto", "presentations": [{"name": "Unidad", "sale_price": "10.00"}],
+    }, headers=headers), 201)
+    presentation_id = product["presentations"][0]["id"]
+    expect(client.post(f"{base}/inventory/entry", json={
+        "presentation_id": presentation_id, "warehouse_id": warehouse_id,
+        "quantity": "5", "cost_per_unit": "4.00",
+    }, headers=headers), 201)
+    methods = expect(client.get(f"{base}/payment-methods", headers=headers))
+    return {
+        "base": base,
+        "headers": headers,
+        "business_id": business["id"],
+        "warehouse_id": warehouse_id,
+        "presentation_id": presentation_id,
+        "cash_method_id": next(m["id"] for m in methods if not m["is_credit"]),
+        "credit_method_id": next(m["id"] for m in methods if m["is_credit"]),
+    }
+
+
+def _offline_sale(store, sold_at: str) -> dict:
+    return {
+        "warehouse_id": store["warehouse_id"],
+        "items": [{"presentation_id": store["presentation_id"], "quantity": "1", "unit_price": "10"}],
+        "payments": [{"payment_method_id": store["cash_method_id"], "amount": "10"}],
+        "client_ref": uuid.uuid4().hex,
+        "sold_at": sold_at,
+    }
+
+
+def test_sold_at_with_offset_is_stored_in_utc(client, db, store):
+    # 02:00 en UTC-5 son las 07:00 UTC: mismo día local en America/Bogota
+    result = expect(client.post(f"{store['base']}/sales/sync", json={
+        "sales": [_offline_sale(store, "2026-01-02T02:00-05:00")],
+    }, headers=store["headers"]))
+    assert result["created"] == 1, result
+
+    sale = db.get(Sale, result["results"][0]["sale_id"])
+    assert sale.created_at == datetime(2026, 1, 2, 7, 0)
+
+    days = {
+        row.day for row in db.query(SalesDailyRollup)
+        .filter(SalesDailyRollup.business_id == store["business_id"])
+    }
+    assert days == {date(2026, 1, 2)}
+
+
+def test_sold_at_in_the_future_is_rejected(client, store):
+    sold_at = (datetime.utcnow() + timedelta(hours=1)).isoformat() + "+00:00"
+    expect(client.post(f"{store['base']}/sales/sync", json={
+        "sales": [_offline_sale(store, sold_at)],
+    }, headers=store["headers"]), 422)
+
+
+def test_credit_balance_accumulates_within_a_batch(client, db, store):
+    client_id = expect(client.post(f"{store['base']}/clients", json={
+        "name": "Cliente fiado", "credit_limit": "25",
+    }, headers=store["headers"]), 201)["id"]
+    sales = []
+    for _ in range(3):
+        sale = _offline_sale(store, "2026-01-02T10:00")
+        sale["client_id"] = client_id
+        sale["payments"] = [{"payment_method_id": store["credit_method_id"], "amount": "10"}]
+        sales.append(sale)
+
+    result = expect(client.post(f"{store['base']}/sales/sync", json={"sales": sales}, headers=store["headers"]))
+
+    # La tercera supera el límite con el saldo que dejaron las dos primeras
+    assert [r["status"] for r in result["results"]] == ["created", "created", "error"]
+    assert "límite de crédito" in result["results"][2]["error"]
+    assert db.get(Client, client_id).current_balance == 20
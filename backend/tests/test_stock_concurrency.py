@@ -0,0 +1,114 @@
+"""
+Ventas concurrentes contra un stock limitado: se aceptan exactamente tantas
+como unidades hay, el stock y los lotes terminan en 0 y ninguna request
+falla con 500 ni queda bloqueada (deadlock).
+"""
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func
+
+from app.models.inventory import ProductLot, ProductStock
+
+STOCK = 12          # unidades por presentación (en dos lotes)
+SALES = 40          # ventas concurrentes de 1 unidad
+THREADS = 16
+TIMEOUT_S = 60      # una venta que no termina en este plazo es un bloqueo
+
+_owners = itertools.count(1)
+
+
+def expect(response, status: int = 200):
+    assert response.status_code == status, (response.status_code, response.text)
+    return response.json() if response.content else None
+
+
+@pytest.fixture
+def store(client):
+    # Un dueño por test: el plan limita los negocios por usuario
+    username = f"stock{next(_owners)}"
+    credentials = {"email": f"{username}@example.com", "password": "stock12345"}
+    expect(client.post("/api/v1/auth/register", json={
+        **credentials, "username": username, "full_name": "Stock",
+    }), 201)
+    token = expect(client.post("/api/v1/auth/login", json=credentials))["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    business = expect(client.post("/api/v1/businesses", json={
+        "name": "Tienda concurrente", "plan_type": "professional",
+    }, headers=headers), 201)
+    base = f"/api/v1/businesses/{business['id']}"
+    warehouse_id = expect(client.post(f"{base}/inventory/warehouses", json={
+        "name": "Principal", "is_default": True,
+    }, headers=headers), 201)["id"]
+    product = expect(client.post(f"{base}/inventory/products", json={
+        "name": "Producto", "presentations": [
+            {"name": "A", "sale_price": "1.00"}, {"name": "B", "sale_price": "1.00"},
+        ],
+    }, headers=headers), 201)
+    presentation_ids = [p["id"] for p in product["presentations"]]
+    for presentation_id in presentation_ids:
+        for quantity in (STOCK // 2, STOCK - STOCK // 2):
+            expect(client.post(f"{base}/inventory/entry", json={
+                "presentation_id": presentation_id, "warehouse_id": warehouse_id,
+                "quantity": str(quantity), "cost_per_unit": "0.50",
+            }, headers=headers), 201)
+    methods = expect(client.get(f"{base}/payment-methods", headers=headers))
+    return {
+        "base": base,
+        "headers": headers,
+        "warehouse_id": warehouse_id,
+        "presentation_ids": presentation_ids,
+        "cash_method_id": next(m["id"] for m in methods if not m["is_credit"]),
+    }
+
+
+def _sell_concurrently(client, store, item_lists) -> list[int]:
+    def sell(presentation_ids):
+        total = len(presentation_ids)
+        return client.post(f"{store['base']}/sales", json={
+            "warehouse_id": store["warehouse_id"],
+            "items": [
+                {"presentation_id": pid, "quantity": "1", "unit_price": "1"}
+                for pid in presentation_ids
+            ],
+            "payments": [{"payment_method_id": store["cash_method_id"], "amount": str(total)}],
+        }, headers=store["headers"]).status_code
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        futures = [pool.submit(sell, items) for items in item_lists]
+        return [future.result(timeout=TIMEOUT_S) for future in futures]
+
+
+def _assert_sold_out(db, store, presentation_ids):
+    for presentation_id in presentation_ids:
+        quantity = db.query(ProductStock.quantity).filter(
+            ProductStock.presentation_id == presentation_id,
+            ProductStock.warehouse_id == store["warehouse_id"],
+        ).scalar()
+        remaining = db.query(func.sum(ProductLot.remaining)).filter(
+            ProductLot.presentation_id == presentation_id,
+        ).scalar()
+        assert Decimal(quantity) == 0
+        assert Decimal(remaining) == 0
+
+
+def test_concurrent_sales_never_oversell(client, db, store):
+    presentation_id = store["presentation_ids"][0]
+    codes = _sell_concurrently(client, store, [[presentation_id]] * SALES)
+
+    assert codes.count(201) == STOCK
+    assert set(codes) <= {201, 400}, codes
+    _assert_sold_out(db, store, [presentation_id])
+
+
+def test_concurrent_multi_item_sales_in_opposite_order(client, db, store):
+    # La mitad de las ventas lista las presentaciones al revés: con locks en
+    # el orden de las líneas, dos ventas así se bloquearían mutuamente
+    a, b = store["presentation_ids"]
+    codes = _sell_concurrently(client, store, [[a, b] if i % 2 else [b, a] for i in range(SALES)])
+
+    assert codes.count(201) == STOCK
+    assert set(codes) <= {201, 400}, codes
+    _assert_sold_out(db, store, [a, b])